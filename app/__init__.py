@@ -1,3 +1,9 @@
 """
 App initialization module.
 """
+
+from app.core.startup_profile import import_timing_enabled, startup_profile
+
+# Must run before the application modules are imported to time them
+if import_timing_enabled:
+    startup_profile.enable_import_timing()
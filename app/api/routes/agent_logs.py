@@ -2,13 +2,22 @@
 Agent logs routes for the demo activity ticker.
 """
 
-from typing import List
+import asyncio
+from typing import AsyncIterator, List
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 
-from app.constants.agent_logs_constants import DEFAULT_LIMIT, MAX_LIMIT, MIN_LIMIT
+from app.constants.agent_logs_constants import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    MIN_LIMIT,
+    STREAM_HEARTBEAT_SECONDS,
+)
 from app.core.logging import get_logger
+from app.core.sliced_array import slice_array
 from app.services.agent_logs_service import AgentLogsService
+from app.services.log_broadcaster import log_broadcaster
 
 logger = get_logger(__name__)
 
@@ -28,13 +37,97 @@ async def get_agent_logs(
         le=MAX_LIMIT,
         description="Number of log messages to return",
     )
-) -> List[str]:
+) -> Response:
     """
     Get a list of agent activity logs.
     - Provides deterministic log messages for the scrolling ticker
     - Limits the number of returned logs (default: 10, max: 20)
-    - Returns the same set of logs for the same limit value
-    - Cached in Redis for 30 seconds
+    - Returns the newest logs first; a new log is added every 2 seconds and
+      every worker returns the same logs at the same time; smaller limits
+      return the first logs of larger ones
+    - Served from logs pre-rendered in memory, without generation or Redis
     - p95 response time < 80ms from SF & NYC POPs
     """
-    return AgentLogsService.get_agent_logs(limit)
+    # Pre-rendered bodies are already valid List[str] JSON, so skip re-validation
+    return Response(
+        await AgentLogsService.get_agent_logs_body_async(limit),
+        media_type="application/json",
+    )
+
+
+async def _server_sent_events(limit: int) -> AsyncIterator[bytes]:
+    """Yield an SSE event per ticker update, and comments while idle."""
+    subscription = log_broadcaster.subscribe()
+    try:
+        while True:
+            dataset = await subscription.next(STREAM_HEARTBEAT_SECONDS)
+            if dataset is None:
+                yield b": keep-alive\n\n"
+                continue
+            yield b"event: logs\ndata: " + slice_array(dataset, limit) + b"\n\n"
+    finally:
+        log_broadcaster.unsubscribe(subscription)
+
+
+@router.get(
+    "/agent/stream",
+    response_class=StreamingResponse,
+    operation_id="logs/agent/stream/get",
+    description="Push agent activity logs to the scrolling ticker as Server-Sent Events",
+)
+async def stream_agent_logs(
+    limit: int = Query(
+        DEFAULT_LIMIT,
+        ge=MIN_LIMIT,
+        le=MAX_LIMIT,
+        description="Number of log messages per update",
+    )
+) -> StreamingResponse:
+    """
+    Stream agent activity logs as Server-Sent Events.
+    - Sends a `logs` event with the same JSON list as GET /logs/agent on connect
+      and then whenever the logs change, instead of polling
+    - One producer per worker serves every connected ticker; clients that fall
+      behind only receive the latest logs
+    - Sends a keep-alive comment every 15 seconds while idle
+    """
+    return StreamingResponse(
+        _server_sent_events(limit),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/agent/ws")
+async def agent_logs_websocket(
+    websocket: WebSocket,
+    limit: int = Query(DEFAULT_LIMIT, ge=MIN_LIMIT, le=MAX_LIMIT),
+) -> None:
+    """
+    Push agent activity logs over a WebSocket.
+    - Sends the same JSON list as GET /logs/agent on connect and whenever the
+      logs change, from the same per-worker producer as the SSE stream
+    """
+    await websocket.accept()
+    subscription = log_broadcaster.subscribe()
+
+    async def push() -> None:
+        while True:
+            dataset = await subscription.next()
+            await websocket.send_text(slice_array(dataset, limit).decode())
+
+    pusher = asyncio.create_task(push())
+    try:
+        # Messages from the client are ignored; reading notices disconnects
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        pusher.cancel()
+        log_broadcaster.unsubscribe(subscription)
+        # Wait for the pusher so it cannot outlive the handler, and surface its
+        # failure instead of leaving it as a never-retrieved task exception
+        (result,) = await asyncio.gather(pusher, return_exceptions=True)
+        if isinstance(result, BaseException) and not isinstance(
+            result, (WebSocketDisconnect, asyncio.CancelledError)
+        ):
+            logger.error(f"Agent logs WebSocket push failed: {str(result)}")
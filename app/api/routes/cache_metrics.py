@@ -0,0 +1,62 @@
+"""
+Cache metrics routes for inspecting the Redis cache layer.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache_metrics import cache_metrics
+from app.core.logging import get_logger
+from app.services.agent_logs_service import log_ring
+from app.services.caching_service import (
+    cache_breaker,
+    local_cache,
+    page_cache,
+    shared_cache,
+)
+from app.services.log_broadcaster import log_broadcaster
+from app.services.redis_connections import redis_connections
+from app.services.refresh_scheduler import refresh_scheduler
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/cache", operation_id="metrics/cache/get")
+async def get_cache_metrics() -> Dict[str, Any]:
+    """
+    Get cache-layer metrics for the worker serving the request.
+    - Redis latency histograms per command (milliseconds, with p50/p95/p99)
+    - Local/Redis hits, misses, errors and value sizes per key prefix
+    - Redis round trips per HTTP request
+    - Local tier, page tier, shared tier, circuit breaker and replica counters
+    - Refresh scheduler leadership and per-dataset refresh counters
+    - Agent log ring and push stream subscribers and producer counters
+    """
+    return {
+        **cache_metrics.snapshot(),
+        "local_cache": local_cache.stats(),
+        "page_cache": page_cache.stats(),
+        "shared_cache": shared_cache.stats(),
+        "circuit_breaker": cache_breaker.stats(),
+        "replicas": redis_connections.stats(),
+        "refresh_scheduler": refresh_scheduler.stats(),
+        "log_ring": log_ring.stats(),
+        "log_stream": log_broadcaster.stats(),
+    }
+
+
+@router.get(
+    "/cache/prometheus",
+    response_class=PlainTextResponse,
+    operation_id="metrics/cache/prometheus/get",
+)
+async def get_cache_metrics_prometheus() -> str:
+    """
+    Export cache-layer metrics in the Prometheus text format.
+    - Metrics are per worker; scrape every worker or aggregate downstream
+    """
+    return cache_metrics.render_prometheus()
@@ -0,0 +1,51 @@
+"""
+Export routes for bulk invoice files generated in the background.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import FileResponse
+
+from app.core.logging import get_logger
+from app.schemas.export_schemas import ExportJob, ExportRequest
+from app.services.export_service import export_service
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.post("", response_model=ExportJob, status_code=202, operation_id="exports/post")
+async def submit_export(request: ExportRequest) -> ExportJob:
+    """
+    Submit a bulk invoice export.
+    - Exports up to 50,000,000 invoices as NDJSON, a JSON array, CSV or a
+      columnar binary snapshot
+    - Generated in the background, in parallel across worker processes
+    - The same count, seed and format always produce the same file
+    - Poll GET /exports/{id} until `completed`, then download the file
+    - Returns 429 while too many exports are in progress or storage is full
+    """
+    return await export_service.submit(request)
+
+
+@router.get("/{export_id}", response_model=ExportJob, operation_id="exports/get")
+async def get_export(export_id: str) -> ExportJob:
+    """
+    Get the status and progress of an export.
+    - Finished exports are kept for 1 hour
+    """
+    return await export_service.get(export_id)
+
+
+@router.get(
+    "/{export_id}/download",
+    response_class=FileResponse,
+    operation_id="exports/download/get",
+)
+async def download_export(export_id: str) -> FileResponse:
+    """
+    Download the file of a completed export.
+    - Returns 409 while the export is queued, running or failed
+    """
+    path, media_type, filename = await export_service.result(export_id)
+    return FileResponse(path, media_type=media_type, filename=filename)
@@ -2,12 +2,24 @@
 Invoice routes for the mock invoice feed.
 """
 
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import StreamingResponse
 
-from app.constants.invoice_constants import DEFAULT_LIMIT, MAX_LIMIT, MIN_LIMIT
+from app.constants.invoice_constants import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    MIN_LIMIT,
+    PAGINATION_CURSOR_SEEDS,
+    PAGINATION_DATASET_SIZE,
+    PAGINATION_SEED,
+    STREAM_DEFAULT_COUNT,
+    STREAM_MAX_COUNT,
+)
 from app.core.logging import get_logger
+from app.core.pagination import decode_cursor, encode_cursor
+from app.errors.pagination_errors import InvalidCursorError
 from app.schemas.invoice_schemas import Invoice
 from app.services.invoice_service import InvoiceService
 
@@ -23,12 +35,81 @@ async def get_invoices(
         ge=MIN_LIMIT,
         le=MAX_LIMIT,
         description="Number of invoices to return",
-    )
-) -> List[Invoice]:
+    ),
+    offset: Optional[int] = Query(
+        None,
+        ge=0,
+        lt=PAGINATION_DATASET_SIZE,
+        description="Index of the first invoice of the paginated dataset",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the last page"
+    ),
+) -> Response:
     """
     Get a list of mock invoices.
     - Limits the number of returned invoices (default: 50, max: 100)
-    - Returns the same set of invoices for the same limit value
+    - Returns the same set of invoices for the same limit value; smaller limits
+      return the first invoices of larger ones
+    - With `offset` or `cursor`, returns a page of a fixed dataset of
+      1,000,000,000 invoices; any page costs the same to generate, and the
+      X-Next-Cursor header points to the next one (absent on the last page);
+      sending both `offset` and `cursor` is rejected
     - Cached in Redis for 60 seconds
     """
-    return InvoiceService.get_invoices(limit)
+    if offset is None and cursor is None:
+        # Cached bodies are already valid List[Invoice] JSON, so skip re-validation
+        return Response(
+            await InvoiceService.get_invoices_body_async(limit),
+            media_type="application/json",
+        )
+    if offset is not None and cursor is not None:
+        raise InvalidCursorError("Send either offset or cursor, not both")
+    seed = PAGINATION_SEED
+    if cursor is not None:
+        seed, offset = decode_cursor(
+            cursor, PAGINATION_CURSOR_SEEDS, PAGINATION_DATASET_SIZE
+        )
+    response = Response(
+        await InvoiceService.get_invoice_page_body_async(offset, limit, seed),
+        media_type="application/json",
+    )
+    response.headers["X-Total-Count"] = str(PAGINATION_DATASET_SIZE)
+    if offset + limit < PAGINATION_DATASET_SIZE:
+        response.headers["X-Next-Cursor"] = encode_cursor(seed, offset + limit)
+    return response
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    operation_id="invoices/stream/get",
+)
+async def stream_invoices(
+    count: int = Query(
+        STREAM_DEFAULT_COUNT,
+        ge=1,
+        le=STREAM_MAX_COUNT,
+        description="Number of invoices in the feed",
+    ),
+    seed: Optional[int] = Query(
+        None, ge=0, description="Seed of the feed; the same seed gives the same feed"
+    ),
+    output: Literal["ndjson", "json"] = Query(
+        "ndjson",
+        alias="format",
+        description="NDJSON (one invoice per line) or a JSON array",
+    ),
+) -> StreamingResponse:
+    """
+    Stream a large feed of mock invoices.
+    - Up to 10,000,000 invoices (default: 10,000), sent in chunks of 1,000
+    - The first chunk goes out as soon as it is generated and memory stays
+      flat whatever the count; generation waits for slow clients
+    - Not cached: every request without a seed gets a new feed
+    """
+    json_array = output == "json"
+    return StreamingResponse(
+        InvoiceService.stream_invoices_async(count, seed, json_array),
+        media_type="application/json" if json_array else "application/x-ndjson",
+    )
@@ -22,7 +22,7 @@ async def get_producta_status() -> ProductaStatus:
     - Returns the current status for the producta cron job
     - Stored in Redis cache for 10 minutes
     """
-    return ProductaService.get_status()
+    return await ProductaService.get_status_async()
 
 
 @router.patch(
@@ -40,4 +40,4 @@ async def update_producta_status(
     - Example: {"status": "done"}
     - Example: {"status": "processing"}
     """
-    return ProductaService.update_status(status_update)
+    return await ProductaService.update_status_async(status_update)
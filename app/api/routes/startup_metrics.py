@@ -0,0 +1,25 @@
+"""
+Startup metrics routes for tracking time-to-first-request.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.core.logging import get_logger
+from app.core.startup_profile import startup_profile
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/startup", operation_id="metrics/startup/get")
+async def get_startup_metrics() -> Dict[str, Any]:
+    """
+    Get the startup breakdown of the worker serving the request (seconds).
+    - Time from importing the app to accepting requests
+    - Time per stage: imports, application setup, Redis connection, background tasks
+    - Per-module and per-package import times when started with STARTUP_PROFILE_IMPORTS=true
+    """
+    return startup_profile.report()
@@ -2,7 +2,7 @@
 Treasury routes for metrics data.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from app.core.logging import get_logger
 from app.schemas.treasury_schemas import TreasuryMetrics
@@ -16,11 +16,15 @@ router = APIRouter(prefix="/metrics", tags=["treasury"])
 @router.get(
     "/treasury", response_model=TreasuryMetrics, operation_id="metrics/treasury/get"
 )
-async def get_treasury_metrics() -> TreasuryMetrics:
+async def get_treasury_metrics() -> Response:
     """
     Get treasury metrics.
     - Returns current TVL (Total Value Locked) and APY (Annual Percentage Yield)
     - Cached in Redis for 1 hour
     - Example response: {"tvl": 1480000, "apy": 9.2}
     """
-    return TreasuryService.get_treasury_metrics()
+    # Cached bodies are already valid TreasuryMetrics JSON, so skip re-validation
+    return Response(
+        await TreasuryService.get_treasury_metrics_body_async(),
+        media_type="application/json",
+    )
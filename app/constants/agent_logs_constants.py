@@ -2,11 +2,18 @@
 Constants related to the agent logs.
 """
 
-# Cache settings
-CACHE_KEY_PREFIX = "demo:logs"
-CACHE_TTL_SECONDS = 30  # 30 seconds
+# Rolling feed: a new log is due every LOG_INTERVAL_SECONDS and the newest
+# MAX_LIMIT are kept pre-rendered in memory
+LOG_INTERVAL_SECONDS = 2.0
+
+# Seed of the log generator (every worker renders the same feed)
+RANDOM_SEED = 4321
 
 # Query parameters
 DEFAULT_LIMIT = 10
 MAX_LIMIT = 20
 MIN_LIMIT = 1
+
+# Push stream of the ticker
+STREAM_POLL_SECONDS = 1  # How often each worker checks the feed for new logs
+STREAM_HEARTBEAT_SECONDS = 15  # Keep-alive comment sent on idle SSE streams
@@ -0,0 +1,71 @@
+"""
+Constants related to the caching layer.
+"""
+
+# In-process (L1) cache tier
+LOCAL_CACHE_ENABLED = True
+LOCAL_CACHE_MAX_ENTRIES = 1024
+LOCAL_CACHE_MAX_TTL_SECONDS = 3600  # 1 hour
+
+# Stale-while-revalidate refreshes
+REFRESH_LEASE_MILLISECONDS = 5000  # 5 seconds
+REFRESH_MAX_WORKERS = 4
+
+# Circuit breaker around Redis
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT_SECONDS = 1.0
+CIRCUIT_MAX_RESET_TIMEOUT_SECONDS = 30.0
+
+# Redis connection settings
+REDIS_CONNECTION_POOL_SIZE = 10
+REDIS_CONNECTION_TIMEOUT_SECONDS = 5
+REDIS_HEDGE_DELAY_MILLISECONDS = 10
+
+# Redis connection check at application startup (delay doubles per retry)
+REDIS_CONNECT_ATTEMPTS = 3
+REDIS_CONNECT_RETRY_SECONDS = 0.2
+
+# Auto-batching of async cache reads (0 ms batches within one loop tick)
+AUTO_BATCH_ENABLED = True
+AUTO_BATCH_WINDOW_MILLISECONDS = 0
+AUTO_BATCH_MAX_KEYS = 100
+
+# Cache value encoding ("json", "orjson" or "msgpack")
+CACHE_CODEC = "json"
+CACHE_COMPRESSION_MIN_BYTES = 1024  # Compress encoded values at least this large
+CACHE_COMPRESSION_LEVEL = 1  # zlib level: favour CPU over ratio
+
+# Cross-replica invalidation of the local tier over Redis pub/sub
+INVALIDATION_ENABLED = True
+INVALIDATION_CHANNEL = "cache:invalidate"
+INVALIDATION_POLL_SECONDS = 1.0
+INVALIDATION_RECONNECT_SECONDS = 1.0
+INVALIDATION_MAX_RECONNECT_SECONDS = 30.0
+
+# Namespace generation counters (bumped to invalidate a whole key family)
+GENERATION_LOCAL_TTL_SECONDS = 30
+
+# Cache metrics histogram bounds
+LATENCY_BUCKETS_MILLISECONDS = (0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+VALUE_SIZE_BUCKETS_BYTES = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+ROUND_TRIP_BUCKETS = (0, 1, 2, 3, 4, 5, 8, 13, 21)
+
+# Host-wide tier for response bodies, shared by every worker through an mmap'd
+# file (off by default; enable when running several workers per host)
+SHARED_CACHE_ENABLED = False
+SHARED_CACHE_FILENAME = "mint-server-cache"
+SHARED_CACHE_PREFIXES = ("demo:invoices",)
+SHARED_CACHE_SLOTS = 256
+SHARED_CACHE_SLOT_BYTES = 32768  # Fits the largest invoice body (~12 KB)
+
+# Per-worker tier for bodies of key families with unbounded key spaces (pages),
+# kept apart so they cannot evict hot bodies from the local and shared tiers
+PAGE_CACHE_PREFIXES = ("demo:invoice-pages",)
+PAGE_CACHE_MAX_ENTRIES = 256
+
+# Background refresh scheduler; one worker across all replicas holds the lease
+REFRESH_SCHEDULER_ENABLED = True
+REFRESH_SCHEDULER_LEASE_KEY = "refresh-scheduler"
+REFRESH_SCHEDULER_LEASE_MILLISECONDS = 15000
+REFRESH_SCHEDULER_TICK_SECONDS = 1.0
+REFRESH_AHEAD_SECONDS = 5  # Rewrite datasets this long before they turn stale
@@ -0,0 +1,41 @@
+"""
+Constants related to bulk invoice exports.
+"""
+
+# Export size
+EXPORT_MIN_COUNT = 1
+EXPORT_MAX_COUNT = 50_000_000
+
+# Invoices per shard (fixed so the output never depends on the worker count)
+EXPORT_SHARD_ROWS = 250_000
+EXPORT_CHUNK_ROWS = 10_000  # Invoices generated and written at a time
+
+# Worker processes generating shards in each server worker (0 = the CPUs
+# divided by the number of server workers, WEB_CONCURRENCY, at least 1)
+EXPORT_MAX_WORKERS = 0
+
+# Admission limits per server worker: exports queued or running at once,
+# and bytes the export directory may hold including the estimated size of
+# the new export (about 130 bytes per invoice in the widest format)
+EXPORT_MAX_ACTIVE_JOBS = 2
+EXPORT_MAX_DISK_BYTES = 20 * 1024**3
+EXPORT_ESTIMATED_ROW_BYTES = 130
+
+# Owners refresh the manifest of a running export every few seconds; one
+# not refreshed for EXPORT_STALE_SECONDS was abandoned by a dead worker
+EXPORT_HEARTBEAT_SECONDS = 5
+EXPORT_STALE_SECONDS = 60
+
+# Where exports are written, under the system temporary directory
+EXPORT_DIRNAME = "mint-server-exports"
+EXPORT_RETENTION_SECONDS = 3600  # Finished exports are deleted after 1 hour
+
+# File extension and media type per format
+EXPORT_FORMATS = {
+    "ndjson": ("ndjson", "application/x-ndjson"),
+    "json": ("json", "application/json"),
+    "csv": ("csv", "text/csv"),
+    # Columnar binary snapshot (see app/services/invoice_snapshot.py)
+    "snapshot": ("snapshot", "application/octet-stream"),
+}
+CSV_HEADER = b"id,client,amount,risk,tokenId,status\n"
@@ -4,7 +4,16 @@ Constants related to the invoice feed.
 
 # Cache settings
 CACHE_KEY_PREFIX = "demo:invoices"
+CACHE_DATASET_KEY = "dataset"  # One dataset of MAX_LIMIT invoices serves every limit
 CACHE_TTL_SECONDS = 60
+CACHE_SOFT_TTL_SECONDS = 45  # Refresh in the background after this age
+
+# Base seed of the invoice generator
+RANDOM_SEED = 1234
+
+# Company names invoices are drawn from, built once per process
+COMPANY_CORPUS_SEED = 1234
+COMPANY_CORPUS_SIZE = 1024
 
 # Amount range
 MIN_AMOUNT = 25000
@@ -21,3 +30,18 @@ STATUS_WEIGHTS = {"new": 0.6, "processing": 0.3, "funded": 0.1}
 DEFAULT_LIMIT = 50
 MAX_LIMIT = 100
 MIN_LIMIT = 1
+
+# Paginated access to the virtual dataset of a seed
+PAGINATION_SEED = 1234
+# Seeds cursors are accepted for: the current one, plus any retired seed
+# whose cursors should keep working until clients have paged through
+PAGINATION_CURSOR_SEEDS = frozenset((PAGINATION_SEED,))
+PAGINATION_DATASET_SIZE = 1_000_000_000
+# Pages are cached under "<seed>:<offset>:<limit>" in their own key family, so
+# walking pages never evicts the dataset body from the in-host tiers
+CACHE_PAGE_KEY_PREFIX = "demo:invoice-pages"
+
+# Streaming feed
+STREAM_CHUNK_SIZE = 1000  # Invoices generated and sent per chunk
+STREAM_DEFAULT_COUNT = 10_000
+STREAM_MAX_COUNT = 10_000_000
@@ -0,0 +1,171 @@
+"""
+DataLoader-style automatic batching of async lookups.
+"""
+
+import asyncio
+import contextvars
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class AsyncBatchLoader(Generic[K, V]):
+    """
+    Collect individual async lookups into batched calls.
+
+    Every ``load`` made on the same event loop within one tick (or within
+    ``window`` seconds of the first one) is queued, de-duplicated and sent
+    to ``batch_fn`` as a single list of keys. ``batch_fn`` must return one
+    result per key in the same order; each caller then receives its own
+    result, or the exception raised by the batch.
+
+    The batch runs in the context of the caller that opened it. When
+    ``dispatch_context`` is given it is called with the context of every
+    caller in the batch and ``batch_fn`` runs inside the returned context
+    manager, so per-request state (such as metrics) can be applied to all of
+    them.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Sequence[V]]],
+        window: float = 0.0,
+        max_batch_size: int = 100,
+        dispatch_context: Optional[
+            Callable[[List[contextvars.Context]], ContextManager[Any]]
+        ] = None,
+    ):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.dispatch_context = dispatch_context
+        self._pending: Dict[asyncio.AbstractEventLoop, _Batch[K]] = {}
+        # Strong references, so in-flight dispatches are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.keys_loaded = 0
+
+    async def load(self, key: K) -> V:
+        """
+        Load a single key as part of the current batch.
+
+        Args:
+            key: Key to look up
+
+        Returns:
+            The batch function's result for the key
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(loop)
+        if batch is None:
+            batch = self._pending[loop] = _Batch()
+            if self.window > 0:
+                loop.call_later(self.window, self._flush, loop, batch)
+            else:
+                loop.call_soon(self._flush, loop, batch)
+
+        if self.dispatch_context is not None:
+            batch.contexts.append(contextvars.copy_context())
+        future = batch.futures.get(key)
+        if future is None:
+            future = batch.futures[key] = loop.create_future()
+            if len(batch.futures) >= self.max_batch_size:
+                self._flush(loop, batch)
+
+        # Shield so one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[K]) -> List[V]:
+        """
+        Load several keys as part of the current batch.
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            Results in the same order as the keys
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, batch: "_Batch[K]") -> None:
+        """Dispatch a queued batch if it has not been dispatched already."""
+        if self._pending.get(loop) is not batch:
+            return
+        del self._pending[loop]
+        task = loop.create_task(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: "_Batch[K]") -> None:
+        """
+        Run the batch function and fan the results back out.
+
+        Every caller's future is resolved whatever happens: with its result,
+        with the batch's exception, or cancelled if the dispatch itself is
+        cancelled (for example when the event loop shuts down).
+        """
+        futures = batch.futures
+        keys = list(futures)
+        self.batches += 1
+        self.keys_loaded += len(keys)
+        try:
+            if self.dispatch_context is None:
+                results = await self.batch_fn(keys)
+            else:
+                with self.dispatch_context(batch.contexts):
+                    results = await self.batch_fn(keys)
+            for key, result in zip(keys, results):
+                future = futures[key]
+                if not future.done():
+                    future.set_result(result)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved in case every caller has gone away
+                    future.exception()
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            # Cancelled, or fewer results than keys
+            for future in futures.values():
+                if not future.done():
+                    future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching counters.
+
+        Returns:
+            Dictionary with the number of batches and keys loaded
+        """
+        return {
+            "batches": self.batches,
+            "keys_loaded": self.keys_loaded,
+            "keys_per_batch": self.keys_loaded / self.batches if self.batches else 0.0,
+        }
+
+
+class _Batch(Generic[K]):
+    """Futures queued for one dispatch, and the contexts of their callers."""
+
+    __slots__ = ("futures", "contexts")
+
+    def __init__(self):
+        self.futures: Dict[K, asyncio.Future] = {}
+        self.contexts: List[contextvars.Context] = []
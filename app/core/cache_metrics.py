@@ -0,0 +1,381 @@
+"""
+In-process instrumentation of the Redis cache layer.
+"""
+
+import bisect
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+from app.constants.cache_constants import (
+    LATENCY_BUCKETS_MILLISECONDS,
+    ROUND_TRIP_BUCKETS,
+    VALUE_SIZE_BUCKETS_BYTES,
+)
+
+# Trailing ":<limit>", ":dataset", ":<seed>:<offset>:<limit>",
+# ":g<generation>" and ":generation" segments do not name a key family
+_KEY_SUFFIX = re.compile(r"(:g\d+)?:(\d+(:\d+)*|dataset|generation)$")
+
+
+def key_prefix(key: str) -> str:
+    """
+    Map a cache key to the key family it belongs to.
+
+    Args:
+        key: Cache key, e.g. "demo:invoices:g2:50"
+
+    Returns:
+        Key family, e.g. "demo:invoices"
+    """
+    return _KEY_SUFFIX.sub("", key)
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket upper bounds.
+
+    Quantiles are estimated by linear interpolation inside the bucket that
+    contains them, the same way Prometheus' histogram_quantile does.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile of the recorded observations.
+
+        Args:
+            q: Quantile between 0 and 1, e.g. 0.95
+
+        Returns:
+            Estimated value, or None if nothing was recorded
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = q * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                if seen + bucket_count >= rank and bucket_count:
+                    if index == len(self.buckets):
+                        # Beyond the last bound: report the bound itself
+                        return self.buckets[-1]
+                    lower = self.buckets[index - 1] if index else 0.0
+                    upper = self.buckets[index]
+                    return lower + (upper - lower) * (rank - seen) / bucket_count
+                seen += bucket_count
+            return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the histogram as plain data.
+
+        Returns:
+            Dictionary with count, sum, mean, p50/p95/p99 and cumulative buckets
+        """
+        p50, p95, p99 = (self.quantile(q) for q in (0.5, 0.95, 0.99))
+        with self._lock:
+            cumulative, running = [], 0
+            for bound, bucket_count in zip(self.buckets + ["+Inf"], self.counts):
+                running += bucket_count
+                cumulative.append([bound, running])
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "mean": self.sum / self.count if self.count else None,
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "buckets": cumulative,
+            }
+
+
+class _PrefixStats:
+    """Lookup outcomes and value sizes for one key family."""
+
+    def __init__(self):
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.read_sizes = Histogram(VALUE_SIZE_BUCKETS_BYTES)
+        self.write_sizes = Histogram(VALUE_SIZE_BUCKETS_BYTES)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": (
+                (self.local_hits + self.redis_hits) / lookups if lookups else 0.0
+            ),
+            "read_bytes": self.read_sizes.snapshot(),
+            "write_bytes": self.write_sizes.snapshot(),
+        }
+
+
+class CacheMetrics:
+    """
+    Registry of cache-layer metrics for this worker.
+
+    Records Redis command latency per command, lookup outcomes and value
+    sizes per key family, and Redis round trips per HTTP request. Everything
+    is kept in memory and can be read with ``snapshot`` or exported in the
+    Prometheus text format with ``render_prometheus``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands: Dict[str, Histogram] = {}
+        self._prefixes: Dict[str, _PrefixStats] = {}
+        self.round_trips = Histogram(ROUND_TRIP_BUCKETS)
+        self._request_round_trips: ContextVar[Optional[List[int]]] = ContextVar(
+            "redis_round_trips", default=None
+        )
+        # Counters of every request served by a shared (batched) round trip
+        self._charged_round_trips: ContextVar[Optional[List[List[int]]]] = ContextVar(
+            "redis_charged_round_trips", default=None
+        )
+
+    def _command(self, command: str) -> Histogram:
+        with self._lock:
+            histogram = self._commands.get(command)
+            if histogram is None:
+                histogram = self._commands[command] = Histogram(
+                    LATENCY_BUCKETS_MILLISECONDS
+                )
+            return histogram
+
+    def _prefix(self, key: str) -> _PrefixStats:
+        prefix = key_prefix(key)
+        with self._lock:
+            stats = self._prefixes.get(prefix)
+            if stats is None:
+                stats = self._prefixes[prefix] = _PrefixStats()
+            return stats
+
+    def observe_command(self, command: str, seconds: float) -> None:
+        """
+        Record one Redis round trip.
+
+        Args:
+            command: Command or pipeline name, e.g. "GET" or "MGET+PTTL"
+            seconds: Wall-clock duration of the round trip
+        """
+        self._command(command).observe(seconds * 1000)
+        charged = self._charged_round_trips.get()
+        if charged is None:
+            counter = self._request_round_trips.get()
+            charged = [counter] if counter is not None else []
+        for counter in charged:
+            counter[0] += 1
+
+    def record_hit(self, key: str, local: bool) -> None:
+        """Record a lookup served from the local tier or from Redis."""
+        stats = self._prefix(key)
+        with self._lock:
+            if local:
+                stats.local_hits += 1
+            else:
+                stats.redis_hits += 1
+
+    def record_miss(self, key: str) -> None:
+        """Record a lookup that found nothing."""
+        stats = self._prefix(key)
+        with self._lock:
+            stats.misses += 1
+
+    def record_error(self, key: str) -> None:
+        """Record a failed Redis call for a key."""
+        stats = self._prefix(key)
+        with self._lock:
+            stats.errors += 1
+
+    def record_read_size(self, key: str, size: int) -> None:
+        """Record the size in bytes of a value read from Redis."""
+        self._prefix(key).read_sizes.observe(size)
+
+    def record_write_size(self, key: str, size: int) -> None:
+        """Record the size in bytes of a value written to Redis."""
+        self._prefix(key).write_sizes.observe(size)
+
+    def start_request(self) -> Any:
+        """
+        Start counting Redis round trips for the current request.
+
+        Returns:
+            Token to pass to ``finish_request``
+        """
+        return self._request_round_trips.set([0])
+
+    def request_round_trips(self) -> int:
+        """Return the round trips counted so far for the current request."""
+        counter = self._request_round_trips.get()
+        return counter[0] if counter is not None else 0
+
+    @contextmanager
+    def charge_requests(self, contexts: Sequence[Context]) -> Iterator[None]:
+        """
+        Charge round trips made inside the block to several requests.
+
+        Used for batched calls that serve many requests at once: each request
+        whose context is given counts every round trip once, however many of
+        its keys were in the batch.
+
+        Args:
+            contexts: Contexts of the requests served by the block
+        """
+        counters: Dict[int, List[int]] = {}
+        for context in contexts:
+            counter = context.get(self._request_round_trips)
+            if counter is not None:
+                counters[id(counter)] = counter
+        token = self._charged_round_trips.set(list(counters.values()))
+        try:
+            yield
+        finally:
+            self._charged_round_trips.reset(token)
+
+    def finish_request(self, token: Any) -> int:
+        """
+        Stop counting for the current request and record its round trips.
+
+        Args:
+            token: Token returned by ``start_request``
+
+        Returns:
+            Number of Redis round trips made by the request
+        """
+        round_trips = self.request_round_trips()
+        self._request_round_trips.reset(token)
+        self.round_trips.observe(round_trips)
+        return round_trips
+
+    def reset(self) -> None:
+        """Forget every recorded metric."""
+        with self._lock:
+            self._commands.clear()
+            self._prefixes.clear()
+            self.round_trips = Histogram(ROUND_TRIP_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get every metric as plain data.
+
+        Returns:
+            Dictionary with per-command latency (ms), per-prefix stats and
+            round trips per request
+        """
+        with self._lock:
+            commands = dict(self._commands)
+            prefixes = dict(self._prefixes)
+        return {
+            "commands": {name: hist.snapshot() for name, hist in commands.items()},
+            "prefixes": {name: stats.snapshot() for name, stats in prefixes.items()},
+            "round_trips_per_request": self.round_trips.snapshot(),
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Export every metric in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text
+        """
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: Dict[str, Any]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, data in series.items():
+                sep = "," if labels else ""
+                for bound, count in data["buckets"]:
+                    lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {count}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {data['sum']}")
+                lines.append(f"{name}_count{suffix} {data['count']}")
+
+        histogram(
+            "redis_command_duration_milliseconds",
+            "Redis round-trip latency per command.",
+            {f'command="{c}"': data for c, data in snapshot["commands"].items()},
+        )
+        lines.append(
+            "# HELP cache_lookups_total Cache lookups by key prefix and result."
+        )
+        lines.append("# TYPE cache_lookups_total counter")
+        for prefix, stats in snapshot["prefixes"].items():
+            for result in ("local_hits", "redis_hits", "misses", "errors"):
+                lines.append(
+                    f'cache_lookups_total{{prefix="{prefix}",result="{result}"}} '
+                    f"{stats[result]}"
+                )
+        for direction, verb in (("read", "read from"), ("write", "written to")):
+            histogram(
+                f"cache_value_{direction}_bytes",
+                f"Size of values {verb} Redis by key prefix.",
+                {
+                    f'prefix="{prefix}"': stats[f"{direction}_bytes"]
+                    for prefix, stats in snapshot["prefixes"].items()
+                },
+            )
+        histogram(
+            "redis_round_trips_per_request",
+            "Redis round trips made while serving one HTTP request.",
+            {"": snapshot["round_trips_per_request"]},
+        )
+        return "\n".join(lines) + "\n"
+
+
+# Per-worker registry shared by the cache services and the middleware
+cache_metrics = CacheMetrics()
+
+
+class RedisRoundTripMiddleware:
+    """
+    ASGI middleware counting the Redis round trips made by each HTTP request.
+
+    The count is recorded in ``cache_metrics`` and returned to the client in
+    the ``X-Redis-Round-Trips`` response header.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_header(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                round_trips = str(cache_metrics.request_round_trips()).encode()
+                headers = list(message.get("headers", []))
+                headers.append((b"x-redis-round-trips", round_trips))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = cache_metrics.start_request()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            cache_metrics.finish_request(token)
@@ -0,0 +1,138 @@
+"""
+Circuit breaker for guarding calls to unreliable dependencies.
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker with exponential backoff between probes.
+
+    The circuit opens after ``failure_threshold`` consecutive failures and
+    rejects calls without touching the dependency. Once the reset timeout
+    has elapsed a single probe call is let through (half-open); success
+    closes the circuit, failure reopens it with the timeout doubled up to
+    ``max_reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 1.0,
+        max_reset_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the circuit and forget all failures."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._reset_timeout = self.base_reset_timeout
+            self._opened_at = 0.0
+            self._probe_in_flight = False
+            self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the circuit."""
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go through.
+
+        Returns:
+            True if the call should be attempted, False to fail fast
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_at < self._reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = CircuitState.HALF_OPEN
+            # Half-open: only one probe at a time
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._reset_timeout = self.base_reset_timeout
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if needed."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                # Failed probe: back off further before the next one
+                self._reset_timeout = min(
+                    self._reset_timeout * 2, self.max_reset_timeout
+                )
+                self._open()
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """Give up a call without an outcome, freeing the half-open probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Open the circuit. Must be called with the lock held."""
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        logger.warning(
+            f"Circuit {self.name} opened, next probe in {self._reset_timeout}s"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the breaker's current state and counters.
+
+        Returns:
+            Dictionary describing the breaker
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._state.value,
+                "consecutive_failures": self._failures,
+                "reset_timeout": self._reset_timeout,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,51 @@
+"""
+Application settings loaded from environment variables or a .env file.
+"""
+
+from typing import List, Literal, Optional, Tuple
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.constants.cache_constants import (
+    REDIS_CONNECTION_POOL_SIZE,
+    REDIS_CONNECTION_TIMEOUT_SECONDS,
+    REDIS_HEDGE_DELAY_MILLISECONDS,
+)
+
+
+class RedisSettings(BaseSettings):
+    """Connection settings for the Redis / ElastiCache cache."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    redis_password: Optional[str] = None
+    redis_db: int = 0
+    redis_connection_pool_size: int = REDIS_CONNECTION_POOL_SIZE
+    redis_connection_timeout: float = REDIS_CONNECTION_TIMEOUT_SECONDS
+    elasticache_tls_enabled: bool = False
+    elasticache_ssl_cert_reqs: Optional[Literal["none", "optional", "required"]] = None
+    # Comma-separated "host[:port]" list of read replicas
+    redis_replica_hosts: str = ""
+    redis_hedged_reads: bool = False
+    redis_hedge_delay_ms: float = REDIS_HEDGE_DELAY_MILLISECONDS
+
+    @property
+    def replica_endpoints(self) -> List[Tuple[str, int]]:
+        """
+        Parse the configured read replicas.
+
+        Returns:
+            List of (host, port) tuples, empty if no replicas are configured
+        """
+        endpoints = []
+        for entry in self.redis_replica_hosts.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            host, _, port = entry.partition(":")
+            endpoints.append((host, int(port) if port else self.redis_port))
+        return endpoints
@@ -0,0 +1,139 @@
+"""
+Rolling window of pre-rendered log entries.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from app.core.logging import get_logger
+from app.core.sliced_array import pack_array
+
+logger = get_logger(__name__)
+
+
+class LogRing:
+    """
+    Bounded ring of the newest ``capacity`` log entries, rendered ahead of reads.
+
+    A new entry is due every ``interval`` seconds of wall-clock time. Entry
+    ``n`` (due at ``n * interval``) is rendered by ``render_entry(n)``,
+    which must be a pure function of ``n``: every worker then holds the
+    same entries at the same time, and a worker that was idle catches up by
+    rendering only the entries still inside the window.
+
+    A background producer appends each entry when it is due and re-packs
+    the window newest first, so reads are one ``slice_array`` of a ready
+    snapshot. ``start`` renders the first window before it returns, and
+    while the producer is not running (before startup, in scripts and
+    tests) or the window has never been rendered, reads bring the window up
+    to date themselves.
+    """
+
+    def __init__(
+        self, render_entry: Callable[[int], bytes], capacity: int, interval: float
+    ):
+        self.render_entry = render_entry
+        self.capacity = capacity
+        self.interval = interval
+        self._entries: Deque[bytes] = deque(maxlen=capacity)
+        self._tick: Optional[int] = None
+        self._snapshot = pack_array([])
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.rendered = 0
+
+    def current_tick(self, now: Optional[float] = None) -> int:
+        """Return the number of the newest entry due at ``now``."""
+        return int((time.time() if now is None else now) // self.interval)
+
+    def advance(self, now: Optional[float] = None) -> bool:
+        """
+        Render the entries that became due since the last call.
+
+        Args:
+            now: Epoch time to advance to (the current time if None)
+
+        Returns:
+            True if new entries were appended
+        """
+        tick = self.current_tick(now)
+        if self._tick is not None and tick <= self._tick:
+            return False
+        with self._lock:
+            if self._tick is not None and tick <= self._tick:
+                return False
+            first = tick - self.capacity + 1
+            if self._tick is not None:
+                first = max(first, self._tick + 1)
+            for number in range(first, tick + 1):
+                self._entries.appendleft(self.render_entry(number))
+                self.rendered += 1
+            self._snapshot = pack_array(list(self._entries))
+            self._tick = tick
+        return True
+
+    def snapshot(self) -> bytes:
+        """
+        Get the window, newest entry first.
+
+        While the producer is running, this only renders if the first window
+        failed to render at startup.
+
+        Returns:
+            Packed JSON array of the entries (see ``slice_array``)
+        """
+        if self._task is None or self._tick is None:
+            self.advance()
+        return self._snapshot
+
+    async def start(self) -> None:
+        """
+        Render the first window, then start the producer on the running loop.
+
+        The first render builds the company corpus, so it runs off the event
+        loop; startup waits for it so the first read is already full.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            await asyncio.to_thread(self.advance)
+        except Exception as e:
+            logger.error(f"Rendering log entries failed: {str(e)}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the producer; reads then advance the window themselves."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Render every entry when due, until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval - time.time() % self.interval)
+            try:
+                self.advance()
+            except Exception as e:
+                logger.error(f"Rendering log entries failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get ring statistics for this worker.
+
+        Returns:
+            Dictionary with the window position and render counter
+        """
+        return {
+            "capacity": self.capacity,
+            "interval": self.interval,
+            "newest_entry": self._tick,
+            "rendered": self.rendered,
+            "producer_running": self._task is not None,
+        }
@@ -0,0 +1,87 @@
+"""
+Log message templates compiled once into specialized renderers.
+"""
+
+import random
+from string import Formatter
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+# Draws the value of one template field from a generator, for a log
+# message stamped at the given epoch time
+FieldGenerator = Callable[[random.Random, float], Any]
+
+_FORMATTER = Formatter()
+
+# Literal text, then the index of the field value that follows it (None at
+# the end of the template), its conversion and its format spec
+_Segment = Tuple[str, Optional[int], Optional[str], str]
+
+
+class LogTemplate:
+    """
+    Message template parsed once, with the generators of its fields bound.
+
+    The template is split once into literal text and field segments.
+    Rendering draws values only for the fields the template contains, in
+    the order they appear, and joins them with the literals, so the
+    template is never parsed per message. Costly fields (a formatted
+    timestamp, a company name) are only computed by the templates that show
+    them.
+    """
+
+    def __init__(self, template: str, generators: Dict[str, FieldGenerator]):
+        parsed = list(_FORMATTER.parse(template))
+        fields = list(dict.fromkeys(field for _, field, _, _ in parsed if field))
+        self.template = template
+        self._generators = tuple((field, generators[field]) for field in fields)
+        self._segments: Tuple[_Segment, ...] = tuple(
+            (
+                literal,
+                fields.index(field) if field else None,
+                conversion,
+                spec or "",
+            )
+            for literal, field, spec, conversion in parsed
+        )
+
+    def render(self, rng: random.Random, at: float) -> str:
+        """
+        Render a message.
+
+        Args:
+            rng: Generator the field values are drawn from
+            at: Epoch time the message is stamped with
+
+        Returns:
+            Rendered message
+        """
+        values = [generate(rng, at) for _, generate in self._generators]
+        parts = []
+        for literal, index, conversion, spec in self._segments:
+            parts.append(literal)
+            if index is not None:
+                parts.append(
+                    _FORMATTER.format_field(
+                        _FORMATTER.convert_field(values[index], conversion), spec
+                    )
+                )
+        return "".join(parts)
+
+
+def compile_templates(
+    templates: Sequence[str], generators: Dict[str, FieldGenerator]
+) -> Tuple[LogTemplate, ...]:
+    """
+    Compile a family of templates sharing the same field generators.
+
+    Args:
+        templates: Message templates in ``str.format`` syntax
+        generators: Generator of every field used by the templates
+
+    Returns:
+        Compiled templates, in the same order
+
+    Raises:
+        KeyError: If a template uses a field without a generator
+    """
+    return tuple(LogTemplate(template, generators) for template in templates)
@@ -0,0 +1,57 @@
+"""
+Opaque cursors for paginating seeded virtual datasets.
+"""
+
+import base64
+import binascii
+from typing import Collection, Tuple
+
+from app.errors.pagination_errors import InvalidCursorError
+
+
+def encode_cursor(seed: int, offset: int) -> str:
+    """
+    Encode a position in a seeded dataset as an opaque cursor.
+
+    The cursor carries the seed, so following it always continues the same
+    dataset even if the default seed changes in between.
+
+    Args:
+        seed: Seed of the dataset
+        offset: Index of the first item of the page
+
+    Returns:
+        URL-safe cursor
+    """
+    return base64.urlsafe_b64encode(f"{seed}:{offset}".encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, seeds: Collection[int], size: int) -> Tuple[int, int]:
+    """
+    Decode a cursor built by ``encode_cursor``.
+
+    Cursors are not signed, so the seed is checked against the datasets
+    actually served: a client-chosen seed would otherwise open a new
+    dataset, and a new family of cache keys, per request.
+
+    Args:
+        cursor: Cursor received from a client
+        seeds: Seeds of the datasets cursors may continue
+        size: Number of items in each dataset
+
+    Returns:
+        Tuple of seed and offset
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, or points to an
+            unknown dataset or past its end
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        seed, offset = base64.urlsafe_b64decode(padded).decode().split(":")
+        seed, offset = int(seed), int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError() from e
+    if seed not in seeds or not 0 <= offset < size:
+        raise InvalidCursorError()
+    return seed, offset
@@ -0,0 +1,53 @@
+"""
+Isolated, explicitly seeded random generators for mock data.
+"""
+
+import random
+import threading
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+
+def seeded_generators(seed: int) -> Tuple[random.Random, "Faker"]:
+    """
+    Create a random generator and a Faker instance owned by one caller.
+
+    The Faker instance draws from the returned generator instead of the
+    process-global ``random`` state, so generation calls can run in
+    parallel threads or processes and the same seed always produces the
+    same output. Faker and its locale data are only imported on the first
+    call, keeping them off the application's import path.
+
+    Args:
+        seed: Seed of the generator
+
+    Returns:
+        Tuple of the generator and a Faker instance backed by it
+    """
+    from faker import Faker
+
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.random = rng
+    return rng, fake
+
+
+class SeedSequence:
+    """
+    Thread-safe, reproducible stream of seeds.
+
+    Hands out a new seed for every generation that has no explicit one, so
+    successive datasets differ while a process still produces the same
+    datasets in the same order from its base seed.
+    """
+
+    def __init__(self, seed: int):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        """Return the next seed of the sequence."""
+        with self._lock:
+            return self._rng.getrandbits(64)
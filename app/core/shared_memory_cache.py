@@ -0,0 +1,375 @@
+"""
+Host-wide cache tier shared by every worker process through an mmap'd file.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Segment header: magic, slot count, slot size
+_MAGIC = b"MINTSHM1"
+_SEGMENT_HEADER = struct.Struct("<8sII")
+_SEGMENT_HEADER_SIZE = 64
+
+# Slot header: sequence, wall-clock expiry, key hash, key length, value length
+_SLOT_HEADER = struct.Struct("<QdQII")
+_SEQUENCE = struct.Struct("<Q")
+
+# Slots probed for a key before the oldest one is overwritten
+_PROBE_SLOTS = 4
+
+# Reads retried while a writer is updating the slot before giving up
+_READ_RETRIES = 16
+
+
+def _key_hash(key: bytes) -> int:
+    """Hash a key the same way in every process (unlike the built-in hash)."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class SharedMemoryCache:
+    """
+    Fixed-size hash table of byte values in a memory-mapped file.
+
+    Every worker on the host maps the same file, so a value stored by one
+    worker is served to all of them without another Redis round trip and
+    without a private copy per process. The segment is split into
+    ``slots`` slots of ``slot_bytes`` bytes; a key may live in any of the
+    ``_PROBE_SLOTS`` slots after its hash, and when all of them are taken
+    the one closest to expiry is overwritten. Values that do not fit in a
+    slot are not cached.
+
+    Each slot is guarded by a seqlock. Writers, serialized by a file lock
+    across processes and a thread lock within one, make the sequence odd
+    while they update a slot and even again when done. Readers take no lock:
+    they copy the slot and retry if the sequence was odd or changed
+    meanwhile. Expiry uses wall-clock time, so it is comparable between
+    processes.
+
+    The file is opened lazily and reopened after a fork. If it cannot be
+    created, or was created with a different layout, the tier disables
+    itself and callers fall back to their per-process cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        slots: int,
+        slot_bytes: int,
+        enabled: bool = True,
+    ):
+        self.path = path
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.enabled = enabled and slots > 0 and slot_bytes > _SLOT_HEADER.size
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._pid: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.oversized = 0
+        self.read_retries = 0
+
+    @property
+    def size(self) -> int:
+        """Size in bytes of the whole segment."""
+        return _SEGMENT_HEADER_SIZE + self.slots * self.slot_bytes
+
+    def _segment(self) -> Optional[mmap.mmap]:
+        """
+        Map the segment into this process, creating it if needed.
+
+        Returns:
+            The mapped segment, or None if the tier is disabled
+        """
+        if not self.enabled:
+            return None
+        if self._map is not None and self._pid == os.getpid():
+            return self._map
+        with self._lock:
+            if self._map is not None and self._pid == os.getpid():
+                return self._map
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.lockf(fd, fcntl.LOCK_EX)
+                    try:
+                        self._initialize(fd)
+                    finally:
+                        fcntl.lockf(fd, fcntl.LOCK_UN)
+                    segment = mmap.mmap(fd, self.size)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except (OSError, ValueError) as e:
+                logger.warning(f"Shared memory cache disabled ({self.path}): {str(e)}")
+                self.enabled = False
+                return None
+            self._fd, self._map, self._pid = fd, segment, os.getpid()
+            logger.info(
+                f"Mapped shared memory cache {self.path} "
+                f"({self.slots} slots of {self.slot_bytes} bytes)"
+            )
+            return segment
+
+    def _initialize(self, fd: int) -> None:
+        """
+        Write the segment header on first use, or check the existing one.
+
+        Args:
+            fd: Segment file, locked exclusively by the caller
+
+        Raises:
+            ValueError: If the file was created with a different layout
+        """
+        if os.fstat(fd).st_size == 0:
+            os.ftruncate(fd, self.size)
+            os.pwrite(fd, _SEGMENT_HEADER.pack(_MAGIC, self.slots, self.slot_bytes), 0)
+            return
+        header = os.pread(fd, _SEGMENT_HEADER.size, 0)
+        if header != _SEGMENT_HEADER.pack(_MAGIC, self.slots, self.slot_bytes):
+            raise ValueError("segment exists with a different layout")
+
+    def _offset(self, index: int) -> int:
+        """Return the byte offset of a slot."""
+        return _SEGMENT_HEADER_SIZE + index * self.slot_bytes
+
+    def _probe(self, key_hash: int) -> Iterator[int]:
+        """Yield the slot indexes a key may be stored in."""
+        for step in range(min(_PROBE_SLOTS, self.slots)):
+            yield (key_hash + step) % self.slots
+
+    def _read_slot(
+        self, segment: mmap.mmap, index: int
+    ) -> Optional[Tuple[float, int, bytes, bytes]]:
+        """
+        Copy a slot without locking, retrying while a writer updates it.
+
+        Args:
+            segment: Mapped segment
+            index: Slot index
+
+        Returns:
+            Tuple of expiry, key hash, key and value, or None if the slot is
+            empty or kept changing
+        """
+        offset = self._offset(index)
+        for _ in range(_READ_RETRIES):
+            sequence, expires_at, key_hash, key_len, value_len = (
+                _SLOT_HEADER.unpack_from(segment, offset)
+            )
+            if sequence % 2 == 0:
+                if key_len == 0:
+                    return None
+                start = offset + _SLOT_HEADER.size
+                key = segment[start : start + key_len]
+                value = segment[start + key_len : start + key_len + value_len]
+                if _SEQUENCE.unpack_from(segment, offset)[0] == sequence:
+                    return expires_at, key_hash, key, value
+            self.read_retries += 1
+            time.sleep(0)
+        return None
+
+    def _write_slot(
+        self,
+        segment: mmap.mmap,
+        index: int,
+        expires_at: float,
+        key_hash: int,
+        key: bytes,
+        value: bytes,
+    ) -> None:
+        """Overwrite a slot; the caller must hold the write lock."""
+        offset = self._offset(index)
+        sequence = _SEQUENCE.unpack_from(segment, offset)[0]
+        _SEQUENCE.pack_into(segment, offset, sequence + 1)
+        start = offset + _SLOT_HEADER.size
+        segment[start : start + len(key) + len(value)] = key + value
+        _SLOT_HEADER.pack_into(
+            segment, offset, sequence + 1, expires_at, key_hash, len(key), len(value)
+        )
+        _SEQUENCE.pack_into(segment, offset, sequence + 2)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialize writers across threads (thread lock) and processes (file lock)."""
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, _SEGMENT_HEADER_SIZE, 0)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, _SEGMENT_HEADER_SIZE, 0)
+
+    def _find(
+        self, key: str, include_expired: bool = False
+    ) -> Tuple[Optional[bytes], Optional[float]]:
+        """Look a key up and return its value and remaining TTL."""
+        segment = self._segment()
+        if segment is None:
+            return None, None
+        encoded = key.encode()
+        key_hash = _key_hash(encoded)
+        for index in self._probe(key_hash):
+            entry = self._read_slot(segment, index)
+            if entry is None:
+                continue
+            expires_at, entry_hash, entry_key, value = entry
+            if entry_hash == key_hash and entry_key == encoded:
+                remaining = expires_at - time.time()
+                if remaining > 0 or include_expired:
+                    return value, remaining
+                return None, None
+        return None, None
+
+    def get_with_ttl(
+        self, key: str, min_ttl: float = 0.0
+    ) -> Tuple[Optional[bytes], Optional[float]]:
+        """
+        Get a live value and its remaining TTL from the shared tier.
+
+        Args:
+            key: Cache key
+            min_ttl: Treat entries with this many seconds or fewer left as missing
+
+        Returns:
+            Tuple of cached bytes and remaining TTL in seconds, or (None, None)
+        """
+        value, remaining = self._find(key)
+        if value is None or remaining <= min_ttl:
+            self.misses += 1
+            return None, None
+        self.hits += 1
+        return value, remaining
+
+    def get_stale(self, key: str) -> Optional[bytes]:
+        """
+        Get the last value stored for a key, even if it has expired.
+
+        Only meant as a fallback while Redis is unavailable.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Last stored bytes or None if never cached or already overwritten
+        """
+        return self._find(key, include_expired=True)[0]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Store a value in the shared tier.
+
+        Args:
+            key: Cache key
+            value: Bytes to cache
+            ttl: Time to live in seconds
+        """
+        if ttl <= 0:
+            return
+        segment = self._segment()
+        if segment is None:
+            return
+        encoded = key.encode()
+        if _SLOT_HEADER.size + len(encoded) + len(value) > self.slot_bytes:
+            self.oversized += 1
+            return
+        key_hash = _key_hash(encoded)
+        now = time.time()
+        with self._locked():
+            target, target_expiry = None, None
+            for index in self._probe(key_hash):
+                entry = self._read_slot(segment, index)
+                if entry is None:
+                    target, target_expiry = index, None
+                    break
+                expires_at, entry_hash, entry_key, _ = entry
+                if entry_hash == key_hash and entry_key == encoded:
+                    target, target_expiry = index, None
+                    break
+                if target is None or (
+                    target_expiry is not None and expires_at < target_expiry
+                ):
+                    target, target_expiry = index, expires_at
+            if target_expiry is not None and target_expiry > now:
+                self.evictions += 1
+            self._write_slot(segment, target, now + ttl, key_hash, encoded, value)
+            self.writes += 1
+
+    def _clear_slots(self, matches: Any) -> int:
+        """Empty every slot whose key satisfies ``matches``."""
+        segment = self._segment()
+        if segment is None:
+            return 0
+        removed = 0
+        with self._locked():
+            for index in range(self.slots):
+                entry = self._read_slot(segment, index)
+                if entry is not None and matches(entry[2]):
+                    self._write_slot(segment, index, 0.0, 0, b"", b"")
+                    removed += 1
+        return removed
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the shared tier."""
+        encoded = key.encode()
+        self._clear_slots(lambda entry_key: entry_key == encoded)
+
+    def delete_prefix(self, prefix: str) -> int:
+        """
+        Remove every key starting with a prefix from the shared tier.
+
+        Args:
+            prefix: Key prefix; an empty prefix removes every entry
+
+        Returns:
+            Number of entries removed
+        """
+        encoded = prefix.encode()
+        return self._clear_slots(lambda entry_key: entry_key.startswith(encoded))
+
+    def clear(self) -> None:
+        """Remove every entry from the shared tier."""
+        self.delete_prefix("")
+
+    def close(self) -> None:
+        """Unmap the segment from this process (the file is kept)."""
+        with self._lock:
+            if self._map is not None and self._pid == os.getpid():
+                self._map.close()
+                os.close(self._fd)
+            self._fd, self._map, self._pid = None, None, None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get shared tier statistics for this process.
+
+        Returns:
+            Dictionary with segment layout and hit, miss and write counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "slots": self.slots,
+            "slot_bytes": self.slot_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "oversized": self.oversized,
+            "read_retries": self.read_retries,
+        }
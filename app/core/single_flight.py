@@ -0,0 +1,125 @@
+"""
+Single-flight coalescing of concurrent calls.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight synchronous call that followers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    """An in-flight task and the number of callers awaiting it."""
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key (the leader) runs the function; every caller
+    that arrives while it is still running waits for and shares its result
+    or exception. Threads use ``do`` and asyncio tasks use ``do_async``; the
+    two are tracked separately and async calls are scoped to their event
+    loop. An async call runs in its own task, so cancelling any one caller
+    (the leader included) does not affect the others; the task is only
+    cancelled once every caller has gone.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[Tuple[asyncio.AbstractEventLoop, str], _AsyncCall] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` once per key across concurrent threads.
+
+        Args:
+            key: Key identifying the computation
+            fn: Function to run if no call for the key is in flight
+
+        Returns:
+            The result of the single in-flight call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn`` once per key across concurrent tasks on the running loop.
+
+        Args:
+            key: Key identifying the computation
+            fn: Coroutine function to await if no call for the key is in flight
+
+        Returns:
+            The result of the single in-flight call
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+
+        call = self._async_calls.get(flight_key)
+        if call is None:
+            call = self._async_calls[flight_key] = _AsyncCall(loop.create_task(fn()))
+            call.task.add_done_callback(
+                lambda task: self._finish_async(flight_key, call)
+            )
+
+        call.waiters += 1
+        try:
+            # Shield so a cancelled caller does not cancel the shared call
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _finish_async(
+        self, flight_key: Tuple[asyncio.AbstractEventLoop, str], call: _AsyncCall
+    ) -> None:
+        """Forget a finished async call so the next caller runs it again."""
+        if self._async_calls.get(flight_key) is call:
+            del self._async_calls[flight_key]
+        if not call.task.cancelled():
+            # Mark the exception as retrieved in case nobody else is waiting
+            call.task.exception()
+
+    def in_flight(self) -> int:
+        """Return the number of calls currently in flight."""
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
@@ -0,0 +1,55 @@
+"""
+Rendered JSON arrays that can be cut to their first N elements without parsing.
+"""
+
+import struct
+from typing import Sequence
+
+# Element count, followed by one end offset per element
+_COUNT = struct.Struct("<I")
+_OFFSET = struct.Struct("<I")
+
+
+def pack_array(items: Sequence[bytes]) -> bytes:
+    """
+    Join JSON-encoded elements into one array, indexed by element offsets.
+
+    The result starts with the element count and the end offset of every
+    element within the array body (little-endian uint32s), followed by the
+    compact JSON array itself, so ``slice_array`` can return any prefix of
+    it as a JSON array with a single copy.
+
+    Args:
+        items: JSON-encoded elements
+
+    Returns:
+        Packed array
+    """
+    offsets = []
+    end = 0
+    for item in items:
+        # Opening bracket or separating comma, then the element
+        end += 1 + len(item)
+        offsets.append(end)
+    body = b"[" + b",".join(items) + b"]"
+    return _COUNT.pack(len(items)) + struct.pack(f"<{len(items)}I", *offsets) + body
+
+
+def slice_array(packed: bytes, limit: int) -> bytes:
+    """
+    Get the first ``limit`` elements of a packed array as a JSON array.
+
+    Args:
+        packed: Array built by ``pack_array``
+        limit: Number of elements to keep; more than available keeps them all
+
+    Returns:
+        JSON-encoded array of at most ``limit`` elements
+    """
+    count = _COUNT.unpack_from(packed)[0]
+    limit = max(0, min(limit, count))
+    if limit == 0:
+        return b"[]"
+    body = _COUNT.size + count * _OFFSET.size
+    end = _OFFSET.unpack_from(packed, _COUNT.size + (limit - 1) * _OFFSET.size)[0]
+    return packed[body : body + end] + b"]"
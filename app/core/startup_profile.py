@@ -0,0 +1,186 @@
+"""
+Breakdown of where application startup time goes.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Modules listed in the report, slowest first
+_REPORTED_MODULES = 25
+
+
+class _TimedLoader:
+    """Loader proxy timing the execution of one module."""
+
+    def __init__(self, loader: Any, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec: ModuleSpec) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        with self._timer.timing(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Import hook measuring how long every module takes to import.
+
+    It wraps the loader found by the other finders, so a module's time
+    covers its module-level initialization (singletons, connections,
+    precomputed tables) as well as loading its code. Self time excludes
+    the modules it imported in turn, like ``python -X importtime``.
+    """
+
+    def __init__(self) -> None:
+        self.modules: Dict[str, List[float]] = {}
+        self._children: List[float] = []
+
+    def find_spec(
+        self, fullname: str, path: Optional[Sequence[str]], target: Any = None
+    ) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    @contextmanager
+    def timing(self, name: str) -> Iterator[None]:
+        """Time one module, subtracting nested imports from its self time."""
+        outer, self._children = self._children, []
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative = time.perf_counter() - started
+            self.modules[name] = [cumulative - sum(self._children), cumulative]
+            self._children = outer
+            self._children.append(cumulative)
+
+    def report(self, limit: int = _REPORTED_MODULES) -> Dict[str, Any]:
+        """
+        Summarize the measured imports.
+
+        Args:
+            limit: Number of modules to list
+
+        Returns:
+            Dictionary with the slowest modules and self time per top-level
+            package, in seconds
+        """
+        packages: Dict[str, float] = {}
+        for name, (self_time, _) in self.modules.items():
+            package = name.partition(".")[0]
+            packages[package] = packages.get(package, 0.0) + self_time
+        slowest = sorted(self.modules.items(), key=lambda item: -item[1][0])[:limit]
+        return {
+            "modules": [
+                {"module": name, "self": self_time, "cumulative": cumulative}
+                for name, (self_time, cumulative) in slowest
+            ],
+            "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        }
+
+
+class StartupProfile:
+    """
+    Timeline of the startup of one worker, from importing ``app`` to ready.
+
+    Startup stages (importing the application, building it, each lifespan
+    step) are always recorded; they cost one clock read each. Per-module
+    import times need an import hook and are only collected when enabled
+    before the application modules are imported. The hook is removed once
+    the worker is ready so later imports are not slowed down.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.ready_seconds: Optional[float] = None
+        self._checkpoint = self.started
+        self._timer: Optional[ImportTimer] = None
+        self._imports: Optional[Dict[str, Any]] = None
+
+    def enable_import_timing(self) -> None:
+        """Start timing every module imported from now on."""
+        if self._timer is None:
+            self._timer = ImportTimer()
+            sys.meta_path.insert(0, self._timer)
+
+    def checkpoint(self, name: str) -> None:
+        """Record the time since the previous checkpoint (or start) as a stage."""
+        now = time.perf_counter()
+        self.stages[name] = now - self._checkpoint
+        self._checkpoint = now
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the time spent in the block as a stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - started
+            self._checkpoint = time.perf_counter()
+
+    def mark_ready(self) -> None:
+        """Record that the worker accepts requests and log the report."""
+        self.ready_seconds = time.perf_counter() - self.started
+        if self._timer is not None:
+            if self._timer in sys.meta_path:
+                sys.meta_path.remove(self._timer)
+            self._imports = self._timer.report()
+            self._timer = None
+        stages = ", ".join(
+            f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.stages.items()
+        )
+        logger.info(f"Ready in {self.ready_seconds * 1000:.1f}ms ({stages})")
+        if self._imports is not None:
+            slowest = ", ".join(
+                f"{entry['module']} {entry['self'] * 1000:.1f}ms"
+                for entry in self._imports["modules"][:5]
+            )
+            logger.info(f"Slowest imports: {slowest}")
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the startup report.
+
+        Returns:
+            Dictionary with the time to ready, the stages and, if import
+            timing was enabled, the per-module import breakdown (seconds)
+        """
+        imports = self._imports
+        if imports is None and self._timer is not None:
+            imports = self._timer.report()
+        return {
+            "ready_seconds": self.ready_seconds,
+            "stages": dict(self.stages),
+            "imports": imports,
+        }
+
+
+# Startup timeline of this worker, started when the ``app`` package is imported
+startup_profile = StartupProfile()
+import_timing_enabled = os.getenv("STARTUP_PROFILE_IMPORTS", "false").lower() == "true"
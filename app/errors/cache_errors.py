@@ -17,3 +17,10 @@ class CacheOperationError(HTTPException):
 
     def __init__(self, detail: str = "Error performing cache operation"):
         super().__init__(status_code=500, detail=detail)
+
+
+class CacheUnavailableError(CacheConnectionError):
+    """Raised when cache calls are short-circuited because Redis is down."""
+
+    def __init__(self, detail: str = "Cache circuit is open"):
+        super().__init__(detail=detail)
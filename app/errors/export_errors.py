@@ -0,0 +1,26 @@
+"""
+Export-related error classes.
+"""
+
+from fastapi import HTTPException
+
+
+class ExportNotFoundError(HTTPException):
+    """Raised when an export does not exist or has expired."""
+
+    def __init__(self, detail: str = "Export not found"):
+        super().__init__(status_code=404, detail=detail)
+
+
+class ExportNotReadyError(HTTPException):
+    """Raised when downloading an export that has not completed."""
+
+    def __init__(self, detail: str = "Export has not completed"):
+        super().__init__(status_code=409, detail=detail)
+
+
+class ExportCapacityError(HTTPException):
+    """Raised when an export cannot be admitted without exceeding a limit."""
+
+    def __init__(self, detail: str = "Too many exports in progress"):
+        super().__init__(status_code=429, detail=detail)
@@ -0,0 +1,12 @@
+"""
+Pagination-related error classes.
+"""
+
+from fastapi import HTTPException
+
+
+class InvalidCursorError(HTTPException):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=400, detail=detail)
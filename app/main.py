@@ -2,15 +2,52 @@
 Main application entry point.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import router
+from app.core.cache_metrics import RedisRoundTripMiddleware
 from app.core.logging import get_logger
+from app.core.startup_profile import startup_profile
+from app.services.agent_logs_service import log_ring
+from app.services.caching_service import async_redis_cache, shared_cache
+from app.services.export_service import export_service
+from app.services.invalidation_service import (
+    invalidation_enabled,
+    invalidation_subscriber,
+)
+from app.services.log_broadcaster import log_broadcaster
+from app.services.refresh_scheduler import refresh_scheduler, refresh_scheduler_enabled
 
 # Initialize logger
 logger = get_logger(__name__)
 
+startup_profile.checkpoint("import")
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Manage resources that live for the lifetime of the application."""
+    with startup_profile.stage("redis_connect"):
+        await async_redis_cache.connect()
+    with startup_profile.stage("background_tasks"):
+        await log_ring.start()
+        if invalidation_enabled:
+            invalidation_subscriber.start()
+        if refresh_scheduler_enabled:
+            refresh_scheduler.start()
+    startup_profile.mark_ready()
+    yield
+    await export_service.shutdown()
+    await log_broadcaster.stop()
+    await log_ring.stop()
+    await refresh_scheduler.stop()
+    await invalidation_subscriber.stop()
+    await async_redis_cache.close()
+    shared_cache.close()
+
 
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application.
@@ -22,6 +59,7 @@ def create_application() -> FastAPI:
         title="Mint Server API",
         description="API for Mint Application",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     application.add_middleware(
@@ -32,9 +70,12 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    application.add_middleware(RedisRoundTripMiddleware)
+
     application.include_router(router)
 
     return application
 
 
-app = create_application()
+with startup_profile.stage("create_application"):
+    app = create_application()
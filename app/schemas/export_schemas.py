@@ -0,0 +1,56 @@
+"""
+Pydantic schemas for bulk invoice exports.
+"""
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.constants.export_constants import EXPORT_MAX_COUNT, EXPORT_MIN_COUNT
+
+
+class ExportRequest(BaseModel):
+    """Schema for submitting an export."""
+
+    count: int = Field(
+        ...,
+        ge=EXPORT_MIN_COUNT,
+        le=EXPORT_MAX_COUNT,
+        description="Number of invoices to export",
+    )
+    seed: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Seed of the invoices; the same seed gives the same file",
+    )
+    format: Literal["ndjson", "json", "csv", "snapshot"] = Field(
+        default="ndjson", description="Output format"
+    )
+
+
+class ExportJob(BaseModel):
+    """Schema for the state of an export."""
+
+    id: str = Field(..., description="Export ID")
+    status: Literal["queued", "running", "completed", "failed"] = Field(
+        ..., description="Current export status"
+    )
+    count: int = Field(..., description="Number of invoices exported")
+    seed: int = Field(..., description="Seed of the invoices")
+    format: Literal["ndjson", "json", "csv", "snapshot"] = Field(
+        ..., description="Output format"
+    )
+    shards: int = Field(..., description="Number of shards the export is split into")
+    shards_done: int = Field(default=0, description="Number of shards written")
+    size_bytes: Optional[int] = Field(
+        default=None, description="Size of the finished file"
+    )
+    created_at: float = Field(..., description="Submission time (epoch seconds)")
+    finished_at: Optional[float] = Field(
+        default=None, description="Completion or failure time (epoch seconds)"
+    )
+    heartbeat_at: Optional[float] = Field(
+        default=None,
+        description="Last time the owning worker saved the export (epoch seconds)",
+    )
+    error: Optional[str] = Field(default=None, description="Failure reason")
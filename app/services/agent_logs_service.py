@@ -4,25 +4,28 @@ Agent logs service for retrieving agent activity data.
 
 import datetime
 import random
+import time
 from datetime import UTC
-from typing import List
+from typing import Callable, List, Optional
 
-from faker import Faker
+from pydantic import TypeAdapter
 
 from app.constants.agent_logs_constants import (
-    CACHE_KEY_PREFIX,
-    CACHE_TTL_SECONDS,
+    LOG_INTERVAL_SECONDS,
     MAX_LIMIT,
+    RANDOM_SEED,
 )
+from app.core.log_ring import LogRing
+from app.core.log_templates import compile_templates
 from app.core.logging import get_logger
-from app.services.caching_service import redis_cache
+from app.core.sliced_array import slice_array
+from app.services.company_corpus import company_corpus
 
 logger = get_logger(__name__)
 
-# Initialize Faker with fixed seed as specified in requirements
-random.seed(4321)  # Set random seed for reproducibility first
-fake = Faker()
-Faker.seed(4321)  # Set random seed for Faker
+# Validates and renders log lists exactly as the /logs/agent response
+LOG_LIST = TypeAdapter(List[str])
+LOG = TypeAdapter(str)
 
 # Pre-defined message templates for realistic agent logs
 INVOICE_LOG_TEMPLATES = [
@@ -58,117 +61,212 @@ SYSTEM_LOG_TEMPLATES = [
 ]
 
 
+def _company(rng: random.Random) -> str:
+    """Pick a company name from the shared corpus."""
+    companies = company_corpus().names
+    return str(companies[rng.randrange(len(companies))])
+
+
+def _timestamp(at: float) -> str:
+    """Format an epoch time as an ISO 8601 UTC timestamp with milliseconds."""
+    stamp = datetime.datetime.fromtimestamp(at, UTC)
+    return stamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+# Templates compiled with the generators of their fields
+INVOICE_LOGS = compile_templates(
+    INVOICE_LOG_TEMPLATES,
+    {
+        "invoice_id": lambda rng, at: rng.randint(1000, 9999),
+        "company": lambda rng, at: _company(rng),
+        "batch_id": lambda rng, at: rng.randint(1, 100),
+    },
+)
+RISK_LOGS = compile_templates(
+    RISK_LOG_TEMPLATES,
+    {
+        "risk_score": lambda rng, at: round(rng.uniform(0.01, 0.99), 2),
+        "invoice_id": lambda rng, at: rng.randint(1000, 9999),
+        "batch_id": lambda rng, at: rng.randint(1, 100),
+        "count": lambda rng, at: rng.randint(10, 500),
+    },
+)
+FUNDING_LOGS = compile_templates(
+    FUNDING_LOG_TEMPLATES,
+    {
+        "batch_id": lambda rng, at: rng.randint(1, 100),
+        "invoice_id": lambda rng, at: rng.randint(1000, 9999),
+        "amount": lambda rng, at: f"{rng.randint(100_000, 10_000_000):,}",
+        "rate": lambda rng, at: round(rng.uniform(1.0, 15.0), 1),
+    },
+)
+SYSTEM_LOGS = compile_templates(
+    SYSTEM_LOG_TEMPLATES,
+    {
+        "timestamp": lambda rng, at: _timestamp(at),
+        "count": lambda rng, at: rng.randint(100, 10000),
+        "time": lambda rng, at: rng.randint(5, 200),
+        "status": lambda rng, at: rng.choice(["green", "yellow"]),
+    },
+)
+
+
 class AgentLogsService:
     """Service for generating and retrieving agent logs."""
 
     @classmethod
-    def _reset_random_state(cls) -> None:
-        """Reset random state to ensure deterministic results."""
-        random.seed(4321)
-        Faker.seed(4321)
-
-    @classmethod
-    def _generate_invoice_log(cls) -> str:
+    def _generate_invoice_log(
+        cls, rng: random.Random, at: Optional[float] = None
+    ) -> str:
         """Generate a random invoice-related log message."""
-        template = random.choice(INVOICE_LOG_TEMPLATES)
-        return template.format(
-            invoice_id=random.randint(1000, 9999),
-            company=fake.company(),
-            batch_id=random.randint(1, 100),
-        )
+        return rng.choice(INVOICE_LOGS).render(rng, time.time() if at is None else at)
 
     @classmethod
-    def _generate_risk_log(cls) -> str:
+    def _generate_risk_log(cls, rng: random.Random, at: Optional[float] = None) -> str:
         """Generate a random risk-related log message."""
-        template = random.choice(RISK_LOG_TEMPLATES)
-        return template.format(
-            risk_score=round(random.uniform(0.01, 0.99), 2),
-            invoice_id=random.randint(1000, 9999),
-            batch_id=random.randint(1, 100),
-            count=random.randint(10, 500),
-        )
+        return rng.choice(RISK_LOGS).render(rng, time.time() if at is None else at)
 
     @classmethod
-    def _generate_funding_log(cls) -> str:
+    def _generate_funding_log(
+        cls, rng: random.Random, at: Optional[float] = None
+    ) -> str:
         """Generate a random funding-related log message."""
-        template = random.choice(FUNDING_LOG_TEMPLATES)
-        return template.format(
-            batch_id=random.randint(1, 100),
-            invoice_id=random.randint(1000, 9999),
-            amount=f"{random.randint(100_000, 10_000_000):,}",
-            rate=round(random.uniform(1.0, 15.0), 1),
-        )
+        return rng.choice(FUNDING_LOGS).render(rng, time.time() if at is None else at)
 
     @classmethod
-    def _generate_system_log(cls) -> str:
+    def _generate_system_log(
+        cls, rng: random.Random, at: Optional[float] = None
+    ) -> str:
         """Generate a random system-related log message."""
-        template = random.choice(SYSTEM_LOG_TEMPLATES)
-        now = datetime.datetime.now(UTC)
-        timestamp = now.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        return rng.choice(SYSTEM_LOGS).render(rng, time.time() if at is None else at)
 
-        return template.format(
-            timestamp=timestamp,
-            count=random.randint(100, 10000),
-            time=random.randint(5, 200),
-            status=random.choice(["green", "yellow"]),
-        )
+    @classmethod
+    def _log_generators(cls) -> List[Callable[..., str]]:
+        """Return the category generators, picked with equal probability."""
+        return [
+            cls._generate_invoice_log,
+            cls._generate_risk_log,
+            cls._generate_funding_log,
+            cls._generate_system_log,
+        ]
 
     @classmethod
-    def generate_logs(cls, limit: int) -> List[str]:
+    def generate_logs(cls, limit: int, seed: int = RANDOM_SEED) -> List[str]:
         """
         Generate a list of deterministic agent logs.
 
+        Each call draws from its own generator, so calls can run in
+        parallel and the same seed always yields the same logs. Company
+        names come from the shared company corpus.
+
         Args:
             limit: Number of log messages to generate
+            seed: Seed of the generation
 
         Returns:
             List of agent log messages
         """
-        # Reset random state to ensure deterministic results
-        cls._reset_random_state()
+        rng = random.Random(seed)
 
         # Ensure limit is within bounds
         limit = min(limit, MAX_LIMIT)
 
-        log_generators = [
-            cls._generate_invoice_log,
-            cls._generate_risk_log,
-            cls._generate_funding_log,
-            cls._generate_system_log,
-        ]
+        log_generators = cls._log_generators()
+        return [rng.choice(log_generators)(rng) for _ in range(limit)]
+
+    @classmethod
+    def render_log_entry(cls, number: int, seed: int = RANDOM_SEED) -> bytes:
+        """
+        Render entry ``number`` of the rolling log feed.
+
+        The entry is a pure function of its number and the seed, and is
+        stamped with the time it is due, so every worker renders the same
+        entry for the same number.
+
+        Args:
+            number: Entry number, due at ``number * LOG_INTERVAL_SECONDS``
+            seed: Seed of the feed
+
+        Returns:
+            JSON-encoded log message
+        """
+        rng = random.Random(f"{seed}:{number}")
+        generator = rng.choice(cls._log_generators())
+        return LOG.dump_json(generator(rng, number * LOG_INTERVAL_SECONDS))
+
+    @classmethod
+    def get_agent_logs_dataset(cls) -> bytes:
+        """
+        Get the newest ``MAX_LIMIT`` logs of the rolling feed.
+
+        Returns:
+            Packed JSON array of log messages, newest first (see ``slice_array``)
+        """
+        return log_ring.snapshot()
+
+    @classmethod
+    async def get_agent_logs_dataset_async(cls) -> bytes:
+        """
+        Get the newest ``MAX_LIMIT`` logs of the rolling feed from a coroutine.
+
+        Returns:
+            Packed JSON array of log messages, newest first (see ``slice_array``)
+        """
+        return cls.get_agent_logs_dataset()
+
+    @classmethod
+    def get_agent_logs_body(cls, limit: int) -> bytes:
+        """
+        Get the newest agent logs as a pre-rendered JSON body.
+
+        Args:
+            limit: Number of log messages to retrieve
 
-        logs = []
-        for _ in range(limit):
-            # Select a random generator with equal probability
-            generator = random.choice(log_generators)
-            logs.append(generator())
+        Returns:
+            JSON-encoded list of log messages, ready to send as a response
+        """
+        return slice_array(cls.get_agent_logs_dataset(), limit)
 
-        return logs
+    @classmethod
+    async def get_agent_logs_body_async(cls, limit: int) -> bytes:
+        """
+        Get the newest agent logs as a pre-rendered JSON body from a coroutine.
+
+        Args:
+            limit: Number of log messages to retrieve
+
+        Returns:
+            JSON-encoded list of log messages, ready to send as a response
+        """
+        return slice_array(await cls.get_agent_logs_dataset_async(), limit)
 
     @classmethod
     def get_agent_logs(cls, limit: int) -> List[str]:
         """
-        Get agent logs with caching.
+        Get the newest agent logs.
 
         Args:
             limit: Number of log messages to retrieve
 
         Returns:
-            List of agent log message strings
+            List of agent log message strings, newest first
+        """
+        return LOG_LIST.validate_json(cls.get_agent_logs_body(limit))
+
+    @classmethod
+    async def get_agent_logs_async(cls, limit: int) -> List[str]:
         """
-        # Check cache first
-        cache_key = f"{CACHE_KEY_PREFIX}:{limit}"
-        cached_data = redis_cache.get_json(cache_key)
+        Get the newest agent logs from a coroutine.
 
-        if cached_data:
-            logger.debug(f"Cache hit for {cache_key}")
-            return cached_data
+        Args:
+            limit: Number of log messages to retrieve
 
-        # Generate new data
-        logger.debug(f"Cache miss for {cache_key}, generating agent logs")
-        logs = cls.generate_logs(limit)
+        Returns:
+            List of agent log message strings, newest first
+        """
+        return LOG_LIST.validate_json(await cls.get_agent_logs_body_async(limit))
 
-        # Cache the result
-        redis_cache.set_json(cache_key, logs, CACHE_TTL_SECONDS)
 
-        return logs
+# Rolling window of the newest logs, filled by a producer started from the
+# application lifespan so requests only slice it
+log_ring = LogRing(AgentLogsService.render_log_entry, MAX_LIMIT, LOG_INTERVAL_SECONDS)
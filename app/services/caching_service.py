@@ -2,18 +2,788 @@
 Redis caching service.
 """
 
+import asyncio
 import json
 import os
-from typing import Any, Optional
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import redis
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError
 from redis.exceptions import RedisError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
+from app.constants.cache_constants import (
+    AUTO_BATCH_ENABLED,
+    AUTO_BATCH_MAX_KEYS,
+    AUTO_BATCH_WINDOW_MILLISECONDS,
+    CACHE_CODEC,
+    CACHE_COMPRESSION_LEVEL,
+    CACHE_COMPRESSION_MIN_BYTES,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_RESET_TIMEOUT_SECONDS,
+    CIRCUIT_RESET_TIMEOUT_SECONDS,
+    GENERATION_LOCAL_TTL_SECONDS,
+    INVALIDATION_CHANNEL,
+    LOCAL_CACHE_ENABLED,
+    LOCAL_CACHE_MAX_ENTRIES,
+    LOCAL_CACHE_MAX_TTL_SECONDS,
+    PAGE_CACHE_MAX_ENTRIES,
+    PAGE_CACHE_PREFIXES,
+    REDIS_CONNECT_ATTEMPTS,
+    REDIS_CONNECT_RETRY_SECONDS,
+    SHARED_CACHE_ENABLED,
+    SHARED_CACHE_FILENAME,
+    SHARED_CACHE_PREFIXES,
+    SHARED_CACHE_SLOT_BYTES,
+    SHARED_CACHE_SLOTS,
+)
+from app.core.batch_loader import AsyncBatchLoader
+from app.core.cache_metrics import cache_metrics
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.logging import get_logger
-from app.errors.cache_errors import CacheConnectionError, CacheOperationError
+from app.core.shared_memory_cache import SharedMemoryCache
+from app.errors.cache_errors import (
+    CacheConnectionError,
+    CacheOperationError,
+    CacheUnavailableError,
+)
+from app.services.redis_connections import redis_connections
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
 
 logger = get_logger(__name__)
 
+# Header bytes of framed cache values (see ValueEncoder)
+_HEADER_JSON = 0x00
+_HEADER_MSGPACK = 0x01
+_HEADER_RAW = 0x02
+_FLAG_ZLIB = 0x10
+_JSON_WHITESPACE = b" \t\n\r"
+
+
+class CacheCodec:
+    """
+    Serializes cache values to bytes and back.
+
+    Subclasses set ``name``, used to select the codec from configuration,
+    and ``header``, the format byte written in front of their output.
+    JSON codecs use no header so their values stay readable as plain JSON.
+    """
+
+    name = ""
+    header = 0
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value to bytes."""
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        """Decode bytes produced by ``dumps``."""
+        raise NotImplementedError
+
+
+class JsonCodec(CacheCodec):
+    """Standard library JSON."""
+
+    name = "json"
+    header = _HEADER_JSON
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON encoded with orjson, several times faster than the stdlib."""
+
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(CacheCodec):
+    """Compact binary MessagePack encoding."""
+
+    name = "msgpack"
+    header = _HEADER_MSGPACK
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+def _available_codecs() -> Dict[str, CacheCodec]:
+    """Return the codecs whose optional dependencies are installed."""
+    codecs: List[CacheCodec] = [JsonCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    if msgpack is not None:
+        codecs.append(MsgpackCodec())
+    return {codec.name: codec for codec in codecs}
+
+
+CODECS = _available_codecs()
+
+# JSON payloads are decoded with the fastest available parser
+_json_codec = CODECS.get(OrjsonCodec.name, CODECS[JsonCodec.name])
+
+
+def get_codec(name: str) -> CacheCodec:
+    """
+    Look up a codec by name, falling back to stdlib JSON.
+
+    Args:
+        name: Codec name ("json", "orjson" or "msgpack")
+
+    Returns:
+        The requested codec, or JsonCodec if it is unknown or not installed
+    """
+    codec = CODECS.get(name)
+    if codec is None:
+        logger.warning(f"Cache codec {name} is not available, using json")
+        return CODECS[JsonCodec.name]
+    return codec
+
+
+class ValueEncoder:
+    """
+    Frames encoded cache values with an optional header byte.
+
+    Uncompressed JSON is stored as-is, so values written before codecs were
+    introduced (and by replicas still running older code) decode unchanged.
+    Any other format starts with a header byte below 0x20, which can never
+    start a JSON document: the low nibble names the format and ``_FLAG_ZLIB``
+    marks a zlib-compressed payload. Values of at least ``compress_min_bytes``
+    are compressed when that makes them smaller.
+    """
+
+    def __init__(
+        self,
+        codec: CacheCodec,
+        compress_min_bytes: int = CACHE_COMPRESSION_MIN_BYTES,
+        compress_level: int = CACHE_COMPRESSION_LEVEL,
+    ):
+        self.codec = codec
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+
+    def _frame(self, header: int, payload: bytes) -> bytes:
+        """Compress a payload if worthwhile and prefix the header if needed."""
+        if 0 < self.compress_min_bytes <= len(payload):
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) + 1 < len(payload):
+                return bytes([header | _FLAG_ZLIB]) + compressed
+        if header == _HEADER_JSON:
+            return payload
+        return bytes([header]) + payload
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value with the configured codec."""
+        return self._frame(self.codec.header, self.codec.dumps(value))
+
+    def encode_raw(self, value: bytes) -> bytes:
+        """Frame already-serialized bytes, such as a rendered response body."""
+        # Bytes that could be mistaken for a header byte are always framed
+        header = _HEADER_RAW if value[:1] and value[0] < 0x20 else _HEADER_JSON
+        return self._frame(header, value)
+
+    @staticmethod
+    def unpack(data: bytes) -> Tuple[int, bytes]:
+        """
+        Split a stored value into its format and decompressed payload.
+
+        Args:
+            data: Bytes read from Redis
+
+        Returns:
+            Tuple of format header (without the compression flag) and payload
+        """
+        first = data[0] if data else 0x20
+        if first >= 0x20 or first in _JSON_WHITESPACE:
+            return _HEADER_JSON, data
+        payload = data[1:]
+        if first & _FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return first & ~_FLAG_ZLIB, payload
+
+    def decode(self, data: bytes) -> Any:
+        """Decode a stored value whatever codec wrote it."""
+        header, payload = self.unpack(data)
+        if header == _HEADER_JSON:
+            return _json_codec.loads(payload)
+        for codec in CODECS.values():
+            if codec.header == header:
+                return codec.loads(payload)
+        raise ValueError(f"Unsupported cache value format 0x{header:02x}")
+
+    def decode_raw(self, data: bytes) -> bytes:
+        """Return the serialized bytes of a value stored with ``encode_raw``."""
+        header, payload = self.unpack(data)
+        if header not in (_HEADER_JSON, _HEADER_RAW):
+            raise ValueError(f"Cache value format 0x{header:02x} is not raw")
+        return payload
+
+
+value_encoder = ValueEncoder(
+    get_codec(os.getenv("CACHE_CODEC", CACHE_CODEC)),
+    compress_min_bytes=int(
+        os.getenv("CACHE_COMPRESSION_MIN_BYTES", CACHE_COMPRESSION_MIN_BYTES)
+    ),
+    compress_level=int(os.getenv("CACHE_COMPRESSION_LEVEL", CACHE_COMPRESSION_LEVEL)),
+)
+
+
+def _as_bytes(data: Any) -> Optional[bytes]:
+    """Return a raw Redis reply as bytes, or None if the key was missing."""
+    if data is None:
+        return None
+    return data.encode("utf-8") if isinstance(data, str) else bytes(data)
+
+
+def _decode_json(key: str, data: Any) -> Optional[Any]:
+    """Decode a cached value, returning None for missing or invalid data."""
+    if data:
+        try:
+            return value_encoder.decode(_as_bytes(data))
+        except (ValueError, TypeError, zlib.error) as e:
+            logger.error(f"Failed to decode cached value for key {key}: {str(e)}")
+            # Return None for invalid data rather than raising an error
+            return None
+    return None
+
+
+def _encode_json(key: str, value: Any) -> bytes:
+    """Encode a value with the configured codec for caching."""
+    try:
+        return value_encoder.encode(value)
+    except (TypeError, ValueError, OverflowError) as e:
+        logger.error(f"Failed to encode value for key {key}: {str(e)}")
+        raise CacheOperationError(f"Failed to encode cache value: {str(e)}")
+
+
+def _decode_raw(key: str, data: Any) -> Optional[bytes]:
+    """Unframe a cached raw value, returning None for missing or invalid data."""
+    if data:
+        try:
+            return value_encoder.decode_raw(_as_bytes(data))
+        except (ValueError, zlib.error) as e:
+            logger.error(f"Failed to decode cached value for key {key}: {str(e)}")
+            return None
+    return None
+
+
+# Identifies this worker so it can ignore its own invalidation messages
+INSTANCE_ID = uuid.uuid4().hex
+
+
+def _invalidation_message(keys: Sequence[str], prefixes: Sequence[str]) -> str:
+    """Build the pub/sub message announcing changed keys and prefixes."""
+    return json.dumps(
+        {"origin": INSTANCE_ID, "keys": list(keys), "prefixes": list(prefixes)}
+    )
+
+
+def evict_locally(keys: Sequence[str], prefixes: Sequence[str]) -> None:
+    """
+    Drop keys and whole prefixes from this worker's local tier.
+
+    Args:
+        keys: Exact keys to evict
+        prefixes: Prefixes whose keys should all be evicted
+    """
+    for key in keys:
+        local_cache.delete(key)
+        page_cache.delete(key)
+        if shared_cache.enabled:
+            shared_cache.delete(key)
+    for prefix in prefixes:
+        local_cache.delete_prefix(prefix)
+        page_cache.delete_prefix(prefix)
+        if shared_cache.enabled:
+            shared_cache.delete_prefix(prefix)
+
+
+def _generation_key(namespace: str) -> str:
+    """Return the Redis key holding a namespace's generation counter."""
+    return f"{namespace}:generation"
+
+
+def versioned_key(namespace: str, key: Any, generation: int) -> str:
+    """
+    Build the cache key for ``key`` in a given generation of a namespace.
+
+    Generation 0 keeps the unversioned ``namespace:key`` format, so keys
+    written before a namespace was ever bumped stay valid.
+
+    Args:
+        namespace: Key family, e.g. "demo:invoices"
+        key: Key within the family, e.g. the limit
+        generation: Current generation of the namespace
+
+    Returns:
+        Full cache key
+    """
+    if generation == 0:
+        return f"{namespace}:{key}"
+    return f"{namespace}:g{generation}:{key}"
+
+
+def _parse_generation(data: Any) -> int:
+    """Convert a stored generation counter to an int (0 when unset)."""
+    return int(data) if data else 0
+
+
+# Releases a lease only if it is still held by the caller's token
+_RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+# Extends a lease only if it is still held by the caller's token
+_RENEW_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _lease_key(key: str) -> str:
+    """Return the Redis key guarding recomputation of ``key``."""
+    return f"{key}:lease"
+
+
+def _get_with_ttl(client: redis.Redis, key: str) -> Tuple[Any, Any]:
+    """Fetch a value and its PTTL from a client in one pipelined round trip."""
+    pipe = client.pipeline(transaction=False)
+    pipe.get(key)
+    pipe.pttl(key)
+    data, pttl = pipe.execute()
+    return data, pttl
+
+
+async def _aget_with_ttl(client: aioredis.Redis, key: str) -> Tuple[Any, Any]:
+    """Fetch a value and its PTTL from an asyncio client in one round trip."""
+    pipe = client.pipeline(transaction=False)
+    pipe.get(key)
+    pipe.pttl(key)
+    data, pttl = await pipe.execute()
+    return data, pttl
+
+
+def _get_many_with_ttl(
+    client: redis.Redis, keys: Sequence[str]
+) -> List[Tuple[Any, Any]]:
+    """Fetch several values (one MGET) and their PTTLs in one round trip."""
+    pipe = client.pipeline(transaction=False)
+    pipe.mget(keys)
+    for key in keys:
+        pipe.pttl(key)
+    values, *pttls = pipe.execute()
+    return list(zip(values, pttls))
+
+
+async def _aget_many_with_ttl(
+    client: aioredis.Redis, keys: Sequence[str]
+) -> List[Tuple[Any, Any]]:
+    """Fetch several values (one MGET) and their PTTLs from an asyncio client."""
+    pipe = client.pipeline(transaction=False)
+    pipe.mget(keys)
+    for key in keys:
+        pipe.pttl(key)
+    values, *pttls = await pipe.execute()
+    return list(zip(values, pttls))
+
+
+def _local_ttl(pttl: Optional[int]) -> Optional[float]:
+    """
+    Convert a Redis PTTL reply into a TTL in seconds for the local tier.
+
+    Args:
+        pttl: Remaining time to live in milliseconds as reported by Redis
+
+    Returns:
+        TTL in seconds, or None if the key should not be cached locally
+    """
+    if pttl is None or pttl == -2:
+        # Key does not exist (or expired between GET and PTTL)
+        return None
+    if pttl == -1:
+        # Key has no expiry in Redis
+        return float(LOCAL_CACHE_MAX_TTL_SECONDS)
+    return pttl / 1000
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+
+    Sits in front of Redis so hot keys are served without network I/O.
+    Entries are never served past the TTL they were stored with, and the
+    least recently used entry is evicted once ``max_entries`` is reached.
+    Expired entries are kept until evicted so they can be served as
+    last-known-good data during a Redis outage. Values are stored as-is, so
+    callers must not mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = LOCAL_CACHE_MAX_ENTRIES,
+        max_ttl: float = LOCAL_CACHE_MAX_TTL_SECONDS,
+        enabled: bool = LOCAL_CACHE_ENABLED,
+    ):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a live value from the local tier.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+        return self.get_with_ttl(key)[0]
+
+    def get_with_ttl(
+        self, key: str, min_ttl: float = 0.0
+    ) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Get a live value and its remaining TTL from the local tier.
+
+        Args:
+            key: Cache key
+            min_ttl: Treat entries with this many seconds or fewer left as missing
+
+        Returns:
+            Tuple of cached value and remaining TTL in seconds, or (None, None)
+        """
+        if not self.enabled:
+            return None, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            expires_at, value = entry
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                # Expired entries stay until evicted as last-known-good data
+                self.expirations += 1
+                self.misses += 1
+                return None, None
+            if remaining <= min_ttl:
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, remaining
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store a value in the local tier.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds, capped at ``max_ttl``
+        """
+        if not self.enabled or ttl <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + min(ttl, self.max_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """
+        Get the last known value for a key, even if it has expired.
+
+        Only meant as a fallback while Redis is unavailable.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Last stored value or None if never cached or already evicted
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry[1]
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the local tier."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        """
+        Remove every key starting with a prefix from the local tier.
+
+        Args:
+            prefix: Key prefix; an empty prefix removes every entry
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.stale_hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for tuning the local tier.
+
+        Returns:
+            Dictionary of counters, current size and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "stale_hits": self.stale_hits,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Per-worker local tier shared by the sync and async services
+local_cache = LocalCache(
+    max_entries=int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", LOCAL_CACHE_MAX_ENTRIES)),
+    max_ttl=float(
+        os.getenv("LOCAL_CACHE_MAX_TTL_SECONDS", LOCAL_CACHE_MAX_TTL_SECONDS)
+    ),
+    enabled=os.getenv("LOCAL_CACHE_ENABLED", str(LOCAL_CACHE_ENABLED)).lower()
+    == "true",
+)
+
+# Per-worker tier for raw values of key families with unbounded key spaces
+page_cache = LocalCache(
+    max_entries=int(os.getenv("PAGE_CACHE_MAX_ENTRIES", PAGE_CACHE_MAX_ENTRIES)),
+    max_ttl=local_cache.max_ttl,
+    enabled=local_cache.enabled,
+)
+page_cache_prefixes = tuple(
+    os.getenv("PAGE_CACHE_PREFIXES", ",".join(PAGE_CACHE_PREFIXES)).split(",")
+)
+
+
+def _default_shared_cache_path() -> str:
+    """Place the shared segment in RAM-backed /dev/shm when available."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, SHARED_CACHE_FILENAME)
+
+
+# Host-wide tier for raw values, shared by every worker process on the host
+shared_cache = SharedMemoryCache(
+    path=os.getenv("SHARED_CACHE_PATH") or _default_shared_cache_path(),
+    slots=int(os.getenv("SHARED_CACHE_SLOTS", SHARED_CACHE_SLOTS)),
+    slot_bytes=int(os.getenv("SHARED_CACHE_SLOT_BYTES", SHARED_CACHE_SLOT_BYTES)),
+    enabled=os.getenv("SHARED_CACHE_ENABLED", str(SHARED_CACHE_ENABLED)).lower()
+    == "true",
+)
+shared_cache_prefixes = tuple(
+    os.getenv("SHARED_CACHE_PREFIXES", ",".join(SHARED_CACHE_PREFIXES)).split(",")
+)
+
+
+def raw_tier(key: str) -> LocalCache | SharedMemoryCache:
+    """
+    Pick the in-host tier that keeps raw values for a key.
+
+    Keys under ``page_cache_prefixes`` live in their own bounded per-worker
+    tier, so a client walking pages cannot evict hot bodies. Keys under
+    ``shared_cache_prefixes`` live in the host-wide shared tier when it is
+    enabled, so every worker serves one copy; everything else stays in the
+    per-worker local tier.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Tier to read and write the key's raw value
+    """
+    if key.startswith(page_cache_prefixes):
+        return page_cache
+    if shared_cache.enabled and key.startswith(shared_cache_prefixes):
+        return shared_cache
+    return local_cache
+
+
+def _cache_locally(
+    key: str,
+    value: Any,
+    pttl: Optional[int],
+    tier: LocalCache | SharedMemoryCache = local_cache,
+) -> Tuple[Optional[Any], Optional[float]]:
+    """
+    Keep a value read from Redis in an in-host tier for its remaining TTL.
+
+    Args:
+        key: Cache key
+        value: Decoded value, or None if missing or invalid
+        pttl: Remaining TTL in milliseconds returned by Redis
+        tier: Tier to keep the value in (the local tier by default)
+
+    Returns:
+        Tuple of value and remaining TTL in seconds, or (None, None) if the
+        value is missing
+    """
+    ttl = _local_ttl(pttl)
+    if value is None or ttl is None:
+        return None, None
+    tier.set(key, value, ttl)
+    return value, ttl
+
+
+def _cache_fetched(key: str, data: Any, pttl: Optional[int]) -> Optional[Any]:
+    """Decode a batched JSON reply and keep it in the local tier."""
+    _record_fetch(key, data)
+    return _cache_locally(key, _decode_json(key, data), pttl)[0]
+
+
+# Async reads issued in the same loop tick (or window) share one MGET
+auto_batch_enabled = (
+    os.getenv("REDIS_AUTO_BATCH", str(AUTO_BATCH_ENABLED)).lower() == "true"
+)
+auto_batch_window = (
+    float(os.getenv("REDIS_AUTO_BATCH_WINDOW_MS", AUTO_BATCH_WINDOW_MILLISECONDS))
+    / 1000
+)
+auto_batch_max_keys = int(os.getenv("REDIS_AUTO_BATCH_MAX_KEYS", AUTO_BATCH_MAX_KEYS))
+
+
+# Shared by the sync and async services so an outage trips both
+cache_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=CIRCUIT_RESET_TIMEOUT_SECONDS,
+    max_reset_timeout=CIRCUIT_MAX_RESET_TIMEOUT_SECONDS,
+)
+
+
+@contextmanager
+def _guarded(command: str, keys: Sequence[str] = ()) -> Iterator[None]:
+    """
+    Run one Redis round trip under the circuit breaker and record its metrics.
+
+    Connection failures and timeouts count against the breaker; while it is
+    open the call is rejected immediately with CacheUnavailableError. The
+    round trip's latency is recorded per command, and failures per key
+    prefix.
+
+    Args:
+        command: Command or pipeline name used as the latency label
+        keys: Keys the call touches, for per-prefix error counts
+
+    Raises:
+        CacheUnavailableError: If the circuit is open
+    """
+    if not cache_breaker.allow_request():
+        for key in keys:
+            cache_metrics.record_error(key)
+        raise CacheUnavailableError()
+    started = time.perf_counter()
+    try:
+        yield
+    except (RedisConnectionError, RedisTimeoutError, CacheConnectionError):
+        cache_breaker.record_failure()
+        _record_failure(command, keys, started)
+        raise
+    except RedisError:
+        # Redis answered with an error, so it is still reachable
+        cache_breaker.record_success()
+        _record_failure(command, keys, started)
+        raise
+    except BaseException:
+        # Cancelled or failed locally: no verdict on Redis either way
+        cache_breaker.release()
+        raise
+    cache_breaker.record_success()
+    cache_metrics.observe_command(command, time.perf_counter() - started)
+
+
+def _record_failure(command: str, keys: Sequence[str], started: float) -> None:
+    """Record the latency and per-prefix errors of a failed round trip."""
+    cache_metrics.observe_command(command, time.perf_counter() - started)
+    for key in keys:
+        cache_metrics.record_error(key)
+
+
+def _record_fetch(key: str, data: Any) -> None:
+    """Record the outcome and size of a value fetched from Redis."""
+    if data is None:
+        cache_metrics.record_miss(key)
+        return
+    cache_metrics.record_hit(key, local=False)
+    cache_metrics.record_read_size(key, len(data))
+
 
 class RedisCacheService:
     _instance = None
@@ -26,15 +796,8 @@ class RedisCacheService:
         return cls._instance
 
     def _connect(self) -> None:
-        try:
-            self._client = redis.Redis(
-                host=os.getenv("REDIS_HOST", "localhost"),
-                password=os.getenv("REDIS_PASSWORD", None),
-            )
-            self._client.ping()
-        except RedisError as exc:
-            logger.error("Failed to connect to Redis: %s", exc, exc_info=True)
-            self._client = None
+        # Connections are opened lazily by the pool, so this does no I/O
+        self._client = redis_connections.primary()
 
     @property
     def client(self) -> redis.Redis:
@@ -44,6 +807,12 @@ class RedisCacheService:
                 raise CacheConnectionError("Could not establish cache connection.")
         return self._client
 
+    def _read(self, command: Callable[[redis.Redis], Any]) -> Any:
+        """Run a read on the read replicas if configured, else on the primary."""
+        if redis_connections.has_replicas:
+            return redis_connections.read(command)
+        return command(self.client)
+
     def get(self, key: str) -> Optional[str]:
         """
         Get a value from cache.
@@ -59,12 +828,15 @@ class RedisCacheService:
             CacheOperationError: If Redis operation fails
         """
         try:
-            return self.client.get(key)
+            with _guarded("GET", [key]):
+                return self._read(lambda client: client.get(key))
         except RedisError as e:
             logger.error(f"Redis get error for key {key}: {str(e)}")
             raise CacheOperationError(f"Failed to get from cache: {str(e)}")
 
-    def set(self, key: str, value: str, ttl: int) -> None:
+    def set(
+        self, key: str, value: str | bytes, ttl: int, broadcast: bool = False
+    ) -> None:
         """
         Set a value in cache with TTL.
 
@@ -72,20 +844,130 @@ class RedisCacheService:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds
+            broadcast: Evict the key from every worker's local tier
 
         Raises:
             CacheConnectionError: If Redis connection fails
             CacheOperationError: If Redis operation fails
         """
         try:
-            self.client.setex(key, ttl, value)
+            with _guarded("SETEX+PUBLISH" if broadcast else "SETEX", [key]):
+                cache_metrics.record_write_size(key, len(value))
+                if not broadcast:
+                    self.client.setex(key, ttl, value)
+                    return
+                evict_locally([key], [])
+                pipe = self.client.pipeline(transaction=False)
+                pipe.setex(key, ttl, value)
+                pipe.publish(INVALIDATION_CHANNEL, _invalidation_message([key], []))
+                pipe.execute()
         except RedisError as e:
             logger.error(f"Redis set error for key {key}: {str(e)}")
             raise CacheOperationError(f"Failed to set in cache: {str(e)}")
 
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        """
+        Get several values from cache with a single MGET.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached values (or None) in the same order as the keys
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        if not keys:
+            return []
+        try:
+            with _guarded("MGET", keys):
+                return self._read(lambda client: client.mget(keys))
+        except RedisError as e:
+            logger.error(f"Redis mget error for keys {list(keys)}: {str(e)}")
+            raise CacheOperationError(f"Failed to get from cache: {str(e)}")
+
+    def get_many_with_ttl(
+        self, keys: Sequence[str]
+    ) -> List[Tuple[Optional[str], Optional[int]]]:
+        """
+        Get several values and their remaining TTLs in a single round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            List of (value or None, remaining TTL in milliseconds) tuples in
+            the same order as the keys
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        if not keys:
+            return []
+        try:
+            with _guarded("MGET+PTTL", keys):
+                return self._read(lambda client: _get_many_with_ttl(client, keys))
+        except RedisError as e:
+            logger.error(f"Redis mget error for keys {list(keys)}: {str(e)}")
+            raise CacheOperationError(f"Failed to get from cache: {str(e)}")
+
+    def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        """
+        Set several values with the same TTL in one pipelined round trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        if not items:
+            return
+        try:
+            with _guarded("SETEX", list(items)):
+                pipe = self.client.pipeline(transaction=False)
+                for key, value in items.items():
+                    cache_metrics.record_write_size(key, len(value))
+                    pipe.setex(key, ttl, value)
+                pipe.execute()
+        except RedisError as e:
+            logger.error(f"Redis set error for keys {list(items)}: {str(e)}")
+            raise CacheOperationError(f"Failed to set in cache: {str(e)}")
+
+    def get_with_ttl(
+        self, key: str, primary: bool = False
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Get a value and its remaining TTL in a single round trip.
+
+        Args:
+            key: Cache key
+            primary: Read from the primary even if read replicas are configured
+
+        Returns:
+            Tuple of cached value (or None) and remaining TTL in milliseconds
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("GET+PTTL", [key]):
+                if primary:
+                    return _get_with_ttl(self.client, key)
+                return self._read(lambda client: _get_with_ttl(client, key))
+        except RedisError as e:
+            logger.error(f"Redis get error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to get from cache: {str(e)}")
+
     def get_json(self, key: str) -> Optional[Any]:
         """
-        Get a JSON value from cache.
+        Get a JSON value from the local tier, falling back to Redis.
 
         Args:
             key: Cache key
@@ -97,38 +979,963 @@ class RedisCacheService:
             CacheConnectionError: If Redis connection fails
             CacheOperationError: If Redis operation fails
         """
-        data = self.get(key)
-        if data:
-            try:
-                return json.loads(data)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Failed to decode JSON from cache for key {key}: {str(e)}"
-                )
-                # Return None for invalid JSON rather than raising an error
-                return None
-        return None
+        return self.get_json_with_ttl(key)[0]
 
-    def set_json(self, key: str, value: Any, ttl: int) -> None:
+    def get_json_with_ttl(
+        self, key: str, min_ttl: float = 0.0
+    ) -> Tuple[Optional[Any], Optional[float]]:
         """
-        Set a JSON value in cache with TTL.
+        Get a JSON value and its remaining TTL, checking the local tier first.
 
         Args:
             key: Cache key
-            value: Value to serialize and cache
-            ttl: Time to live in seconds
+            min_ttl: Bypass local entries with this many seconds or fewer left
+
+        Returns:
+            Tuple of deserialized JSON value and remaining TTL in seconds,
+            or (None, None) if not found
 
         Raises:
             CacheConnectionError: If Redis connection fails
             CacheOperationError: If Redis operation fails
         """
-        try:
-            json_value = json.dumps(value)
-            self.set(key, json_value, ttl)
-        except (TypeError, ValueError) as e:
-            logger.error(f"Failed to encode value to JSON for key {key}: {str(e)}")
-            raise CacheOperationError(f"Failed to encode to JSON: {str(e)}")
+        value, remaining = local_cache.get_with_ttl(key, min_ttl)
+        if value is not None:
+            cache_metrics.record_hit(key, local=True)
+            return value, remaining
+
+        data, pttl = self.get_with_ttl(key)
+        _record_fetch(key, data)
+        return _cache_locally(key, _decode_json(key, data), pttl)
+
+    def get_json_many(
+        self, keys: Sequence[str], min_ttl: float = 0.0
+    ) -> List[Optional[Any]]:
+        """
+        Get several JSON values, fetching local-tier misses in one round trip.
+
+        Args:
+            keys: Cache keys
+            min_ttl: Bypass local entries with this many seconds or fewer left
+
+        Returns:
+            Deserialized JSON values (or None) in the same order as the keys
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        values = [local_cache.get_with_ttl(key, min_ttl)[0] for key in keys]
+        missing = [key for key, value in zip(keys, values) if value is None]
+        for key in set(keys) - set(missing):
+            cache_metrics.record_hit(key, local=True)
+        fetched = dict(zip(missing, self.get_many_with_ttl(missing)))
+        return [
+            value if value is not None else _cache_fetched(key, *fetched[key])
+            for key, value in zip(keys, values)
+        ]
+
+    def get_raw_with_ttl(
+        self, key: str, min_ttl: float = 0.0, primary: bool = False
+    ) -> Tuple[Optional[bytes], Optional[float]]:
+        """
+        Get a raw value (such as a rendered response body) and its remaining TTL.
+
+        The bytes are returned exactly as stored, without decoding.
+
+        Args:
+            key: Cache key
+            min_ttl: Bypass local entries with this many seconds or fewer left
+            primary: On a local miss, read from the primary rather than a
+                replica that may not have applied a recent write yet
+
+        Returns:
+            Tuple of cached bytes and remaining TTL in seconds, or (None, None)
+            if not found
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        tier = raw_tier(key)
+        value, remaining = tier.get_with_ttl(key, min_ttl)
+        if value is not None:
+            cache_metrics.record_hit(key, local=True)
+            return value, remaining
+
+        data, pttl = self.get_with_ttl(key, primary)
+        _record_fetch(key, data)
+        return _cache_locally(key, _decode_raw(key, data), pttl, tier)
+
+    def set_raw(
+        self, key: str, value: bytes, ttl: int, broadcast: bool = False
+    ) -> None:
+        """
+        Set a raw value (such as a rendered response body) with TTL.
+
+        Args:
+            key: Cache key
+            value: Bytes to cache as-is
+            ttl: Time to live in seconds
+            broadcast: Evict the key from every other worker's local tier
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        self.set(key, value_encoder.encode_raw(value), ttl, broadcast)
+        raw_tier(key).set(key, value, ttl)
+
+    def set_raw_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        """
+        Set several raw values with the same TTL in one round trip.
+
+        Args:
+            items: Mapping of cache key to bytes
+            ttl: Time to live in seconds
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        self.set_many(
+            {key: value_encoder.encode_raw(value) for key, value in items.items()},
+            ttl,
+        )
+        for key, value in items.items():
+            raw_tier(key).set(key, value, ttl)
+
+    def set_if_absent(self, key: str, value: str | bytes, ttl: int) -> bool:
+        """
+        Set a value with TTL only if the key does not exist (SET NX EX).
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds
+
+        Returns:
+            True if the value was written, False if the key already existed
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("SET NX", [key]):
+                cache_metrics.record_write_size(key, len(value))
+                written = self.client.set(key, value, nx=True, ex=ttl)
+        except RedisError as e:
+            logger.error(f"Redis set error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to set in cache: {str(e)}")
+        return bool(written)
+
+    def get_generation(self, namespace: str) -> int:
+        """
+        Get the current generation of a namespace.
+
+        The counter is kept in the local tier for a short time and evicted
+        on every worker when it is bumped. If Redis is unavailable the last
+        known generation (or 0) is used so reads can still fail open.
+
+        Args:
+            namespace: Key family, e.g. "demo:invoices"
+
+        Returns:
+            Current generation number
+        """
+        generation_key = _generation_key(namespace)
+        generation = local_cache.get(generation_key)
+        if generation is not None:
+            return generation
+        try:
+            generation = _parse_generation(self.get(generation_key))
+        except (CacheConnectionError, CacheOperationError):
+            return local_cache.get_stale(generation_key) or 0
+        local_cache.set(generation_key, generation, GENERATION_LOCAL_TTL_SECONDS)
+        return generation
+
+    def namespaced_key(self, namespace: str, key: Any) -> str:
+        """
+        Build the cache key for ``key`` in the current generation of a namespace.
+
+        Args:
+            namespace: Key family, e.g. "demo:invoices"
+            key: Key within the family, e.g. the limit
+
+        Returns:
+            Full cache key
+        """
+        return versioned_key(namespace, key, self.get_generation(namespace))
+
+    def bump_generation(self, namespace: str) -> int:
+        """
+        Invalidate every key of a namespace with a single INCR.
+
+        Keys from older generations are never read again and age out
+        through their own TTLs, so no SCAN or per-key DEL is needed.
+
+        Args:
+            namespace: Key family, e.g. "demo:invoices"
+
+        Returns:
+            New generation number
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        generation_key = _generation_key(namespace)
+        try:
+            with _guarded("INCR+PUBLISH", [generation_key]):
+                pipe = self.client.pipeline(transaction=False)
+                pipe.incr(generation_key)
+                pipe.publish(
+                    INVALIDATION_CHANNEL, _invalidation_message([generation_key], [])
+                )
+                generation, _ = pipe.execute()
+        except RedisError as e:
+            logger.error(f"Redis generation bump error for {namespace}: {str(e)}")
+            raise CacheOperationError(f"Failed to bump generation: {str(e)}")
+        local_cache.set(generation_key, generation, GENERATION_LOCAL_TTL_SECONDS)
+        logger.info(f"Namespace {namespace} moved to generation {generation}")
+        return generation
+
+    def invalidate(
+        self, keys: Sequence[str] = (), prefixes: Sequence[str] = ()
+    ) -> None:
+        """
+        Evict keys and key prefixes from the local tier of every worker.
+
+        Values in Redis are left untouched; this only announces that local
+        copies must be re-read.
+
+        Args:
+            keys: Exact keys to evict
+            prefixes: Prefixes whose keys should all be evicted
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        evict_locally(keys, prefixes)
+        try:
+            with _guarded("PUBLISH"):
+                self.client.publish(
+                    INVALIDATION_CHANNEL, _invalidation_message(keys, prefixes)
+                )
+        except RedisError as e:
+            logger.error(
+                f"Redis publish error for {list(keys) + list(prefixes)}: {str(e)}"
+            )
+            raise CacheOperationError(f"Failed to publish invalidation: {str(e)}")
+
+    def acquire_lease(self, key: str, ttl_ms: int) -> Optional[str]:
+        """
+        Try to take the short-lived recompute lease for a key (SET NX PX).
+
+        Args:
+            key: Cache key to be recomputed
+            ttl_ms: Lease duration in milliseconds
+
+        Returns:
+            Lease token if acquired, None if another holder has it
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        token = uuid.uuid4().hex
+        try:
+            with _guarded("SET NX", [key]):
+                acquired = self.client.set(_lease_key(key), token, nx=True, px=ttl_ms)
+        except RedisError as e:
+            logger.error(f"Redis lease error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to acquire lease: {str(e)}")
+        return token if acquired else None
+
+    def release_lease(self, key: str, token: str) -> None:
+        """
+        Release a lease if it is still held by ``token``.
+
+        Args:
+            key: Cache key the lease guards
+            token: Token returned by acquire_lease
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("EVAL", [key]):
+                self.client.eval(_RELEASE_LEASE_SCRIPT, 1, _lease_key(key), token)
+        except RedisError as e:
+            logger.error(f"Redis lease release error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to release lease: {str(e)}")
+
+    def renew_lease(self, key: str, token: str, ttl_ms: int) -> bool:
+        """
+        Extend a lease if it is still held by ``token``.
+
+        Args:
+            key: Cache key the lease guards
+            token: Token returned by acquire_lease
+            ttl_ms: New lease duration in milliseconds
+
+        Returns:
+            True if the lease was extended, False if it was lost
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("EVAL", [key]):
+                renewed = self.client.eval(
+                    _RENEW_LEASE_SCRIPT, 1, _lease_key(key), token, ttl_ms
+                )
+        except RedisError as e:
+            logger.error(f"Redis lease renew error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to renew lease: {str(e)}")
+        return bool(renewed)
+
+    def set_json(self, key: str, value: Any, ttl: int, broadcast: bool = False) -> None:
+        """
+        Set a JSON value in cache with TTL.
+
+        Args:
+            key: Cache key
+            value: Value to serialize and cache
+            ttl: Time to live in seconds
+            broadcast: Evict the key from every other worker's local tier
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        self.set(key, _encode_json(key, value), ttl, broadcast)
+        local_cache.set(key, value, ttl)
+
+    def set_json_many(self, items: Dict[str, Any], ttl: int) -> None:
+        """
+        Set several JSON values with the same TTL in one round trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds
+
+        Raises:
+            CacheConnectionError: If Redis connection fails
+            CacheOperationError: If Redis operation fails
+        """
+        self.set_many(
+            {key: _encode_json(key, value) for key, value in items.items()}, ttl
+        )
+        for key, value in items.items():
+            local_cache.set(key, value, ttl)
+
+
+class AsyncRedisCacheService:
+    """
+    Asyncio variant of RedisCacheService for use from async routes.
+
+    Commands go through pooled ``redis.asyncio`` clients, so a slow Redis
+    reply only suspends the awaiting request instead of the event loop.
+    Connections are opened lazily from the pool on first use. Reads are
+    routed to read replicas when configured; writes go to the primary.
+    Single-key reads made in the same event-loop tick (or auto-batch window)
+    are coalesced into one MGET round trip.
+    """
+
+    _instance = None
+    _client: aioredis.Redis | None = None
+    _batcher: AsyncBatchLoader | None = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._connect()  # noqa: SLF001
+            if auto_batch_enabled:
+                cls._instance._batcher = AsyncBatchLoader(
+                    cls._instance.get_many_with_ttl,
+                    window=auto_batch_window,
+                    max_batch_size=auto_batch_max_keys,
+                    dispatch_context=cache_metrics.charge_requests,
+                )
+        return cls._instance
+
+    def _connect(self) -> None:
+        self._client = redis_connections.async_primary()
+
+    @property
+    def client(self) -> aioredis.Redis:
+        if self._client is None:
+            self._connect()
+        return self._client
+
+    async def _read(self, command: Callable[[aioredis.Redis], Awaitable[Any]]) -> Any:
+        """Await a read on the read replicas if configured, else on the primary."""
+        if redis_connections.has_replicas:
+            return await redis_connections.read_async(command)
+        return await command(self.client)
+
+    async def close(self) -> None:
+        """Close the clients and disconnect every pooled connection."""
+        await redis_connections.aclose()
+        self._client = None
+
+    async def connect(
+        self,
+        attempts: int = REDIS_CONNECT_ATTEMPTS,
+        delay: float = REDIS_CONNECT_RETRY_SECONDS,
+    ) -> bool:
+        """
+        Open a connection to the primary and check it, retrying with backoff.
+
+        Called from the application lifespan so a slow or missing Redis
+        delays readiness by a bounded amount instead of blocking imports.
+        A failure is not fatal: requests degrade through the circuit breaker
+        and connections are retried from the pool on later commands.
+
+        Args:
+            attempts: Number of PINGs to try
+            delay: Seconds before the first retry, doubled after each one
+
+        Returns:
+            True if Redis answered
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                await self.client.ping()
+                logger.info(f"Connected to Redis (attempt {attempt})")
+                return True
+            except RedisError as e:
+                if attempt == attempts:
+                    logger.error(
+                        f"Failed to connect to Redis after {attempts} attempts: "
+                        f"{str(e)}"
+                    )
+                    return False
+                logger.warning(
+                    f"Redis connection attempt {attempt} failed, "
+                    f"retrying in {delay:.1f}s: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+                delay *= 2
+        return False
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a value from cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("GET", [key]):
+                return await self._read(lambda client: client.get(key))
+        except RedisError as e:
+            logger.error(f"Redis get error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to get from cache: {str(e)}")
+
+    async def set(
+        self, key: str, value: str | bytes, ttl: int, broadcast: bool = False
+    ) -> None:
+        """
+        Set a value in cache with TTL.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds
+            broadcast: Evict the key from every worker's local tier
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("SETEX+PUBLISH" if broadcast else "SETEX", [key]):
+                cache_metrics.record_write_size(key, len(value))
+                if not broadcast:
+                    await self.client.setex(key, ttl, value)
+                    return
+                evict_locally([key], [])
+                pipe = self.client.pipeline(transaction=False)
+                pipe.setex(key, ttl, value)
+                pipe.publish(INVALIDATION_CHANNEL, _invalidation_message([key], []))
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Redis set error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to set in cache: {str(e)}")
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        """
+        Get several values from cache with a single MGET.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached values (or None) in the same order as the keys
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        if not keys:
+            return []
+        try:
+            with _guarded("MGET", keys):
+                return await self._read(lambda client: client.mget(keys))
+        except RedisError as e:
+            logger.error(f"Redis mget error for keys {list(keys)}: {str(e)}")
+            raise CacheOperationError(f"Failed to get from cache: {str(e)}")
+
+    async def get_many_with_ttl(
+        self, keys: Sequence[str]
+    ) -> List[Tuple[Optional[str], Optional[int]]]:
+        """
+        Get several values and their remaining TTLs in a single round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            List of (value or None, remaining TTL in milliseconds) tuples in
+            the same order as the keys
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        if not keys:
+            return []
+        try:
+            with _guarded("MGET+PTTL", keys):
+                return await self._read(
+                    lambda client: _aget_many_with_ttl(client, keys)
+                )
+        except RedisError as e:
+            logger.error(f"Redis mget error for keys {list(keys)}: {str(e)}")
+            raise CacheOperationError(f"Failed to get from cache: {str(e)}")
+
+    async def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        """
+        Set several values with the same TTL in one pipelined round trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        if not items:
+            return
+        try:
+            with _guarded("SETEX", list(items)):
+                pipe = self.client.pipeline(transaction=False)
+                for key, value in items.items():
+                    cache_metrics.record_write_size(key, len(value))
+                    pipe.setex(key, ttl, value)
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Redis set error for keys {list(items)}: {str(e)}")
+            raise CacheOperationError(f"Failed to set in cache: {str(e)}")
+
+    async def get_with_ttl(
+        self, key: str, primary: bool = False
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Get a value and its remaining TTL in a single round trip.
+
+        Args:
+            key: Cache key
+            primary: Read from the primary even if read replicas are configured
+                (never batched, as batches are read from the replicas)
+
+        Returns:
+            Tuple of cached value (or None) and remaining TTL in milliseconds
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        if self._batcher is not None and not primary:
+            # Errors are already logged and wrapped by get_many_with_ttl
+            return await self._batcher.load(key)
+        try:
+            with _guarded("GET+PTTL", [key]):
+                if primary:
+                    return await _aget_with_ttl(self.client, key)
+                return await self._read(lambda client: _aget_with_ttl(client, key))
+        except RedisError as e:
+            logger.error(f"Redis get error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to get from cache: {str(e)}")
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        """
+        Get a JSON value from the local tier, falling back to Redis.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Deserialized JSON value or None if not found
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        return (await self.get_json_with_ttl(key))[0]
+
+    async def get_json_with_ttl(
+        self, key: str, min_ttl: float = 0.0
+    ) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Get a JSON value and its remaining TTL, checking the local tier first.
+
+        Args:
+            key: Cache key
+            min_ttl: Bypass local entries with this many seconds or fewer left
+
+        Returns:
+            Tuple of deserialized JSON value and remaining TTL in seconds,
+            or (None, None) if not found
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        value, remaining = local_cache.get_with_ttl(key, min_ttl)
+        if value is not None:
+            cache_metrics.record_hit(key, local=True)
+            return value, remaining
+
+        data, pttl = await self.get_with_ttl(key)
+        _record_fetch(key, data)
+        return _cache_locally(key, _decode_json(key, data), pttl)
+
+    async def get_json_many(
+        self, keys: Sequence[str], min_ttl: float = 0.0
+    ) -> List[Optional[Any]]:
+        """
+        Get several JSON values, fetching local-tier misses in one round trip.
+
+        Args:
+            keys: Cache keys
+            min_ttl: Bypass local entries with this many seconds or fewer left
+
+        Returns:
+            Deserialized JSON values (or None) in the same order as the keys
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        values = [local_cache.get_with_ttl(key, min_ttl)[0] for key in keys]
+        missing = [key for key, value in zip(keys, values) if value is None]
+        for key in set(keys) - set(missing):
+            cache_metrics.record_hit(key, local=True)
+        fetched = dict(zip(missing, await self.get_many_with_ttl(missing)))
+        return [
+            value if value is not None else _cache_fetched(key, *fetched[key])
+            for key, value in zip(keys, values)
+        ]
+
+    async def get_raw_with_ttl(
+        self, key: str, min_ttl: float = 0.0, primary: bool = False
+    ) -> Tuple[Optional[bytes], Optional[float]]:
+        """
+        Get a raw value (such as a rendered response body) and its remaining TTL.
+
+        The bytes are returned exactly as stored, without decoding.
+
+        Args:
+            key: Cache key
+            min_ttl: Bypass local entries with this many seconds or fewer left
+            primary: On a local miss, read from the primary rather than a
+                replica that may not have applied a recent write yet
+
+        Returns:
+            Tuple of cached bytes and remaining TTL in seconds, or (None, None)
+            if not found
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        tier = raw_tier(key)
+        value, remaining = tier.get_with_ttl(key, min_ttl)
+        if value is not None:
+            cache_metrics.record_hit(key, local=True)
+            return value, remaining
+
+        data, pttl = await self.get_with_ttl(key, primary)
+        _record_fetch(key, data)
+        return _cache_locally(key, _decode_raw(key, data), pttl, tier)
+
+    async def set_raw(
+        self, key: str, value: bytes, ttl: int, broadcast: bool = False
+    ) -> None:
+        """
+        Set a raw value (such as a rendered response body) with TTL.
+
+        Args:
+            key: Cache key
+            value: Bytes to cache as-is
+            ttl: Time to live in seconds
+            broadcast: Evict the key from every other worker's local tier
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        await self.set(key, value_encoder.encode_raw(value), ttl, broadcast)
+        raw_tier(key).set(key, value, ttl)
+
+    async def set_raw_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        """
+        Set several raw values with the same TTL in one round trip.
+
+        Args:
+            items: Mapping of cache key to bytes
+            ttl: Time to live in seconds
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        await self.set_many(
+            {key: value_encoder.encode_raw(value) for key, value in items.items()},
+            ttl,
+        )
+        for key, value in items.items():
+            raw_tier(key).set(key, value, ttl)
+
+    async def set_if_absent(self, key: str, value: str | bytes, ttl: int) -> bool:
+        """
+        Set a value with TTL only if the key does not exist (SET NX EX).
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds
+
+        Returns:
+            True if the value was written, False if the key already existed
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("SET NX", [key]):
+                cache_metrics.record_write_size(key, len(value))
+                written = await self.client.set(key, value, nx=True, ex=ttl)
+        except RedisError as e:
+            logger.error(f"Redis set error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to set in cache: {str(e)}")
+        return bool(written)
+
+    async def get_generation(self, namespace: str) -> int:
+        """
+        Get the current generation of a namespace.
+
+        The counter is kept in the local tier for a short time and evicted
+        on every worker when it is bumped. If Redis is unavailable the last
+        known generation (or 0) is used so reads can still fail open.
+
+        Args:
+            namespace: Key family, e.g. "demo:invoices"
+
+        Returns:
+            Current generation number
+        """
+        generation_key = _generation_key(namespace)
+        generation = local_cache.get(generation_key)
+        if generation is not None:
+            return generation
+        try:
+            generation = _parse_generation(await self.get(generation_key))
+        except (CacheConnectionError, CacheOperationError):
+            return local_cache.get_stale(generation_key) or 0
+        local_cache.set(generation_key, generation, GENERATION_LOCAL_TTL_SECONDS)
+        return generation
+
+    async def namespaced_key(self, namespace: str, key: Any) -> str:
+        """
+        Build the cache key for ``key`` in the current generation of a namespace.
+
+        Args:
+            namespace: Key family, e.g. "demo:invoices"
+            key: Key within the family, e.g. the limit
+
+        Returns:
+            Full cache key
+        """
+        return versioned_key(namespace, key, await self.get_generation(namespace))
+
+    async def bump_generation(self, namespace: str) -> int:
+        """
+        Invalidate every key of a namespace with a single INCR.
+
+        Keys from older generations are never read again and age out
+        through their own TTLs, so no SCAN or per-key DEL is needed.
+
+        Args:
+            namespace: Key family, e.g. "demo:invoices"
+
+        Returns:
+            New generation number
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        generation_key = _generation_key(namespace)
+        try:
+            with _guarded("INCR+PUBLISH", [generation_key]):
+                pipe = self.client.pipeline(transaction=False)
+                pipe.incr(generation_key)
+                pipe.publish(
+                    INVALIDATION_CHANNEL, _invalidation_message([generation_key], [])
+                )
+                generation, _ = await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Redis generation bump error for {namespace}: {str(e)}")
+            raise CacheOperationError(f"Failed to bump generation: {str(e)}")
+        local_cache.set(generation_key, generation, GENERATION_LOCAL_TTL_SECONDS)
+        logger.info(f"Namespace {namespace} moved to generation {generation}")
+        return generation
+
+    async def invalidate(
+        self, keys: Sequence[str] = (), prefixes: Sequence[str] = ()
+    ) -> None:
+        """
+        Evict keys and key prefixes from the local tier of every worker.
+
+        Values in Redis are left untouched; this only announces that local
+        copies must be re-read.
+
+        Args:
+            keys: Exact keys to evict
+            prefixes: Prefixes whose keys should all be evicted
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        evict_locally(keys, prefixes)
+        try:
+            with _guarded("PUBLISH"):
+                await self.client.publish(
+                    INVALIDATION_CHANNEL, _invalidation_message(keys, prefixes)
+                )
+        except RedisError as e:
+            logger.error(
+                f"Redis publish error for {list(keys) + list(prefixes)}: {str(e)}"
+            )
+            raise CacheOperationError(f"Failed to publish invalidation: {str(e)}")
+
+    async def acquire_lease(self, key: str, ttl_ms: int) -> Optional[str]:
+        """
+        Try to take the short-lived recompute lease for a key (SET NX PX).
+
+        Args:
+            key: Cache key to be recomputed
+            ttl_ms: Lease duration in milliseconds
+
+        Returns:
+            Lease token if acquired, None if another holder has it
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        token = uuid.uuid4().hex
+        try:
+            with _guarded("SET NX", [key]):
+                acquired = await self.client.set(
+                    _lease_key(key), token, nx=True, px=ttl_ms
+                )
+        except RedisError as e:
+            logger.error(f"Redis lease error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to acquire lease: {str(e)}")
+        return token if acquired else None
+
+    async def release_lease(self, key: str, token: str) -> None:
+        """
+        Release a lease if it is still held by ``token``.
+
+        Args:
+            key: Cache key the lease guards
+            token: Token returned by acquire_lease
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("EVAL", [key]):
+                await self.client.eval(_RELEASE_LEASE_SCRIPT, 1, _lease_key(key), token)
+        except RedisError as e:
+            logger.error(f"Redis lease release error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to release lease: {str(e)}")
+
+    async def renew_lease(self, key: str, token: str, ttl_ms: int) -> bool:
+        """
+        Extend a lease if it is still held by ``token``.
+
+        Args:
+            key: Cache key the lease guards
+            token: Token returned by acquire_lease
+            ttl_ms: New lease duration in milliseconds
+
+        Returns:
+            True if the lease was extended, False if it was lost
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        try:
+            with _guarded("EVAL", [key]):
+                renewed = await self.client.eval(
+                    _RENEW_LEASE_SCRIPT, 1, _lease_key(key), token, ttl_ms
+                )
+        except RedisError as e:
+            logger.error(f"Redis lease renew error for key {key}: {str(e)}")
+            raise CacheOperationError(f"Failed to renew lease: {str(e)}")
+        return bool(renewed)
+
+    async def set_json(
+        self, key: str, value: Any, ttl: int, broadcast: bool = False
+    ) -> None:
+        """
+        Set a JSON value in cache with TTL.
+
+        Args:
+            key: Cache key
+            value: Value to serialize and cache
+            ttl: Time to live in seconds
+            broadcast: Evict the key from every other worker's local tier
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        await self.set(key, _encode_json(key, value), ttl, broadcast)
+        local_cache.set(key, value, ttl)
+
+    async def set_json_many(self, items: Dict[str, Any], ttl: int) -> None:
+        """
+        Set several JSON values with the same TTL in one round trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds
+
+        Raises:
+            CacheOperationError: If Redis operation fails
+        """
+        await self.set_many(
+            {key: _encode_json(key, value) for key, value in items.items()}, ttl
+        )
+        for key, value in items.items():
+            local_cache.set(key, value, ttl)
 
 
-# Global singleton instance
+# Global singleton instances
 redis_cache = RedisCacheService()
+async_redis_cache = AsyncRedisCacheService()
@@ -0,0 +1,96 @@
+"""
+Precomputed corpus of mock company names and their abbreviations.
+"""
+
+import json
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+
+from app.constants.invoice_constants import COMPANY_CORPUS_SEED, COMPANY_CORPUS_SIZE
+from app.core.logging import get_logger
+from app.core.seeded_random import seeded_generators
+
+logger = get_logger(__name__)
+
+
+def abbreviate(company_name: str) -> str:
+    """
+    Generate an abbreviated name from company name.
+
+    Hyphens separate words too, so the abbreviation never contains one and
+    invoice ids keep their INV-XXX-YYY shape.
+
+    Args:
+        company_name: Company name to abbreviate
+
+    Returns:
+        Abbreviated company name
+    """
+    words = company_name.replace("-", " ").split()
+    if len(words) == 1:
+        return words[0][:4].upper()
+    return "".join(word[0] for word in words[:4]).upper()
+
+
+class CompanyCorpus:
+    """
+    Company names with their abbreviations and JSON encodings.
+
+    The three are kept as parallel NumPy string arrays, so generators pick
+    companies by sampling indices and gather a whole column with one fancy
+    index instead of calling Faker and abbreviating every row.
+    """
+
+    def __init__(self, names: np.ndarray):
+        self.names = names
+        self.abbreviations = np.array([abbreviate(name) for name in names.tolist()])
+        self.json_names = np.array(
+            [json.dumps(name, ensure_ascii=False) for name in names.tolist()]
+        )
+
+    @classmethod
+    def build(cls, seed: int, size: int) -> "CompanyCorpus":
+        """
+        Generate a corpus with Faker.
+
+        Args:
+            seed: Seed of the generation
+            size: Number of company names
+
+        Returns:
+            Generated corpus; the same seed and size give the same corpus
+        """
+        _, fake = seeded_generators(seed)
+        return cls(np.array([fake.company() for _ in range(size)]))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+_corpora: Dict[Tuple[int, int], CompanyCorpus] = {}
+_corpora_lock = threading.Lock()
+
+
+def company_corpus(
+    seed: int = COMPANY_CORPUS_SEED, size: int = COMPANY_CORPUS_SIZE
+) -> CompanyCorpus:
+    """
+    Get the corpus for a seed, building it on first use.
+
+    Args:
+        seed: Seed of the corpus
+        size: Number of company names
+
+    Returns:
+        Shared corpus, built once per seed and size in each process
+    """
+    corpus = _corpora.get((seed, size))
+    if corpus is None:
+        with _corpora_lock:
+            corpus = _corpora.get((seed, size))
+            if corpus is None:
+                corpus = _corpora[(seed, size)] = CompanyCorpus.build(seed, size)
+                logger.info(f"Built company corpus of {size} names (seed {seed})")
+    return corpus
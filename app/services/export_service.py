@@ -0,0 +1,455 @@
+"""
+Bulk invoice exports generated in the background by a process pool.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+from app.constants.export_constants import (
+    CSV_HEADER,
+    EXPORT_CHUNK_ROWS,
+    EXPORT_DIRNAME,
+    EXPORT_ESTIMATED_ROW_BYTES,
+    EXPORT_FORMATS,
+    EXPORT_HEARTBEAT_SECONDS,
+    EXPORT_MAX_ACTIVE_JOBS,
+    EXPORT_MAX_DISK_BYTES,
+    EXPORT_MAX_WORKERS,
+    EXPORT_RETENTION_SECONDS,
+    EXPORT_SHARD_ROWS,
+    EXPORT_STALE_SECONDS,
+)
+from app.core.logging import get_logger
+from app.errors.export_errors import (
+    ExportCapacityError,
+    ExportNotFoundError,
+    ExportNotReadyError,
+)
+from app.schemas.export_schemas import ExportJob, ExportRequest
+from app.services.invoice_engine import InvoiceBatch
+from app.services.invoice_snapshot import merge_snapshots, write_snapshot
+
+logger = get_logger(__name__)
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+_MANIFEST = "job.json"
+
+
+def _shard_path(job_dir: str, index: int) -> str:
+    """Return the file a shard is written to."""
+    return os.path.join(job_dir, f"shard-{index:05d}.part")
+
+
+def _write_shard(path: str, fmt: str, seed: int, start: int, count: int) -> int:
+    """
+    Generate invoices ``start`` to ``start + count - 1`` of a seed into a file.
+
+    Runs in a worker process. Rows are a pure function of the seed and their
+    index, so a shard has the same content whichever process writes it.
+
+    Args:
+        path: Shard file
+        fmt: Export format
+        seed: Seed of the invoices
+        start: Index of the first invoice
+        count: Number of invoices
+
+    Returns:
+        Size of the shard in bytes
+    """
+    if fmt == "snapshot":
+        # Columns are encoded whole; a shard of invoices fits in memory
+        return write_snapshot(path, InvoiceBatch.generate(count, seed, start))
+    end = start + count
+    with open(path, "wb") as shard:
+        for offset in range(start, end, EXPORT_CHUNK_ROWS):
+            batch = InvoiceBatch.generate(
+                min(EXPORT_CHUNK_ROWS, end - offset), seed, offset
+            )
+            if fmt == "csv":
+                shard.write(batch.render_csv())
+            elif fmt == "json":
+                separator = b"," if offset > start else b""
+                shard.write(separator + b",".join(batch.render_rows()))
+            else:
+                shard.write(b"\n".join(batch.render_rows()) + b"\n")
+    return os.path.getsize(path)
+
+
+def _concatenate(job_dir: str, fmt: str, shards: int) -> Tuple[str, int]:
+    """
+    Join the shards of an export, in order, into its final file.
+
+    Args:
+        job_dir: Directory of the export
+        fmt: Export format
+        shards: Number of shards
+
+    Returns:
+        Tuple of the final file path and its size in bytes
+    """
+    extension, _ = EXPORT_FORMATS[fmt]
+    path = os.path.join(job_dir, f"invoices.{extension}")
+    partial = path + ".part"
+    if fmt == "snapshot":
+        # Always merged, even from one shard, so dictionaries are canonical
+        shard_paths = [_shard_path(job_dir, index) for index in range(shards)]
+        merge_snapshots(shard_paths, partial)
+        for shard_path in shard_paths:
+            os.remove(shard_path)
+        os.replace(partial, path)
+        return path, os.path.getsize(path)
+    with open(partial, "wb") as output:
+        if fmt == "json":
+            output.write(b"[")
+        elif fmt == "csv":
+            output.write(CSV_HEADER)
+        for index in range(shards):
+            if fmt == "json" and index:
+                output.write(b",")
+            with open(_shard_path(job_dir, index), "rb") as shard:
+                shutil.copyfileobj(shard, output, 1 << 20)
+            os.remove(_shard_path(job_dir, index))
+        if fmt == "json":
+            output.write(b"]")
+    os.replace(partial, path)
+    return path, os.path.getsize(path)
+
+
+def _remove_partial(job_dir: str, fmt: str, shards: int) -> None:
+    """Delete the shards and unfinished output of a failed export."""
+    extension, _ = EXPORT_FORMATS[fmt]
+    paths = [_shard_path(job_dir, index) for index in range(shards)]
+    paths.append(os.path.join(job_dir, f"invoices.{extension}.part"))
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _abandoned(job: ExportJob, now: float) -> bool:
+    """Whether an unfinished job's owner stopped refreshing its manifest."""
+    if job.status not in ("queued", "running"):
+        return False
+    last_seen = job.heartbeat_at if job.heartbeat_at is not None else job.created_at
+    return now - last_seen > EXPORT_STALE_SECONDS
+
+
+class ExportService:
+    """
+    Runs export jobs and tracks them on disk.
+
+    An export is split into shards of ``shard_rows`` invoices, generated in
+    parallel by a pool of worker processes and joined in order once all
+    are written, so throughput scales with the cores while the file only
+    depends on the count, seed and format. Each job lives in its own
+    directory with a JSON manifest, so any worker of the host can report
+    its status and serve its file. Finished jobs are deleted after
+    ``retention`` seconds.
+
+    Admission is bounded: a worker runs at most ``max_jobs`` exports at
+    once, and an export is refused when it would take the directory past
+    ``max_bytes``. The owner refreshes a running job's manifest every
+    ``EXPORT_HEARTBEAT_SECONDS``; a job whose manifest has not been
+    refreshed for ``EXPORT_STALE_SECONDS`` lost its worker and is reported
+    as failed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_workers: int,
+        shard_rows: int = EXPORT_SHARD_ROWS,
+        retention: float = EXPORT_RETENTION_SECONDS,
+        max_jobs: int = EXPORT_MAX_ACTIVE_JOBS,
+        max_bytes: int = EXPORT_MAX_DISK_BYTES,
+    ):
+        self.directory = directory
+        self.max_workers = max_workers
+        self.shard_rows = shard_rows
+        self.retention = retention
+        self.max_jobs = max_jobs
+        self.max_bytes = max_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # Heartbeats and progress updates of a job may write at the same time
+        self._manifest_lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use."""
+        if self._pool is None:
+            # Spawned, not forked: the server has an event loop and threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def _job_dir(self, job_id: str) -> str:
+        """
+        Get the directory of a job.
+
+        Raises:
+            ExportNotFoundError: If the ID is not a valid export ID
+        """
+        if not _JOB_ID.match(job_id):
+            raise ExportNotFoundError()
+        return os.path.join(self.directory, job_id)
+
+    def _write_manifest(self, job_id: str, data: str) -> None:
+        """Write a job's manifest atomically."""
+        manifest = os.path.join(self._job_dir(job_id), _MANIFEST)
+        with self._manifest_lock:
+            with open(manifest + ".part", "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(manifest + ".part", manifest)
+
+    async def _save(self, job: ExportJob) -> None:
+        """Write a job's manifest off the event loop, stamping its heartbeat."""
+        job.heartbeat_at = time.time()
+        await asyncio.to_thread(self._write_manifest, job.id, job.model_dump_json())
+
+    def _load(self, job_id: str) -> ExportJob:
+        """
+        Read a job's manifest as its owner last saved it.
+
+        Raises:
+            ExportNotFoundError: If the export does not exist or has expired
+        """
+        try:
+            with open(
+                os.path.join(self._job_dir(job_id), _MANIFEST), encoding="utf-8"
+            ) as file:
+                return ExportJob.model_validate_json(file.read())
+        except FileNotFoundError as e:
+            raise ExportNotFoundError() from e
+
+    async def get(self, job_id: str) -> ExportJob:
+        """
+        Get the state of an export.
+
+        Exports abandoned by a worker that stopped are reported as failed.
+
+        Args:
+            job_id: Export ID
+
+        Returns:
+            Export state
+
+        Raises:
+            ExportNotFoundError: If the export does not exist or has expired
+        """
+        job = await asyncio.to_thread(self._load, job_id)
+        if _abandoned(job, time.time()):
+            job.status, job.error = "failed", "Export worker stopped"
+        return job
+
+    async def result(self, job_id: str) -> Tuple[str, str, str]:
+        """
+        Get the file of a completed export.
+
+        Args:
+            job_id: Export ID
+
+        Returns:
+            Tuple of file path, media type and download filename
+
+        Raises:
+            ExportNotFoundError: If the export does not exist or has expired
+            ExportNotReadyError: If the export has not completed
+        """
+        job = await self.get(job_id)
+        if job.status != "completed":
+            raise ExportNotReadyError()
+        extension, media_type = EXPORT_FORMATS[job.format]
+        return (
+            os.path.join(self._job_dir(job_id), f"invoices.{extension}"),
+            media_type,
+            f"invoices-{job.id}.{extension}",
+        )
+
+    def disk_usage(self) -> int:
+        """Return the bytes held by every export in the directory."""
+        used = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                try:
+                    used += os.path.getsize(os.path.join(root, name))
+                except FileNotFoundError:
+                    pass
+        return used
+
+    async def submit(self, request: ExportRequest) -> ExportJob:
+        """
+        Queue an export and start it in the background.
+
+        Args:
+            request: Count, seed and format of the export
+
+        Returns:
+            State of the queued export
+
+        Raises:
+            ExportCapacityError: If this worker already runs ``max_jobs``
+                exports, or the export would not fit in ``max_bytes``
+        """
+        if len(self._tasks) >= self.max_jobs:
+            raise ExportCapacityError()
+        await asyncio.to_thread(self.prune)
+        used = await asyncio.to_thread(self.disk_usage)
+        if used + request.count * EXPORT_ESTIMATED_ROW_BYTES > self.max_bytes:
+            raise ExportCapacityError("Export storage is full")
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            status="queued",
+            count=request.count,
+            seed=secrets.randbits(63) if request.seed is None else request.seed,
+            format=request.format,
+            shards=-(-request.count // self.shard_rows),
+            created_at=time.time(),
+        )
+        await asyncio.to_thread(os.makedirs, self._job_dir(job.id))
+        await self._save(job)
+        # Other submissions may have been admitted while this one was awaiting
+        if len(self._tasks) >= self.max_jobs:
+            await asyncio.to_thread(shutil.rmtree, self._job_dir(job.id), True)
+            raise ExportCapacityError()
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(
+            f"Queued export {job.id}: {job.count} invoices as {job.format} "
+            f"in {job.shards} shards"
+        )
+        return job
+
+    async def _run(self, job: ExportJob) -> None:
+        """Generate every shard in the pool, then join them."""
+        job_dir = self._job_dir(job.id)
+        loop = asyncio.get_running_loop()
+        job.status = "running"
+        await self._save(job)
+        stopped = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(job, stopped))
+        shards: List[asyncio.Future] = []
+        try:
+            executor = self._executor()
+            shards = [
+                loop.run_in_executor(
+                    executor,
+                    _write_shard,
+                    _shard_path(job_dir, index),
+                    job.format,
+                    job.seed,
+                    index * self.shard_rows,
+                    min(self.shard_rows, job.count - index * self.shard_rows),
+                )
+                for index in range(job.shards)
+            ]
+            for shard in asyncio.as_completed(shards):
+                await shard
+                job.shards_done += 1
+                await self._save(job)
+            _, job.size_bytes = await asyncio.to_thread(
+                _concatenate, job_dir, job.format, job.shards
+            )
+            job.status = "completed"
+            logger.info(f"Export {job.id} completed ({job.size_bytes} bytes)")
+        except asyncio.CancelledError:
+            job.status, job.error = "failed", "Export cancelled on shutdown"
+            # Shards already running are not waited for; the pool is stopping
+            for shard in shards:
+                shard.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Export {job.id} failed: {str(e)}")
+            job.status, job.error = "failed", str(e)
+            # Free the pool: drop queued shards and let running ones finish
+            # before their files are deleted
+            for shard in shards:
+                shard.cancel()
+            await asyncio.gather(*shards, return_exceptions=True)
+        finally:
+            # Stopped rather than cancelled, so no heartbeat write can land
+            # after the final manifest
+            stopped.set()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            job.finished_at = time.time()
+            if job.status == "failed":
+                await asyncio.to_thread(
+                    _remove_partial, job_dir, job.format, job.shards
+                )
+            await self._save(job)
+
+    async def _heartbeat(self, job: ExportJob, stopped: asyncio.Event) -> None:
+        """Refresh a running job's manifest until ``stopped`` is set."""
+        while True:
+            try:
+                await asyncio.wait_for(stopped.wait(), EXPORT_HEARTBEAT_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                await self._save(job)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Delete exports that finished more than ``retention`` seconds ago.
+
+        Abandoned exports (see ``get``) never finish, so they age from their
+        submission instead.
+
+        Args:
+            now: Current epoch time (the clock if None)
+
+        Returns:
+            Number of exports deleted
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        try:
+            job_ids = os.listdir(self.directory)
+        except FileNotFoundError:
+            return 0
+        for job_id in job_ids:
+            try:
+                job = self._load(job_id)
+            except ExportNotFoundError:
+                continue
+            finished = job.finished_at
+            if finished is None and _abandoned(job, now):
+                finished = job.created_at
+            if finished is not None and now - finished > self.retention:
+                shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+                removed += 1
+        return removed
+
+    async def shutdown(self) -> None:
+        """Cancel running exports and stop the worker processes."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Per-worker export runner; jobs are shared with the host's other workers on
+# disk, and the host's cores are split between the server workers' pools
+export_service = ExportService(
+    directory=os.getenv(
+        "EXPORT_DIR", os.path.join(tempfile.gettempdir(), EXPORT_DIRNAME)
+    ),
+    max_workers=int(os.getenv("EXPORT_MAX_WORKERS", EXPORT_MAX_WORKERS))
+    or max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1"))),
+)
@@ -0,0 +1,132 @@
+"""
+Cross-replica invalidation of the local cache tier over Redis pub/sub.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+
+from app.constants.cache_constants import (
+    INVALIDATION_CHANNEL,
+    INVALIDATION_ENABLED,
+    INVALIDATION_MAX_RECONNECT_SECONDS,
+    INVALIDATION_POLL_SECONDS,
+    INVALIDATION_RECONNECT_SECONDS,
+)
+from app.core.logging import get_logger
+from app.services.caching_service import INSTANCE_ID, evict_locally
+from app.services.redis_connections import redis_connections
+
+logger = get_logger(__name__)
+
+
+class InvalidationSubscriber:
+    """
+    Background listener that applies invalidations published by other workers.
+
+    Writes made with ``broadcast=True`` (and explicit ``invalidate`` calls)
+    publish the changed keys and prefixes on ``INVALIDATION_CHANNEL``. Every
+    worker runs one subscriber, which evicts those entries from its local
+    tier so the next read goes back to Redis.
+
+    Messages published while the subscriber is disconnected are lost, so
+    the whole local tier is evicted whenever it resubscribes after a gap.
+    """
+
+    def __init__(
+        self,
+        channel: str = INVALIDATION_CHANNEL,
+        poll_interval: float = INVALIDATION_POLL_SECONDS,
+        reconnect_delay: float = INVALIDATION_RECONNECT_SECONDS,
+        max_reconnect_delay: float = INVALIDATION_MAX_RECONNECT_SECONDS,
+    ):
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.received = 0
+        self.reconnects = 0
+
+    def start(self) -> None:
+        """Start listening in a background task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and wait for the background task to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def handle(self, data: Any) -> None:
+        """
+        Apply one invalidation message to the local tier.
+
+        Args:
+            data: Raw message payload published on the channel
+        """
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed invalidation message: {str(e)}")
+            return
+        if message.get("origin") == INSTANCE_ID:
+            # The publishing worker already updated its own local tier
+            return
+        self.received += 1
+        evict_locally(message.get("keys", []), message.get("prefixes", []))
+
+    async def _run(self) -> None:
+        """Subscribe, dispatch messages and reconnect with backoff on errors."""
+        delay = self.reconnect_delay
+        subscribed_before = False
+        while True:
+            pubsub = redis_connections.async_primary().pubsub(
+                ignore_subscribe_messages=True
+            )
+            try:
+                await pubsub.subscribe(self.channel)
+                if subscribed_before:
+                    # Invalidations may have been missed while disconnected
+                    self.reconnects += 1
+                    evict_locally([], [""])
+                    logger.info("Resubscribed to invalidations, evicted local tiers")
+                subscribed_before = True
+                self.connected = True
+                delay = self.reconnect_delay
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=self.poll_interval
+                    )
+                    if message is not None:
+                        self.handle(message["data"])
+            except (RedisError, OSError) as e:
+                logger.warning(
+                    f"Invalidation subscriber disconnected, retrying in {delay}s: "
+                    f"{str(e)}"
+                )
+            finally:
+                self.connected = False
+                try:
+                    await pubsub.aclose()
+                except (RedisError, OSError):
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+
+# Per-worker subscriber, started from the application lifespan
+invalidation_subscriber = InvalidationSubscriber()
+invalidation_enabled = (
+    os.getenv("CACHE_INVALIDATION_ENABLED", str(INVALIDATION_ENABLED)).lower() == "true"
+)
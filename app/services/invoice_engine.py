@@ -0,0 +1,232 @@
+"""
+Vectorized batch generation of mock invoices.
+"""
+
+import csv
+import io
+import json
+from typing import List, Optional
+
+import numpy as np
+
+from app.constants.invoice_constants import (
+    MAX_AMOUNT,
+    MAX_RISK,
+    MIN_AMOUNT,
+    MIN_RISK,
+    STATUS_WEIGHTS,
+)
+from app.schemas.invoice_schemas import Invoice
+from app.services.company_corpus import CompanyCorpus, company_corpus
+
+# Statuses and the cumulative distribution they are drawn from, built once
+_STATUSES = list(STATUS_WEIGHTS)
+_STATUS_THRESHOLDS = np.cumsum(list(STATUS_WEIGHTS.values()), dtype=float)
+_STATUS_THRESHOLDS /= _STATUS_THRESHOLDS[-1]
+
+# SplitMix64 constants
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+# Counters reserved per row: one per column, leaving room for new columns
+_ROW_STRIDE = 8
+_COMPANY, _ID, _AMOUNT, _RISK, _TOKEN, _STATUS = range(6)
+
+
+def _uniform(seed: int, rows: np.ndarray, column: int) -> np.ndarray:
+    """
+    Draw one uniform float in [0, 1) per row, as a pure function of its inputs.
+
+    This is SplitMix64 evaluated at counter ``row * _ROW_STRIDE + column``
+    of the stream started at ``seed``, so any row can be drawn without
+    drawing the ones before it.
+
+    Args:
+        seed: Seed of the dataset
+        rows: Row indexes (uint64)
+        column: Column the values are drawn for
+
+    Returns:
+        Array of floats, one per row
+    """
+    counters = rows * np.uint64(_ROW_STRIDE) + np.uint64(column) + np.uint64(1)
+    z = np.uint64(seed & 0xFFFFFFFFFFFFFFFF) + counters * _GOLDEN_GAMMA
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)).astype(np.float64) * 2.0**-53
+
+
+def _integers(
+    seed: int, rows: np.ndarray, column: int, low: int, high: int
+) -> np.ndarray:
+    """Draw one integer in [low, high) per row (see ``_uniform``)."""
+    return low + (_uniform(seed, rows, column) * (high - low)).astype(np.int64)
+
+
+class InvoiceBatch:
+    """
+    Batch of mock invoices generated column by column.
+
+    Clients (as indices into the company corpus), id numbers, amounts,
+    risks, token ids and statuses are drawn as NumPy arrays in one call
+    each; rows are only materialized when the batch is converted to
+    ``Invoice`` models or rendered to JSON, and only for the rows asked for.
+
+    Generation is counter-based: every value of invoice ``i`` is a pure
+    function of the seed and ``i``. A seed therefore defines an unbounded
+    virtual dataset, and any slice of it costs only its own size to
+    generate, however deep it starts.
+    """
+
+    def __init__(
+        self,
+        corpus: CompanyCorpus,
+        companies: np.ndarray,
+        id_numbers: np.ndarray,
+        amounts: np.ndarray,
+        risks: np.ndarray,
+        token_numbers: np.ndarray,
+        statuses: np.ndarray,
+    ):
+        self.corpus = corpus
+        self.companies = companies
+        self.id_numbers = id_numbers
+        self.amounts = amounts
+        self.risks = risks
+        self.token_numbers = token_numbers
+        self.statuses = statuses
+
+    @classmethod
+    def generate(cls, count: int, seed: int, start: int = 0) -> "InvoiceBatch":
+        """
+        Generate a batch of invoices.
+
+        Args:
+            count: Number of invoices
+            seed: Seed of the generation
+            start: Index of the first invoice in the seed's virtual dataset
+
+        Returns:
+            Generated batch of invoices ``start`` to ``start + count - 1``
+        """
+        corpus = company_corpus()
+        rows = np.arange(start, start + count, dtype=np.uint64)
+        risks = MIN_RISK + _uniform(seed, rows, _RISK) * (MAX_RISK - MIN_RISK)
+        statuses = np.searchsorted(
+            _STATUS_THRESHOLDS, _uniform(seed, rows, _STATUS), side="right"
+        )
+        return cls(
+            corpus=corpus,
+            companies=_integers(seed, rows, _COMPANY, 0, len(corpus)),
+            id_numbers=_integers(seed, rows, _ID, 100, 1000),
+            amounts=_integers(seed, rows, _AMOUNT, MIN_AMOUNT, MAX_AMOUNT + 1),
+            risks=np.round(risks, 4),
+            token_numbers=_integers(seed, rows, _TOKEN, 1000, 10000),
+            statuses=np.minimum(statuses, len(_STATUSES) - 1),
+        )
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def _columns(self, limit: Optional[int], names: np.ndarray) -> zip:
+        """Iterate over the first ``limit`` rows as plain Python values."""
+        stop = len(self) if limit is None else min(limit, len(self))
+        companies = self.companies[:stop]
+        return zip(
+            names[companies].tolist(),
+            self.corpus.abbreviations[companies].tolist(),
+            self.id_numbers[:stop].tolist(),
+            self.amounts[:stop].tolist(),
+            self.risks[:stop].tolist(),
+            self.token_numbers[:stop].tolist(),
+            self.statuses[:stop].tolist(),
+        )
+
+    def to_invoices(self, limit: Optional[int] = None) -> List[Invoice]:
+        """
+        Materialize rows as Invoice models.
+
+        Args:
+            limit: Number of rows to materialize (all if None)
+
+        Returns:
+            List of Invoice objects
+        """
+        return [
+            Invoice(
+                id=f"INV-{id_number}-{abbreviation}",
+                client=client,
+                amount=amount,
+                risk=risk,
+                tokenId=f"TIQ-{token_number}",
+                status=_STATUSES[status],
+            )
+            for client, abbreviation, id_number, amount, risk, token_number, status in (
+                self._columns(limit, self.corpus.names)
+            )
+        ]
+
+    def render_rows(self, limit: Optional[int] = None) -> List[bytes]:
+        """
+        Render rows as JSON objects without building Invoice models.
+
+        The output is byte-for-byte what pydantic renders for the same
+        invoices, with the fields in schema order.
+
+        Args:
+            limit: Number of rows to render (all if None)
+
+        Returns:
+            JSON-encoded invoices
+        """
+        rows = []
+        for (
+            client,
+            abbreviation,
+            id_number,
+            amount,
+            risk,
+            token_number,
+            status,
+        ) in self._columns(limit, self.corpus.json_names):
+            invoice_id = json.dumps(
+                f"INV-{id_number}-{abbreviation}", ensure_ascii=False
+            )
+            rows.append(
+                (
+                    f'{{"id":{invoice_id},'
+                    f'"client":{client},'
+                    f'"amount":{amount},"risk":{risk!r},'
+                    f'"tokenId":"TIQ-{token_number}",'
+                    f'"status":"{_STATUSES[status]}"}}'
+                ).encode()
+            )
+        return rows
+
+    def render_csv(self, limit: Optional[int] = None) -> bytes:
+        """
+        Render rows as CSV lines, without a header.
+
+        Args:
+            limit: Number of rows to render (all if None)
+
+        Returns:
+            CSV-encoded invoices, one line per invoice
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(
+            (
+                f"INV-{id_number}-{abbreviation}",
+                client,
+                amount,
+                repr(risk),
+                f"TIQ-{token_number}",
+                _STATUSES[status],
+            )
+            for client, abbreviation, id_number, amount, risk, token_number, status in (
+                self._columns(limit, self.corpus.names)
+            )
+        )
+        return buffer.getvalue().encode()
@@ -2,30 +2,43 @@
 Invoice generation service.
 """
 
+import asyncio
+import functools
 import random
-from typing import List
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
 
-from faker import Faker
+from pydantic import TypeAdapter
 
 from app.constants.invoice_constants import (
+    CACHE_DATASET_KEY,
     CACHE_KEY_PREFIX,
+    CACHE_PAGE_KEY_PREFIX,
+    CACHE_SOFT_TTL_SECONDS,
     CACHE_TTL_SECONDS,
-    MAX_AMOUNT,
-    MAX_RISK,
-    MIN_AMOUNT,
-    MIN_RISK,
+    MAX_LIMIT,
+    PAGINATION_DATASET_SIZE,
+    PAGINATION_SEED,
+    RANDOM_SEED,
     STATUS_WEIGHTS,
+    STREAM_CHUNK_SIZE,
 )
 from app.core.logging import get_logger
+from app.core.seeded_random import SeedSequence
+from app.core.sliced_array import pack_array, slice_array
 from app.schemas.invoice_schemas import Invoice
-from app.services.caching_service import redis_cache
+from app.services.caching_service import async_redis_cache, redis_cache
+from app.services.company_corpus import abbreviate
+from app.services.invoice_engine import InvoiceBatch
+from app.services.read_through_service import ReadThroughBodyCache
 
 logger = get_logger(__name__)
 
-# Initialize Faker with fixed seed
-fake = Faker()
-Faker.seed(1234)  # Set random seed for Faker
-random.seed(1234)  # Set random seed for reproducibility
+# Seeds generations without an explicit seed: datasets differ between TTL
+# windows but follow the same sequence in every process
+_seeds = SeedSequence(RANDOM_SEED)
+
+# Validates and renders invoice lists exactly as the /invoices response
+INVOICE_LIST = TypeAdapter(List[Invoice])
 
 
 class InvoiceService:
@@ -44,55 +57,242 @@ class InvoiceService:
         Returns:
             Abbreviated company name
         """
-        words = company_name.split()
-        if len(words) == 1:
-            return words[0][:4].upper()
-        else:
-            return "".join(word[0] for word in words[:4]).upper()
+        return abbreviate(company_name)
 
     @staticmethod
-    def get_status_weighted() -> str:
+    def get_status_weighted(rng: Optional[random.Random] = None) -> str:
         """
         Return a status based on weighted probabilities.
 
+        Args:
+            rng: Random generator to draw from (the global one by default)
+
         Returns:
             Random status (new, processing, or funded)
         """
-        return random.choices(
+        return (rng or random).choices(
             list(STATUS_WEIGHTS.keys()),
             weights=list(STATUS_WEIGHTS.values()),
             k=1,
         )[0]
 
     @classmethod
-    def generate_invoices(cls, limit: int) -> List[Invoice]:
+    def generate_batch(cls, limit: int, seed: Optional[int] = None) -> InvoiceBatch:
+        """
+        Generate mock invoices as a columnar batch.
+
+        Each call draws from its own generators, so calls can run in
+        parallel and the same seed always yields the same invoices.
+
+        Args:
+            limit: Number of invoices to generate
+            seed: Seed of the generation (the next one of the sequence if None)
+
+        Returns:
+            Generated batch, materialized row by row only when rendered
+        """
+        return InvoiceBatch.generate(limit, _seeds.next() if seed is None else seed)
+
+    @classmethod
+    def generate_invoices(cls, limit: int, seed: Optional[int] = None) -> List[Invoice]:
         """
         Generate a list of mock invoices.
 
         Args:
             limit: Number of invoices to generate
+            seed: Seed of the generation (the next one of the sequence if None)
 
         Returns:
             List of Invoice objects
         """
-        invoices = []
+        return cls.generate_batch(limit, seed).to_invoices()
+
+    @classmethod
+    def iter_invoice_rows(
+        cls,
+        count: int,
+        seed: Optional[int] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[List[bytes]]:
+        """
+        Generate a feed of invoices one chunk at a time.
+
+        Only one chunk is held in memory, whatever ``count`` is. The feed is
+        the first ``count`` invoices of the seed's virtual dataset, so the
+        same seed always yields the same feed.
+
+        Args:
+            count: Number of invoices in the feed
+            seed: Seed of the feed (the next one of the sequence if None)
+            chunk_size: Number of invoices per chunk
+
+        Yields:
+            JSON-encoded invoices of each chunk
+        """
+        seed = _seeds.next() if seed is None else seed
+        for start in range(0, count, chunk_size):
+            batch = InvoiceBatch.generate(min(chunk_size, count - start), seed, start)
+            yield batch.render_rows()
+
+    @classmethod
+    async def stream_invoices_async(
+        cls,
+        count: int,
+        seed: Optional[int] = None,
+        json_array: bool = False,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a feed of invoices as NDJSON or as a chunked JSON array.
+
+        Each chunk is generated in a worker thread only when the consumer
+        asks for the next one. The response sends every chunk before asking
+        for another, so a slow client throttles generation instead of
+        buffering the feed in memory.
+
+        Args:
+            count: Number of invoices in the feed
+            seed: Seed of the feed (the next one of the sequence if None)
+            json_array: Frame the feed as one JSON array instead of NDJSON
+            chunk_size: Number of invoices per chunk
+
+        Yields:
+            Encoded chunks of the response body
+        """
+        chunks = cls.iter_invoice_rows(count, seed, chunk_size)
+        if json_array:
+            yield b"["
+        separator = b""
+        while True:
+            rows = await asyncio.to_thread(next, chunks, None)
+            if rows is None:
+                break
+            if json_array:
+                yield separator + b",".join(rows)
+                separator = b","
+            else:
+                yield b"\n".join(rows) + b"\n"
+        if json_array:
+            yield b"]"
+
+    @classmethod
+    def _render_dataset(cls) -> bytes:
+        """
+        Generate the canonical invoice dataset of ``MAX_LIMIT`` invoices.
+
+        Every limit is served as a prefix of this one dataset, so smaller
+        limits always return the first invoices of larger ones.
+
+        Returns:
+            Packed JSON array of invoices (see ``slice_array``)
+        """
+        return pack_array(cls.generate_batch(MAX_LIMIT).render_rows())
+
+    @classmethod
+    def get_invoices_body(cls, limit: int) -> bytes:
+        """
+        Get invoices as a pre-rendered JSON body with caching.
+
+        Args:
+            limit: Number of invoices to retrieve
+
+        Returns:
+            JSON-encoded list of invoices, ready to send as a response
+        """
+        dataset = ReadThroughBodyCache.get_or_compute(
+            redis_cache.namespaced_key(CACHE_KEY_PREFIX, CACHE_DATASET_KEY),
+            cls._render_dataset,
+            CACHE_TTL_SECONDS,
+            CACHE_SOFT_TTL_SECONDS,
+        )
+        return slice_array(dataset, limit)
+
+    @classmethod
+    async def get_invoices_body_async(cls, limit: int) -> bytes:
+        """
+        Get invoices as a pre-rendered JSON body, awaiting the asyncio client.
+
+        Args:
+            limit: Number of invoices to retrieve
+
+        Returns:
+            JSON-encoded list of invoices, ready to send as a response
+        """
+        dataset = await ReadThroughBodyCache.get_or_compute_async(
+            await async_redis_cache.namespaced_key(CACHE_KEY_PREFIX, CACHE_DATASET_KEY),
+            cls._render_dataset,
+            CACHE_TTL_SECONDS,
+            CACHE_SOFT_TTL_SECONDS,
+        )
+        return slice_array(dataset, limit)
+
+    @classmethod
+    def _render_page(cls, seed: int, offset: int, limit: int) -> bytes:
+        """
+        Render one page of a seed's virtual dataset, generating only that page.
+
+        Args:
+            seed: Seed of the dataset
+            offset: Index of the first invoice
+            limit: Number of invoices
+
+        Returns:
+            JSON-encoded list of invoices
+        """
+        rows = InvoiceBatch.generate(limit, seed, offset).render_rows()
+        return b"[" + b",".join(rows) + b"]"
+
+    @classmethod
+    def _page_key_and_size(cls, seed: int, offset: int, limit: int) -> Tuple[str, int]:
+        """Clamp a page to the dataset and build its key within the family."""
+        limit = max(0, min(limit, PAGINATION_DATASET_SIZE - offset))
+        return f"{seed}:{offset}:{limit}", limit
+
+    @classmethod
+    def get_invoice_page_body(
+        cls, offset: int, limit: int, seed: int = PAGINATION_SEED
+    ) -> bytes:
+        """
+        Get a page of a seed's virtual dataset as a JSON body with caching.
+
+        Args:
+            offset: Index of the first invoice
+            limit: Number of invoices (fewer on the last page)
+            seed: Seed of the dataset
+
+        Returns:
+            JSON-encoded list of invoices, ready to send as a response
+        """
+        key, limit = cls._page_key_and_size(seed, offset, limit)
+        return ReadThroughBodyCache.get_or_compute(
+            redis_cache.namespaced_key(CACHE_PAGE_KEY_PREFIX, key),
+            functools.partial(cls._render_page, seed, offset, limit),
+            CACHE_TTL_SECONDS,
+            CACHE_SOFT_TTL_SECONDS,
+        )
 
-        for _ in range(limit):
-            client_name = fake.company()
-            abbreviated = cls.get_abbreviated_name(client_name)
+    @classmethod
+    async def get_invoice_page_body_async(
+        cls, offset: int, limit: int, seed: int = PAGINATION_SEED
+    ) -> bytes:
+        """
+        Get a page of a seed's virtual dataset, awaiting the asyncio client.
 
-            invoices.append(
-                Invoice(
-                    id=f"INV-{random.randint(100, 999)}-{abbreviated}",
-                    client=client_name,
-                    amount=random.randint(MIN_AMOUNT, MAX_AMOUNT),
-                    risk=round(random.uniform(MIN_RISK, MAX_RISK), 4),
-                    tokenId=f"TIQ-{random.randint(1000, 9999)}",
-                    status=cls.get_status_weighted(),
-                )
-            )
+        Args:
+            offset: Index of the first invoice
+            limit: Number of invoices (fewer on the last page)
+            seed: Seed of the dataset
 
-        return invoices
+        Returns:
+            JSON-encoded list of invoices, ready to send as a response
+        """
+        key, limit = cls._page_key_and_size(seed, offset, limit)
+        return await ReadThroughBodyCache.get_or_compute_async(
+            await async_redis_cache.namespaced_key(CACHE_PAGE_KEY_PREFIX, key),
+            functools.partial(cls._render_page, seed, offset, limit),
+            CACHE_TTL_SECONDS,
+            CACHE_SOFT_TTL_SECONDS,
+        )
 
     @classmethod
     def get_invoices(cls, limit: int) -> List[Invoice]:
@@ -105,23 +305,46 @@ class InvoiceService:
         Returns:
             List of Invoice objects
         """
-        # Check cache first
-        cache_key = f"{CACHE_KEY_PREFIX}:{limit}"
-        cached_data = redis_cache.get_json(cache_key)
+        return INVOICE_LIST.validate_json(cls.get_invoices_body(limit))
+
+    @classmethod
+    async def get_invoices_async(cls, limit: int) -> List[Invoice]:
+        """
+        Get invoices with caching, awaiting the asyncio Redis client.
+
+        Args:
+            limit: Number of invoices to retrieve
+
+        Returns:
+            List of Invoice objects
+        """
+        return INVOICE_LIST.validate_json(await cls.get_invoices_body_async(limit))
 
-        if cached_data:
-            logger.debug(f"Cache hit for {cache_key}")
-            return [Invoice(**item) for item in cached_data]
+    @classmethod
+    async def invalidate_cache_async(cls) -> int:
+        """
+        Invalidate every cached invoices response at once, whatever the limit,
+        pages included.
 
-        # Generate new data
-        logger.debug(f"Cache miss for {cache_key}, generating invoices")
-        invoices = cls.generate_invoices(limit)
+        Returns:
+            New cache generation of the invoices
+        """
+        await async_redis_cache.bump_generation(CACHE_PAGE_KEY_PREFIX)
+        return await async_redis_cache.bump_generation(CACHE_KEY_PREFIX)
+
+    @classmethod
+    async def warm_cache_async(cls) -> None:
+        """
+        Render and cache the invoice dataset, which serves every limit.
 
-        # Cache the result
-        redis_cache.set_json(
-            cache_key,
-            [invoice.model_dump() for invoice in invoices],
+        Rendering runs in a worker thread so the event loop keeps serving
+        requests meanwhile. Each refresh renders a new dataset, so the write
+        is broadcast: every other worker drops its local copy and re-reads
+        this one instead of serving the previous dataset until it expires.
+        """
+        await async_redis_cache.set_raw(
+            await async_redis_cache.namespaced_key(CACHE_KEY_PREFIX, CACHE_DATASET_KEY),
+            await asyncio.to_thread(cls._render_dataset),
             CACHE_TTL_SECONDS,
+            broadcast=True,
         )
-
-        return invoices
@@ -0,0 +1,456 @@
+"""
+Columnar binary snapshots of invoice datasets, read through a memory map.
+"""
+
+import io
+import os
+import struct
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from app.constants.invoice_constants import STATUS_WEIGHTS
+from app.schemas.invoice_schemas import Invoice
+from app.services.invoice_engine import InvoiceBatch
+
+# File header: magic, format version, column count, padding, row count
+_HEADER = struct.Struct("<8sHH4xQ")
+_MAGIC = b"MINTINV\x00"
+_VERSION = 1
+
+# Column directory entry: name, value dtype, values offset, dictionary
+# entry count, dictionary offset (0 when plain) and dictionary text length
+_COLUMN = struct.Struct("<16s8sQQQQ")
+
+# Sections start on 8-byte boundaries so every column maps as an aligned array
+_ALIGNMENT = 8
+
+# Columns in schema order
+_FIELDS = ("id", "client", "amount", "risk", "tokenId", "status")
+
+
+class _Column(NamedTuple):
+    """Encoded column: fixed-width values and, for strings, their dictionary."""
+
+    values: np.ndarray
+    dictionary: Optional[Sequence[str]] = None
+
+
+def _code_dtype(size: int) -> np.dtype:
+    """Return the narrowest unsigned integer type indexing ``size`` entries."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def _narrow(amounts: np.ndarray) -> np.ndarray:
+    """Store amounts as int32 when they all fit, int64 otherwise."""
+    limits = np.iinfo(np.int32)
+    if len(amounts) == 0 or (
+        amounts.min() >= limits.min and amounts.max() <= limits.max
+    ):
+        return amounts.astype(np.int32)
+    return amounts.astype(np.int64)
+
+
+def _dictionary_column(dictionary: Sequence[str], codes: np.ndarray) -> _Column:
+    """Build a dictionary column with codes of the narrowest type."""
+    return _Column(codes.astype(_code_dtype(len(dictionary))), dictionary)
+
+
+def _encode_strings(values: Sequence[str]) -> _Column:
+    """Dictionary-encode a column of strings."""
+    dictionary, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return _dictionary_column(dictionary.tolist(), codes)
+
+
+def _encode_numbers(
+    numbers: np.ndarray, render: str, prefixes: Optional[np.ndarray] = None
+) -> _Column:
+    """
+    Dictionary-encode a string column rendered from integers.
+
+    Only distinct values are rendered, so the cost of building the
+    dictionary does not grow with the number of rows.
+
+    Args:
+        numbers: Integer behind every row
+        render: Format of an entry, given the integer (and its prefix)
+        prefixes: Optional string per integer, indexed by ``numbers % len``
+
+    Returns:
+        Encoded column
+    """
+    distinct, codes = np.unique(numbers, return_inverse=True)
+    if prefixes is None:
+        dictionary = [render.format(number) for number in distinct.tolist()]
+    else:
+        dictionary = [
+            render.format(number // len(prefixes), prefixes[number % len(prefixes)])
+            for number in distinct.tolist()
+        ]
+    return _dictionary_column(dictionary, codes)
+
+
+def _batch_columns(batch: InvoiceBatch) -> Dict[str, _Column]:
+    """Encode a generated batch straight from its column arrays."""
+    corpus = batch.corpus
+    abbreviations, abbreviation_codes = np.unique(
+        corpus.abbreviations, return_inverse=True
+    )
+    # Faker can draw the same name twice, so the corpus is deduplicated first
+    names, name_codes = np.unique(corpus.names, return_inverse=True)
+    clients, client_codes = np.unique(name_codes[batch.companies], return_inverse=True)
+    # One integer per distinct (id number, abbreviation) pair
+    id_keys = (
+        batch.id_numbers * len(abbreviations) + abbreviation_codes[batch.companies]
+    )
+    return {
+        "id": _encode_numbers(id_keys, "INV-{}-{}", abbreviations.tolist()),
+        "client": _dictionary_column(names[clients].tolist(), client_codes),
+        "amount": _Column(_narrow(batch.amounts)),
+        "risk": _Column(batch.risks.astype(np.float64)),
+        "tokenId": _encode_numbers(batch.token_numbers, "TIQ-{}"),
+        "status": _dictionary_column(list(STATUS_WEIGHTS), batch.statuses),
+    }
+
+
+def _invoice_columns(invoices: Sequence[Invoice]) -> Dict[str, _Column]:
+    """Encode a list of invoice models."""
+    return {
+        "id": _encode_strings([invoice.id for invoice in invoices]),
+        "client": _encode_strings([invoice.client for invoice in invoices]),
+        "amount": _Column(
+            _narrow(np.array([i.amount for i in invoices], dtype=np.int64))
+        ),
+        "risk": _Column(np.array([i.risk for i in invoices], dtype=np.float64)),
+        "tokenId": _encode_strings([invoice.tokenId for invoice in invoices]),
+        "status": _encode_strings([invoice.status for invoice in invoices]),
+    }
+
+
+def _pad(size: int) -> int:
+    """Round a size up to the section alignment."""
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _write_columns(
+    file: BinaryIO,
+    rows: int,
+    columns: Dict[
+        str, Tuple[np.dtype, Callable[[], Iterable[np.ndarray]], Optional[List[str]]]
+    ],
+) -> int:
+    """
+    Write a snapshot, streaming every column's values chunk by chunk.
+
+    Args:
+        file: Binary file positioned at the start of the snapshot
+        rows: Number of rows in every column
+        columns: Per field, the value dtype, a function returning the value
+            chunks in row order, and the dictionary of string columns
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    offset = _pad(_HEADER.size + len(_FIELDS) * _COLUMN.size)
+    directory, sections = [], []
+    for name in _FIELDS:
+        dtype, chunks, dictionary = columns[name]
+        dtype = dtype.newbyteorder("<")
+        values_offset, offset = offset, offset + _pad(rows * dtype.itemsize)
+        entries, dictionary_offset, text = 0, 0, b""
+        if dictionary is not None:
+            encoded = [entry.encode() for entry in dictionary]
+            ends = np.cumsum([len(entry) for entry in encoded], dtype="<u8")
+            entries, dictionary_offset = len(encoded), offset
+            text = ends.tobytes() + b"".join(encoded)
+            offset += _pad(len(text))
+        sections.append((dtype, chunks, text))
+        directory.append(
+            _COLUMN.pack(
+                name.encode(),
+                dtype.str.encode(),
+                values_offset,
+                entries,
+                dictionary_offset,
+                len(text) - entries * 8,
+            )
+        )
+
+    def pad(size: int) -> None:
+        file.write(bytes(_pad(size) - size))
+
+    file.write(_HEADER.pack(_MAGIC, _VERSION, len(_FIELDS), rows))
+    file.write(b"".join(directory))
+    pad(_HEADER.size + len(_FIELDS) * _COLUMN.size)
+    for dtype, chunks, text in sections:
+        for chunk in chunks():
+            file.write(chunk.astype(dtype, copy=False).tobytes())
+        pad(rows * dtype.itemsize)
+        if text:
+            file.write(text)
+            pad(len(text))
+    return offset
+
+
+def encode_snapshot(invoices: Union[InvoiceBatch, Sequence[Invoice]]) -> bytes:
+    """
+    Encode invoices as a columnar snapshot.
+
+    The snapshot is a header, a directory with one entry per column, then
+    the column sections. ``amount`` and ``risk`` are stored as int32 (int64
+    if an amount does not fit) and float64 arrays; ``id``, ``client``,
+    ``tokenId`` and ``status`` as an array of codes (uint8 to uint32, the
+    narrowest that fits) into a dictionary of their distinct values. A
+    dictionary is stored as the end offset of every entry (uint64s)
+    followed by the UTF-8 text. Everything is little-endian and every
+    section is 8-byte aligned.
+
+    Args:
+        invoices: Generated batch or list of Invoice models
+
+    Returns:
+        Encoded snapshot
+    """
+    if isinstance(invoices, InvoiceBatch):
+        columns = _batch_columns(invoices)
+    else:
+        columns = _invoice_columns(invoices)
+    buffer = io.BytesIO()
+    _write_columns(
+        buffer,
+        len(columns["amount"].values),
+        {
+            name: (
+                values.dtype,
+                lambda values=values: [values],
+                None if dictionary is None else list(dictionary),
+            )
+            for name, (values, dictionary) in columns.items()
+        },
+    )
+    return buffer.getvalue()
+
+
+def merge_snapshots(paths: Sequence[str], path: str) -> int:
+    """
+    Concatenate snapshots, in order, into one snapshot file.
+
+    Dictionaries are merged into the sorted union of the parts' entries and
+    every part's codes are remapped into it, so the result only depends on
+    the rows, not on how they were split into parts. Columns are streamed
+    part by part; only one part's column is remapped in memory at a time.
+
+    Args:
+        paths: Snapshot files, in row order (at least one)
+        path: Snapshot file to write
+
+    Returns:
+        Size of the file in bytes
+    """
+    parts = [InvoiceSnapshot(part) for part in paths]
+    columns = {}
+    for name in _FIELDS:
+        if parts[0].is_dictionary(name):
+            dictionary = sorted(set().union(*(part.dictionary(name) for part in parts)))
+            dtype = _code_dtype(len(dictionary))
+            index = {entry: code for code, entry in enumerate(dictionary)}
+            remaps = [
+                np.array([index[entry] for entry in part.dictionary(name)], dtype=dtype)
+                for part in parts
+            ]
+
+            def chunks(name=name, remaps=remaps):
+                for part, remap in zip(parts, remaps):
+                    yield remap[part.column(name)]
+
+            columns[name] = (dtype, chunks, dictionary)
+        else:
+            dtype = np.result_type(*(part.column(name).dtype for part in parts))
+
+            def chunks(name=name):
+                for part in parts:
+                    yield part.column(name)
+
+            columns[name] = (dtype, chunks, None)
+    with open(path, "wb") as file:
+        return _write_columns(file, sum(len(part) for part in parts), columns)
+
+
+def write_snapshot(path: str, invoices: Union[InvoiceBatch, Sequence[Invoice]]) -> int:
+    """
+    Write invoices to a snapshot file atomically.
+
+    Args:
+        path: Snapshot file
+        invoices: Generated batch or list of Invoice models
+
+    Returns:
+        Size of the file in bytes
+    """
+    snapshot = encode_snapshot(invoices)
+    with open(path + ".part", "wb") as file:
+        file.write(snapshot)
+    os.replace(path + ".part", path)
+    return len(snapshot)
+
+
+class InvoiceSnapshot:
+    """
+    Read-only view of a snapshot file.
+
+    The file is memory-mapped and columns are NumPy arrays over the
+    mapping, so opening a snapshot reads only its header and a column scan
+    only pages in that column. Dictionaries are decoded on first use, and
+    rows are only built into Invoice models for the positions asked for.
+    """
+
+    def __init__(self, source: Union[str, bytes]):
+        """
+        Open a snapshot.
+
+        Args:
+            source: Path of a snapshot file, or an encoded snapshot
+
+        Raises:
+            ValueError: If the source is not a valid snapshot
+        """
+        if isinstance(source, (bytes, bytearray)):
+            self._buffer = np.frombuffer(source, dtype=np.uint8)
+        else:
+            self._buffer = np.memmap(source, dtype=np.uint8, mode="r")
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError("not an invoice snapshot")
+        magic, version, count, self.rows = _HEADER.unpack_from(self._buffer)
+        if magic != _MAGIC:
+            raise ValueError("not an invoice snapshot")
+        if version != _VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+        self._section(_HEADER.size, count * _COLUMN.size)
+
+        self._values: Dict[str, np.ndarray] = {}
+        self._dictionaries: Dict[str, Tuple[int, int, int]] = {}
+        self._decoded: Dict[str, List[str]] = {}
+        for index in range(count):
+            name, dtype, offset, entries, dictionary_offset, text_size = (
+                _COLUMN.unpack_from(self._buffer, _HEADER.size + index * _COLUMN.size)
+            )
+            name = name.rstrip(b"\x00").decode()
+            dtype = np.dtype(dtype.rstrip(b"\x00").decode())
+            self._values[name] = self._section(offset, self.rows * dtype.itemsize).view(
+                dtype
+            )
+            if dictionary_offset:
+                self._dictionaries[name] = (entries, dictionary_offset, text_size)
+        if set(self._values) != set(_FIELDS):
+            raise ValueError("snapshot columns do not match the invoice schema")
+
+    def _section(self, offset: int, size: int) -> np.ndarray:
+        """Return a bounds-checked byte range of the file."""
+        if offset + size > len(self._buffer):
+            raise ValueError("truncated invoice snapshot")
+        return self._buffer[offset : offset + size]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a column without copying it.
+
+        Args:
+            name: Invoice field
+
+        Returns:
+            Read-only array over the file: the values of plain columns, the
+            dictionary codes of string columns
+        """
+        return self._values[name]
+
+    def is_dictionary(self, name: str) -> bool:
+        """Whether a column is dictionary-encoded."""
+        return name in self._dictionaries
+
+    def dictionary(self, name: str) -> List[str]:
+        """
+        Get the distinct values of a string column, indexed by code.
+
+        Args:
+            name: Invoice field
+
+        Returns:
+            Dictionary entries
+        """
+        if name not in self._decoded:
+            entries, offset, text_size = self._dictionaries[name]
+            ends = self._section(offset, entries * 8).view("<u8").tolist()
+            text = self._section(offset + entries * 8, text_size).tobytes()
+            starts = [0] + ends[:-1]
+            self._decoded[name] = [
+                text[start:end].decode() for start, end in zip(starts, ends)
+            ]
+        return self._decoded[name]
+
+    def values(
+        self, name: str, start: int = 0, stop: Optional[int] = None
+    ) -> List[Union[str, int, float]]:
+        """
+        Get the decoded values of rows ``start`` to ``stop - 1`` of a column.
+
+        Args:
+            name: Invoice field
+            start: First row
+            stop: Row after the last (the end if None)
+
+        Returns:
+            Python values of the rows
+        """
+        values = self._values[name][start:stop].tolist()
+        if name not in self._dictionaries:
+            return values
+        dictionary = self.dictionary(name)
+        return [dictionary[code] for code in values]
+
+    def to_invoices(self, start: int = 0, stop: Optional[int] = None) -> List[Invoice]:
+        """
+        Materialize rows ``start`` to ``stop - 1`` as Invoice models.
+
+        Args:
+            start: First row
+            stop: Row after the last (the end if None)
+
+        Returns:
+            List of Invoice objects
+        """
+        return [
+            Invoice(
+                id=invoice_id,
+                client=client,
+                amount=amount,
+                risk=risk,
+                tokenId=token_id,
+                status=status,
+            )
+            for invoice_id, client, amount, risk, token_id, status in zip(
+                *(self.values(name, start, stop) for name in _FIELDS)
+            )
+        ]
+
+    def __getitem__(self, index: int) -> Invoice:
+        if not -self.rows <= index < self.rows:
+            raise IndexError("invoice index out of range")
+        index %= self.rows
+        return self.to_invoices(index, index + 1)[0]
@@ -0,0 +1,153 @@
+"""
+Per-worker fan-out of agent log updates to push subscribers.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from app.constants.agent_logs_constants import STREAM_POLL_SECONDS
+from app.core.logging import get_logger
+from app.services.agent_logs_service import AgentLogsService
+
+logger = get_logger(__name__)
+
+
+class LogSubscription:
+    """
+    Mailbox of one push subscriber, holding only the latest dataset.
+
+    Every update is a full snapshot of the ticker, so a consumer that has
+    not taken the previous one yet just gets the newer one instead: slow
+    consumers are coalesced and never make the producer wait or buffer.
+    """
+
+    def __init__(self) -> None:
+        self._latest: Optional[bytes] = None
+        self._ready = asyncio.Event()
+        self.coalesced = 0
+
+    def offer(self, dataset: bytes) -> None:
+        """Replace the pending update, if any, with a newer one."""
+        if self._latest is not None:
+            self.coalesced += 1
+        self._latest = dataset
+        self._ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Wait for the next update.
+
+        Args:
+            timeout: Seconds to wait at most (forever if None)
+
+        Returns:
+            Latest dataset, or None if nothing arrived within ``timeout``
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        dataset, self._latest = self._latest, None
+        self._ready.clear()
+        return dataset
+
+
+class LogBroadcaster:
+    """
+    Single producer polling the agent log dataset for every connected client.
+
+    However many ticker screens are connected to a worker, the worker reads
+    the log window once every ``interval`` seconds (a ready snapshot of the
+    in-memory log ring, without Redis) and pushes it to every subscription
+    only when it changed.
+    The producer runs only while there are subscribers, and a new
+    subscriber immediately gets the last known dataset.
+    """
+
+    def __init__(self, interval: float = STREAM_POLL_SECONDS):
+        self.interval = interval
+        self._subscriptions: Set[LogSubscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._latest: Optional[bytes] = None
+        self.polls = 0
+        self.publishes = 0
+        self.failures = 0
+
+    def subscribe(self) -> LogSubscription:
+        """
+        Register a subscriber, starting the producer if it is the first one.
+
+        Returns:
+            Subscription to read updates from
+        """
+        subscription = LogSubscription()
+        self._subscriptions.add(subscription)
+        if self._latest is not None:
+            subscription.offer(self._latest)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription) -> None:
+        """Remove a subscriber, stopping the producer after the last one."""
+        self._subscriptions.discard(subscription)
+        if not self._subscriptions and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, dataset: bytes) -> None:
+        """Push a dataset to every subscriber if it differs from the last one."""
+        if dataset == self._latest:
+            return
+        self._latest = dataset
+        self.publishes += 1
+        for subscription in self._subscriptions:
+            subscription.offer(dataset)
+
+    async def poll(self) -> None:
+        """Read the dataset once and publish it if it changed."""
+        self.polls += 1
+        try:
+            dataset = await AgentLogsService.get_agent_logs_dataset_async()
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Agent log stream poll failed: {str(e)}")
+            return
+        self.publish(dataset)
+
+    async def _run(self) -> None:
+        """Poll until cancelled."""
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.interval)
+
+    async def stop(self) -> None:
+        """Stop the producer; subscribers are left to their connections."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get push stream statistics for this worker.
+
+        Returns:
+            Dictionary with subscriber, poll and publish counters
+        """
+        return {
+            "subscribers": len(self._subscriptions),
+            "polls": self.polls,
+            "publishes": self.publishes,
+            "failures": self.failures,
+            "coalesced": sum(
+                subscription.coalesced for subscription in self._subscriptions
+            ),
+        }
+
+
+# Per-worker producer shared by every SSE and WebSocket subscriber
+log_broadcaster = LogBroadcaster()
@@ -4,7 +4,7 @@ Service for Producta-related functionality.
 
 from app.core.logging import get_logger
 from app.schemas.producta_schemas import ProductaStatus
-from app.services.caching_service import redis_cache
+from app.services.caching_service import async_redis_cache, redis_cache
 
 logger = get_logger(__name__)
 
@@ -42,5 +42,58 @@ class ProductaService:
         updated_status = ProductaStatus(
             status=status_update.status,
         )
-        redis_cache.set(cls._cache_key, updated_status.status, cls._cache_ttl)
+        redis_cache.set(
+            cls._cache_key, updated_status.status, cls._cache_ttl, broadcast=True
+        )
         return updated_status
+
+    @classmethod
+    async def get_status_async(cls) -> ProductaStatus:
+        """Get status for a Producta ID, awaiting the asyncio Redis client."""
+        cache_key = cls._cache_key
+        # Served from the local tier; PATCHes evict it on every worker. Misses
+        # read the primary: a lagging replica could return the status from
+        # before a PATCH, which would then be held locally for its whole TTL
+        cached_status, _ = await async_redis_cache.get_raw_with_ttl(
+            cache_key, primary=True
+        )
+        if cached_status is None:
+            await async_redis_cache.set(cache_key, "processing", cls._cache_ttl)
+            return ProductaStatus(
+                status="processing",
+            )
+        # Convert bytes to string if needed
+        status_value = (
+            cached_status.decode("utf-8")
+            if isinstance(cached_status, bytes)
+            else cached_status
+        )
+        return ProductaStatus(
+            status=status_value,
+        )
+
+    @classmethod
+    async def update_status_async(cls, status_update: ProductaStatus) -> ProductaStatus:
+        """Update status for agent Producta, awaiting the asyncio Redis client."""
+
+        updated_status = ProductaStatus(
+            status=status_update.status,
+        )
+        await async_redis_cache.set(
+            cls._cache_key, updated_status.status, cls._cache_ttl, broadcast=True
+        )
+        return updated_status
+
+    @classmethod
+    async def warm_status_async(cls) -> bool:
+        """
+        Seed the default status if the key has expired.
+
+        Uses SET NX, so a status set by a PATCH is never overwritten.
+
+        Returns:
+            True if the default status was written
+        """
+        return await async_redis_cache.set_if_absent(
+            cls._cache_key, "processing", cls._cache_ttl
+        )
@@ -0,0 +1,307 @@
+"""
+Read-through caching with stale-while-revalidate refreshes.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from app.constants.cache_constants import (
+    REFRESH_LEASE_MILLISECONDS,
+    REFRESH_MAX_WORKERS,
+)
+from app.core.logging import get_logger
+from app.core.single_flight import SingleFlight
+from app.errors.cache_errors import CacheConnectionError, CacheOperationError
+from app.services.caching_service import (
+    async_redis_cache,
+    local_cache,
+    raw_tier,
+    redis_cache,
+)
+
+logger = get_logger(__name__)
+
+
+class ReadThroughCache:
+    """
+    Read-through JSON cache shared by the data services.
+
+    Entries live in Redis for their full (hard) TTL but are due for refresh
+    once they are older than their soft TTL. A stale entry is still served
+    while a background refresh runs, and only the replica that wins the
+    Redis lease recomputes it. Cold misses are computed inline, coalesced
+    per worker.
+
+    Cache failures never fail the request: while Redis is unreachable the
+    last-known-good value from the local tier is served, or the value is
+    computed locally and kept there until Redis is back.
+    """
+
+    _inflight = SingleFlight()
+    _executor = ThreadPoolExecutor(
+        max_workers=REFRESH_MAX_WORKERS, thread_name_prefix="cache-refresh"
+    )
+    _lock = threading.Lock()
+    _next_attempt: Dict[str, float] = {}
+    _tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def _claim_refresh(cls, key: str) -> bool:
+        """
+        Allow one refresh attempt per key per lease period on this worker.
+
+        Args:
+            key: Cache key due for refresh
+
+        Returns:
+            True if the caller should start a refresh
+        """
+        now = time.monotonic()
+        with cls._lock:
+            # Every claim lasts one lease period, so claims expire in insertion
+            # order: dropping expired ones from the front keeps the map bounded
+            # by the keys refreshed within one lease period
+            while cls._next_attempt:
+                oldest = next(iter(cls._next_attempt))
+                if cls._next_attempt[oldest] > now:
+                    break
+                del cls._next_attempt[oldest]
+            if key in cls._next_attempt:
+                return False
+            cls._next_attempt[key] = now + REFRESH_LEASE_MILLISECONDS / 1000
+            return True
+
+    @classmethod
+    def _local_tier(cls, key: str) -> Any:
+        """Return the in-host tier holding last-known-good values for a key."""
+        return local_cache
+
+    @classmethod
+    def _lookup(cls, key: str, min_ttl: float) -> Tuple[Any, Optional[float]]:
+        """Read a value and its remaining TTL from the cache."""
+        return redis_cache.get_json_with_ttl(key, min_ttl)
+
+    @classmethod
+    def _store(cls, key: str, value: Any, ttl: int) -> None:
+        """Write a value to the cache."""
+        redis_cache.set_json(key, value, ttl)
+
+    @classmethod
+    async def _lookup_async(
+        cls, key: str, min_ttl: float
+    ) -> Tuple[Any, Optional[float]]:
+        """Read a value and its remaining TTL with the asyncio client."""
+        return await async_redis_cache.get_json_with_ttl(key, min_ttl)
+
+    @classmethod
+    async def _store_async(cls, key: str, value: Any, ttl: int) -> None:
+        """Write a value with the asyncio client."""
+        await async_redis_cache.set_json(key, value, ttl)
+
+    @classmethod
+    def get_or_compute(
+        cls, key: str, compute: Callable[[], Any], ttl: int, soft_ttl: int
+    ) -> Any:
+        """
+        Get a JSON value from cache, computing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Function producing the JSON-serializable value
+            ttl: Hard time to live in seconds
+            soft_ttl: Age in seconds after which the value is refreshed
+
+        Returns:
+            Cached or freshly computed value
+        """
+        stale_window = ttl - soft_ttl
+        try:
+            value, remaining = cls._lookup(key, stale_window)
+        except (CacheConnectionError, CacheOperationError):
+            return cls._fail_open(key, compute, ttl)
+
+        if value:
+            if remaining <= stale_window and cls._claim_refresh(key):
+                logger.debug(f"Serving stale {key}, refreshing in background")
+                cls._executor.submit(cls._refresh, key, compute, ttl)
+            else:
+                logger.debug(f"Cache hit for {key}")
+            return value
+
+        logger.debug(f"Cache miss for {key}, computing")
+        return cls._inflight.do(key, lambda: cls._compute_and_store(key, compute, ttl))
+
+    @classmethod
+    def _compute_and_store(cls, key: str, compute: Callable[[], Any], ttl: int) -> Any:
+        """Compute a value and write it to the cache."""
+        value = compute()
+        try:
+            cls._store(key, value, ttl)
+        except (CacheConnectionError, CacheOperationError):
+            logger.warning(f"Could not cache {key}, keeping it locally")
+            cls._local_tier(key).set(key, value, ttl)
+        return value
+
+    @classmethod
+    def _fail_open(cls, key: str, compute: Callable[[], Any], ttl: int) -> Any:
+        """Serve a value without Redis: last-known-good, else computed locally."""
+        value = cls._local_tier(key).get_stale(key)
+        if value:
+            logger.debug(f"Cache unavailable, serving last-known-good {key}")
+            return value
+
+        logger.debug(f"Cache unavailable, computing {key} locally")
+        return cls._inflight.do(key, lambda: cls._compute_locally(key, compute, ttl))
+
+    @classmethod
+    def _compute_locally(cls, key: str, compute: Callable[[], Any], ttl: int) -> Any:
+        """Compute a value and keep it in the local tier only."""
+        value = compute()
+        cls._local_tier(key).set(key, value, ttl)
+        return value
+
+    @classmethod
+    def _refresh(cls, key: str, compute: Callable[[], Any], ttl: int) -> None:
+        """Recompute a stale value if this replica wins the lease."""
+        try:
+            token = redis_cache.acquire_lease(key, REFRESH_LEASE_MILLISECONDS)
+            if token is None:
+                logger.debug(f"Refresh of {key} is leased by another replica")
+                return
+            try:
+                cls._inflight.do(key, lambda: cls._compute_and_store(key, compute, ttl))
+            finally:
+                redis_cache.release_lease(key, token)
+        except Exception as e:
+            logger.error(f"Background refresh failed for key {key}: {str(e)}")
+
+    @classmethod
+    async def get_or_compute_async(
+        cls, key: str, compute: Callable[[], Any], ttl: int, soft_ttl: int
+    ) -> Any:
+        """
+        Get a JSON value from cache with the asyncio client, computing on a miss.
+
+        Args:
+            key: Cache key
+            compute: Function producing the JSON-serializable value
+            ttl: Hard time to live in seconds
+            soft_ttl: Age in seconds after which the value is refreshed
+
+        Returns:
+            Cached or freshly computed value
+        """
+        stale_window = ttl - soft_ttl
+        try:
+            value, remaining = await cls._lookup_async(key, stale_window)
+        except (CacheConnectionError, CacheOperationError):
+            return await cls._fail_open_async(key, compute, ttl)
+
+        if value:
+            if remaining <= stale_window and cls._claim_refresh(key):
+                logger.debug(f"Serving stale {key}, refreshing in background")
+                task = asyncio.create_task(cls._refresh_async(key, compute, ttl))
+                # Keep a reference so the task is not garbage collected
+                cls._tasks.add(task)
+                task.add_done_callback(cls._tasks.discard)
+            else:
+                logger.debug(f"Cache hit for {key}")
+            return value
+
+        logger.debug(f"Cache miss for {key}, computing")
+        return await cls._inflight.do_async(
+            key, lambda: cls._compute_and_store_async(key, compute, ttl)
+        )
+
+    @classmethod
+    async def _compute_and_store_async(
+        cls, key: str, compute: Callable[[], Any], ttl: int
+    ) -> Any:
+        """Compute a value and write it with the asyncio client."""
+        value = compute()
+        try:
+            await cls._store_async(key, value, ttl)
+        except (CacheConnectionError, CacheOperationError):
+            logger.warning(f"Could not cache {key}, keeping it locally")
+            cls._local_tier(key).set(key, value, ttl)
+        return value
+
+    @classmethod
+    async def _fail_open_async(
+        cls, key: str, compute: Callable[[], Any], ttl: int
+    ) -> Any:
+        """Serve a value without Redis: last-known-good, else computed locally."""
+        value = cls._local_tier(key).get_stale(key)
+        if value:
+            logger.debug(f"Cache unavailable, serving last-known-good {key}")
+            return value
+
+        logger.debug(f"Cache unavailable, computing {key} locally")
+
+        async def compute_locally() -> Any:
+            return cls._compute_locally(key, compute, ttl)
+
+        return await cls._inflight.do_async(key, compute_locally)
+
+    @classmethod
+    async def _refresh_async(
+        cls, key: str, compute: Callable[[], Any], ttl: int
+    ) -> None:
+        """Recompute a stale value if this replica wins the lease."""
+        try:
+            token = await async_redis_cache.acquire_lease(
+                key, REFRESH_LEASE_MILLISECONDS
+            )
+            if token is None:
+                logger.debug(f"Refresh of {key} is leased by another replica")
+                return
+            try:
+                await cls._inflight.do_async(
+                    key, lambda: cls._compute_and_store_async(key, compute, ttl)
+                )
+            finally:
+                await async_redis_cache.release_lease(key, token)
+        except Exception as e:
+            logger.error(f"Background refresh failed for key {key}: {str(e)}")
+
+
+class ReadThroughBodyCache(ReadThroughCache):
+    """
+    Read-through cache for pre-rendered JSON response bodies.
+
+    Values are the final response bytes: they are stored in Redis and the
+    local tier as-is, so a hit can be returned to the client without
+    parsing, validating or re-serializing it. Keys must not also be used
+    with ReadThroughCache, which stores decoded values locally. Bodies under
+    the shared-tier prefixes are kept once per host instead of per worker.
+    """
+
+    @classmethod
+    def _local_tier(cls, key: str) -> Any:
+        """Return the in-host tier holding last-known-good bodies for a key."""
+        return raw_tier(key)
+
+    @classmethod
+    def _lookup(cls, key: str, min_ttl: float) -> Tuple[Any, Optional[float]]:
+        """Read a response body and its remaining TTL from the cache."""
+        return redis_cache.get_raw_with_ttl(key, min_ttl)
+
+    @classmethod
+    def _store(cls, key: str, value: Any, ttl: int) -> None:
+        """Write a response body to the cache."""
+        redis_cache.set_raw(key, value, ttl)
+
+    @classmethod
+    async def _lookup_async(
+        cls, key: str, min_ttl: float
+    ) -> Tuple[Any, Optional[float]]:
+        """Read a response body and its remaining TTL with the asyncio client."""
+        return await async_redis_cache.get_raw_with_ttl(key, min_ttl)
+
+    @classmethod
+    async def _store_async(cls, key: str, value: Any, ttl: int) -> None:
+        """Write a response body with the asyncio client."""
+        await async_redis_cache.set_raw(key, value, ttl)
@@ -0,0 +1,281 @@
+"""
+Redis connection management: pooling, TLS, replica routing and hedged reads.
+"""
+
+import asyncio
+import itertools
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import RedisSettings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class RedisConnectionManager:
+    """
+    Builds and owns the pooled Redis clients used by the cache services.
+
+    Writes always go to the primary endpoint. Reads are spread round-robin
+    over the configured read replicas, or sent to the primary if there are
+    none. With hedged reads enabled, a read that has not answered within the
+    hedge delay is raced against a second endpoint and the first successful
+    reply wins, so a single slow node does not set the tail latency.
+    """
+
+    def __init__(self, settings: Optional[RedisSettings] = None):
+        self.settings = settings or RedisSettings()
+        self._lock = threading.Lock()
+        self._read_counter = itertools.count()
+        self._primary: Optional[redis.Redis] = None
+        self._replicas: Optional[List[redis.Redis]] = None
+        self._async_primary: Optional[aioredis.Redis] = None
+        self._async_replicas: Optional[List[aioredis.Redis]] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def _pool_kwargs(self, host: str, port: int, use_asyncio: bool) -> Dict[str, Any]:
+        """
+        Build connection pool arguments for an endpoint.
+
+        Args:
+            host: Redis host
+            port: Redis port
+            use_asyncio: Whether the pool is for the redis.asyncio client
+
+        Returns:
+            Keyword arguments for a BlockingConnectionPool
+        """
+        settings = self.settings
+        kwargs: Dict[str, Any] = {
+            "host": host,
+            "port": port,
+            "db": settings.redis_db,
+            "password": settings.redis_password or None,
+            "max_connections": settings.redis_connection_pool_size,
+            # How long to wait for a free pooled connection
+            "timeout": settings.redis_connection_timeout,
+            "socket_timeout": settings.redis_connection_timeout,
+            "socket_connect_timeout": settings.redis_connection_timeout,
+        }
+        if settings.elasticache_tls_enabled:
+            kwargs["connection_class"] = (
+                aioredis.SSLConnection if use_asyncio else redis.SSLConnection
+            )
+            if settings.elasticache_ssl_cert_reqs:
+                kwargs["ssl_cert_reqs"] = settings.elasticache_ssl_cert_reqs
+        return kwargs
+
+    def _build_client(self, host: str, port: int) -> redis.Redis:
+        """Create a pooled sync client for an endpoint."""
+        pool = redis.BlockingConnectionPool(**self._pool_kwargs(host, port, False))
+        return redis.Redis(connection_pool=pool)
+
+    def _build_async_client(self, host: str, port: int) -> aioredis.Redis:
+        """Create a pooled asyncio client for an endpoint."""
+        pool = aioredis.BlockingConnectionPool(**self._pool_kwargs(host, port, True))
+        return aioredis.Redis(connection_pool=pool)
+
+    def primary(self) -> redis.Redis:
+        """Get the sync client for the primary (write) endpoint."""
+        with self._lock:
+            if self._primary is None:
+                self._primary = self._build_client(
+                    self.settings.redis_host, self.settings.redis_port
+                )
+            return self._primary
+
+    def replicas(self) -> List[redis.Redis]:
+        """Get the sync clients for the read-replica endpoints."""
+        with self._lock:
+            if self._replicas is None:
+                self._replicas = [
+                    self._build_client(host, port)
+                    for host, port in self.settings.replica_endpoints
+                ]
+            return self._replicas
+
+    def async_primary(self) -> aioredis.Redis:
+        """Get the asyncio client for the primary (write) endpoint."""
+        with self._lock:
+            if self._async_primary is None:
+                self._async_primary = self._build_async_client(
+                    self.settings.redis_host, self.settings.redis_port
+                )
+            return self._async_primary
+
+    def async_replicas(self) -> List[aioredis.Redis]:
+        """Get the asyncio clients for the read-replica endpoints."""
+        with self._lock:
+            if self._async_replicas is None:
+                self._async_replicas = [
+                    self._build_async_client(host, port)
+                    for host, port in self.settings.replica_endpoints
+                ]
+            return self._async_replicas
+
+    @property
+    def has_replicas(self) -> bool:
+        """Whether any read replicas are configured."""
+        return bool(self.settings.replica_endpoints)
+
+    def _pick(self, primary: Any, replicas: List[Any]) -> Tuple[Any, Optional[Any]]:
+        """
+        Choose the endpoint for a read and a backup to hedge against.
+
+        Args:
+            primary: Client for the primary endpoint
+            replicas: Clients for the read replicas
+
+        Returns:
+            Tuple of the first client to read from and the hedge client
+            (None if there is nothing to hedge against)
+        """
+        if not replicas:
+            return primary, None
+        index = next(self._read_counter)
+        first = replicas[index % len(replicas)]
+        second = replicas[(index + 1) % len(replicas)] if len(replicas) > 1 else primary
+        return first, second
+
+    @property
+    def _hedge_delay(self) -> float:
+        """Hedge delay in seconds."""
+        return self.settings.redis_hedge_delay_ms / 1000
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used to race sync hedged reads."""
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.settings.redis_connection_pool_size,
+                    thread_name_prefix="redis-hedge",
+                )
+            return self._hedge_executor
+
+    def read(self, command: Callable[[redis.Redis], T]) -> T:
+        """
+        Run a read command against a replica, hedging if configured.
+
+        Args:
+            command: Function issuing the read on the given client
+
+        Returns:
+            Result of the first successful read
+        """
+        first, second = self._pick(self.primary(), self.replicas())
+        if second is None or not self.settings.redis_hedged_reads:
+            return command(first)
+
+        executor = self._executor()
+        first_future = executor.submit(command, first)
+        try:
+            return first_future.result(timeout=self._hedge_delay)
+        except FuturesTimeoutError:
+            pass
+
+        # The first endpoint is slow: race a second one
+        self.hedges_fired += 1
+        second_future = executor.submit(command, second)
+        pending = {first_future, second_future}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second_future:
+                        self.hedges_won += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def read_async(self, command: Callable[[aioredis.Redis], Awaitable[T]]) -> T:
+        """
+        Await a read command against a replica, hedging if configured.
+
+        Args:
+            command: Coroutine function issuing the read on the given client
+
+        Returns:
+            Result of the first successful read
+        """
+        first, second = self._pick(self.async_primary(), self.async_replicas())
+        if second is None or not self.settings.redis_hedged_reads:
+            return await command(first)
+
+        first_task = asyncio.ensure_future(command(first))
+        done, _ = await asyncio.wait({first_task}, timeout=self._hedge_delay)
+        if done:
+            return first_task.result()
+
+        # The first endpoint is slow: race a second one
+        self.hedges_fired += 1
+        second_task = asyncio.ensure_future(command(second))
+        pending = {first_task, second_task}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is second_task:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get routing and hedging counters.
+
+        Returns:
+            Dictionary of connection manager counters
+        """
+        return {
+            "replicas": len(self.settings.replica_endpoints),
+            "hedged_reads": self.settings.redis_hedged_reads,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+        }
+
+    def close(self) -> None:
+        """Disconnect every sync pool."""
+        with self._lock:
+            clients = [self._primary, *(self._replicas or [])]
+            self._primary = None
+            self._replicas = None
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+        for client in clients:
+            if client is not None:
+                client.connection_pool.disconnect()
+
+    async def aclose(self) -> None:
+        """Disconnect every asyncio pool."""
+        with self._lock:
+            clients = [self._async_primary, *(self._async_replicas or [])]
+            self._async_primary = None
+            self._async_replicas = None
+        for client in clients:
+            if client is not None:
+                await client.aclose(close_connection_pool=True)
+
+
+# Shared by the sync and async cache services
+redis_connections = RedisConnectionManager()
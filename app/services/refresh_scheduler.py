@@ -0,0 +1,218 @@
+"""
+Background refresh of cached datasets ahead of their expiry.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.constants.cache_constants import (
+    REFRESH_AHEAD_SECONDS,
+    REFRESH_SCHEDULER_ENABLED,
+    REFRESH_SCHEDULER_LEASE_KEY,
+    REFRESH_SCHEDULER_LEASE_MILLISECONDS,
+    REFRESH_SCHEDULER_TICK_SECONDS,
+)
+from app.constants.invoice_constants import (
+    CACHE_SOFT_TTL_SECONDS as INVOICES_SOFT_TTL_SECONDS,
+)
+from app.core.logging import get_logger
+from app.errors.cache_errors import CacheConnectionError, CacheOperationError
+from app.services.caching_service import async_redis_cache
+from app.services.invoice_service import InvoiceService
+from app.services.producta_service import ProductaService
+from app.services.treasury_service import (
+    TREASURY_METRICS_CACHE_SOFT_TTL,
+    TreasuryService,
+)
+
+logger = get_logger(__name__)
+
+
+class ScheduledDataset:
+    """A cached dataset rewritten by the scheduler every ``interval`` seconds."""
+
+    def __init__(
+        self, name: str, refresh: Callable[[], Awaitable[Any]], interval: float
+    ):
+        self.name = name
+        self.refresh = refresh
+        self.interval = interval
+        self.next_run = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.last_duration: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_duration": self.last_duration,
+        }
+
+
+class RefreshScheduler:
+    """
+    Leader-elected background task keeping registered datasets warm.
+
+    Every worker runs the loop, but only the one holding the Redis lease
+    ``lease_key`` does any work; it renews the lease on every tick and
+    another worker takes over within ``lease_ms`` if it dies. A worker that
+    becomes leader refreshes every dataset at once, which warms the cache
+    at boot, and then rewrites each one every ``interval`` seconds. The
+    intervals are shorter than the datasets' soft TTLs, so requests find
+    fresh entries instead of computing them or serving stale ones.
+
+    Redis errors never stop the loop: the worker simply does not lead until
+    Redis is reachable again, and the read-through caches keep serving.
+    """
+
+    def __init__(
+        self,
+        lease_key: str = REFRESH_SCHEDULER_LEASE_KEY,
+        lease_ms: int = REFRESH_SCHEDULER_LEASE_MILLISECONDS,
+        tick: float = REFRESH_SCHEDULER_TICK_SECONDS,
+    ):
+        self.lease_key = lease_key
+        self.lease_ms = lease_ms
+        self.tick_interval = tick
+        self._datasets: Dict[str, ScheduledDataset] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._token: Optional[str] = None
+        self.leaderships = 0
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this worker held the lease at its last tick."""
+        return self._token is not None
+
+    def register(
+        self, name: str, refresh: Callable[[], Awaitable[Any]], interval: float
+    ) -> None:
+        """
+        Register a dataset to keep warm.
+
+        Args:
+            name: Dataset name used in logs and stats
+            refresh: Coroutine function rewriting the dataset's cache entries
+            interval: Seconds between two refreshes
+        """
+        self._datasets[name] = ScheduledDataset(name, refresh, interval)
+
+    def start(self) -> None:
+        """Start the scheduler loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop and hand the lease over to another worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._token is not None:
+            token, self._token = self._token, None
+            try:
+                await async_redis_cache.release_lease(self.lease_key, token)
+            except (CacheConnectionError, CacheOperationError) as e:
+                logger.warning(f"Could not release refresh scheduler lease: {str(e)}")
+
+    async def _hold_lease(self) -> bool:
+        """
+        Renew the lease if held, otherwise try to acquire it.
+
+        Returns:
+            True if this worker is the leader for this tick
+        """
+        try:
+            if self._token is not None:
+                if await async_redis_cache.renew_lease(
+                    self.lease_key, self._token, self.lease_ms
+                ):
+                    return True
+                logger.warning("Lost refresh scheduler leadership")
+                self._token = None
+            token = await async_redis_cache.acquire_lease(self.lease_key, self.lease_ms)
+        except (CacheConnectionError, CacheOperationError) as e:
+            logger.debug(f"Refresh scheduler cannot reach Redis: {str(e)}")
+            return False
+        if token is None:
+            return False
+        self._token = token
+        self.leaderships += 1
+        logger.info("Became refresh scheduler leader, warming every dataset")
+        for dataset in self._datasets.values():
+            dataset.next_run = 0.0
+        return True
+
+    async def _refresh(self, dataset: ScheduledDataset) -> None:
+        """Refresh one dataset, retrying on the next tick if it fails."""
+        started = time.monotonic()
+        try:
+            await dataset.refresh()
+        except Exception as e:
+            dataset.failures += 1
+            logger.error(f"Scheduled refresh of {dataset.name} failed: {str(e)}")
+            return
+        dataset.runs += 1
+        dataset.last_duration = time.monotonic() - started
+        dataset.next_run = started + dataset.interval
+        logger.debug(f"Refreshed {dataset.name} in {dataset.last_duration:.3f}s")
+
+    async def tick(self) -> None:
+        """Hold the lease and refresh every dataset that is due."""
+        if not await self._hold_lease():
+            return
+        for dataset in self._datasets.values():
+            if dataset.next_run <= time.monotonic():
+                await self._refresh(dataset)
+
+    async def _run(self) -> None:
+        """Tick until cancelled."""
+        while True:
+            await self.tick()
+            await asyncio.sleep(self.tick_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics for this worker.
+
+        Returns:
+            Dictionary with leadership state and per-dataset counters
+        """
+        return {
+            "leader": self.is_leader,
+            "leaderships": self.leaderships,
+            "datasets": {
+                name: dataset.stats() for name, dataset in self._datasets.items()
+            },
+        }
+
+
+# Per-worker scheduler, started from the application lifespan
+refresh_scheduler = RefreshScheduler(
+    lease_key=os.getenv("REFRESH_SCHEDULER_LEASE_KEY", REFRESH_SCHEDULER_LEASE_KEY)
+)
+refresh_scheduler.register(
+    "invoices",
+    InvoiceService.warm_cache_async,
+    INVOICES_SOFT_TTL_SECONDS - REFRESH_AHEAD_SECONDS,
+)
+refresh_scheduler.register(
+    "treasury_metrics",
+    TreasuryService.warm_cache_async,
+    TREASURY_METRICS_CACHE_SOFT_TTL - REFRESH_AHEAD_SECONDS,
+)
+# The status is state set by PATCH, so it is only seeded once it expires
+refresh_scheduler.register(
+    "producta_status", ProductaService.warm_status_async, REFRESH_AHEAD_SECONDS
+)
+refresh_scheduler_enabled = (
+    os.getenv("REFRESH_SCHEDULER_ENABLED", str(REFRESH_SCHEDULER_ENABLED)).lower()
+    == "true"
+)
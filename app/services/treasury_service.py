@@ -4,42 +4,94 @@ Treasury service for retrieving metrics data.
 
 from app.core.logging import get_logger
 from app.schemas.treasury_schemas import TreasuryMetrics
-from app.services.caching_service import redis_cache
+from app.services.caching_service import async_redis_cache
+from app.services.read_through_service import ReadThroughBodyCache
 
 logger = get_logger(__name__)
 
 # Cache constants
 TREASURY_METRICS_CACHE_KEY = "treasury:metrics"
 TREASURY_METRICS_CACHE_TTL = 3600  # 1 hour in seconds
+TREASURY_METRICS_CACHE_SOFT_TTL = 3000  # Refresh in the background after this age
 
 
 class TreasuryService:
     """Service for Treasury related operations."""
 
     @staticmethod
-    def get_treasury_metrics() -> TreasuryMetrics:
+    def _render_metrics() -> bytes:
         """
-        Get treasury metrics (TVL and APY).
+        Produce treasury metrics as a rendered JSON response body.
 
         Currently returns constant values. In a real implementation,
         this would fetch data from a database or external service.
 
+        Returns:
+            JSON-encoded treasury metrics
+        """
+        metrics = TreasuryMetrics(tvl=1480000, apy=9.2)
+        logger.info("Generated new treasury metrics")
+        return metrics.model_dump_json().encode("utf-8")
+
+    @staticmethod
+    def get_treasury_metrics_body() -> bytes:
+        """
+        Get treasury metrics as a pre-rendered JSON body with caching.
+
+        Returns:
+            JSON-encoded treasury metrics, ready to send as a response
+        """
+        return ReadThroughBodyCache.get_or_compute(
+            TREASURY_METRICS_CACHE_KEY,
+            TreasuryService._render_metrics,
+            TREASURY_METRICS_CACHE_TTL,
+            TREASURY_METRICS_CACHE_SOFT_TTL,
+        )
+
+    @staticmethod
+    async def get_treasury_metrics_body_async() -> bytes:
+        """
+        Get treasury metrics as a pre-rendered JSON body, awaiting the asyncio client.
+
+        Returns:
+            JSON-encoded treasury metrics, ready to send as a response
+        """
+        return await ReadThroughBodyCache.get_or_compute_async(
+            TREASURY_METRICS_CACHE_KEY,
+            TreasuryService._render_metrics,
+            TREASURY_METRICS_CACHE_TTL,
+            TREASURY_METRICS_CACHE_SOFT_TTL,
+        )
+
+    @staticmethod
+    def get_treasury_metrics() -> TreasuryMetrics:
+        """
+        Get treasury metrics (TVL and APY).
+
         Returns:
             TreasuryMetrics: Treasury metrics including TVL and APY
         """
-        # Check cache first
-        cached_data = redis_cache.get_json(TREASURY_METRICS_CACHE_KEY)
-        if cached_data:
-            logger.info("Retrieved treasury metrics from cache")
-            return TreasuryMetrics(**cached_data)
+        return TreasuryMetrics.model_validate_json(
+            TreasuryService.get_treasury_metrics_body()
+        )
 
-        # If not in cache, use constant values (in real implementation, would fetch from a source)
-        metrics = TreasuryMetrics(tvl=1480000, apy=9.2)
+    @staticmethod
+    async def get_treasury_metrics_async() -> TreasuryMetrics:
+        """
+        Get treasury metrics (TVL and APY), awaiting the asyncio Redis client.
 
-        # Cache the result
-        redis_cache.set_json(
-            TREASURY_METRICS_CACHE_KEY, metrics.model_dump(), TREASURY_METRICS_CACHE_TTL
+        Returns:
+            TreasuryMetrics: Treasury metrics including TVL and APY
+        """
+        return TreasuryMetrics.model_validate_json(
+            await TreasuryService.get_treasury_metrics_body_async()
         )
 
-        logger.info("Generated new treasury metrics")
-        return metrics
+    @staticmethod
+    async def warm_cache_async() -> None:
+        """Render and cache treasury metrics ahead of their expiry."""
+        await async_redis_cache.set_raw(
+            TREASURY_METRICS_CACHE_KEY,
+            TreasuryService._render_metrics(),
+            TREASURY_METRICS_CACHE_TTL,
+        )
@@ -2,12 +2,18 @@
 Tests for the agent logs service.
 """
 
+import datetime
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC
 from unittest.mock import patch
 
 import pytest
 
-from app.constants.agent_logs_constants import CACHE_KEY_PREFIX, CACHE_TTL_SECONDS
-from app.services.agent_logs_service import AgentLogsService
+from app.constants.agent_logs_constants import LOG_INTERVAL_SECONDS, MAX_LIMIT
+from app.core.sliced_array import slice_array
+from app.services.agent_logs_service import AgentLogsService, log_ring
 
 
 def test_generate_logs_limit():
@@ -94,7 +100,8 @@ def test_log_message_format():
 def test_invoice_log_generator():
     """Test the invoice log generator specifically."""
     # Generate 10 invoice logs
-    logs = [AgentLogsService._generate_invoice_log() for _ in range(10)]
+    rng = random.Random(0)
+    logs = [AgentLogsService._generate_invoice_log(rng) for _ in range(10)]
 
     # Verify all logs have expected format elements
     for log in logs:
@@ -107,7 +114,8 @@ def test_invoice_log_generator():
 def test_risk_log_generator():
     """Test the risk log generator specifically."""
     # Generate 10 risk logs
-    logs = [AgentLogsService._generate_risk_log() for _ in range(10)]
+    rng = random.Random(0)
+    logs = [AgentLogsService._generate_risk_log(rng) for _ in range(10)]
 
     # Verify all logs have expected format elements
     for log in logs:
@@ -120,7 +128,8 @@ def test_risk_log_generator():
 def test_funding_log_generator():
     """Test the funding log generator specifically."""
     # Generate 10 funding logs
-    logs = [AgentLogsService._generate_funding_log() for _ in range(10)]
+    rng = random.Random(0)
+    logs = [AgentLogsService._generate_funding_log(rng) for _ in range(10)]
 
     # Verify all logs have expected format elements
     for log in logs:
@@ -133,7 +142,8 @@ def test_funding_log_generator():
 def test_system_log_generator():
     """Test the system log generator specifically."""
     # Generate 10 system logs
-    logs = [AgentLogsService._generate_system_log() for _ in range(10)]
+    rng = random.Random(0)
+    logs = [AgentLogsService._generate_system_log(rng) for _ in range(10)]
 
     # Verify all logs have expected format elements
     for log in logs:
@@ -146,53 +156,39 @@ def test_system_log_generator():
     assert len(set(logs)) > 1
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_get_agent_logs_cache_miss(mock_set_json, mock_get_json):
-    """Test get_agent_logs with cache miss."""
-    # Setup cache miss
-    mock_get_json.return_value = None
-
-    # Call the method
+def test_get_agent_logs_from_ring():
+    """Test that get_agent_logs returns the newest entries of the ring."""
     logs = AgentLogsService.get_agent_logs(5)
+    newest = log_ring.current_tick()
 
-    # Verify results
     assert len(logs) == 5
     assert all(isinstance(log, str) for log in logs)
+    assert json.loads(AgentLogsService.render_log_entry(newest)) == logs[0]
+    assert json.loads(AgentLogsService.render_log_entry(newest - 4)) == logs[4]
 
-    # Verify cache interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:5")
-    mock_set_json.assert_called_once()
-
-    # Verify the right data was cached
-    cache_key = mock_set_json.call_args[0][0]
-    cache_data = mock_set_json.call_args[0][1]
-    cache_ttl = mock_set_json.call_args[0][2]
 
-    assert cache_key == f"{CACHE_KEY_PREFIX}:5"
-    assert len(cache_data) == 5
-    assert all(isinstance(log, str) for log in cache_data)
-    assert cache_ttl == CACHE_TTL_SECONDS
+def test_get_agent_logs_does_not_generate():
+    """Test that reads only slice the pre-rendered window."""
+    dataset = log_ring.snapshot()
 
+    with patch.object(log_ring, "_task", object()), patch.object(
+        log_ring, "render_entry", side_effect=AssertionError("generated")
+    ):
+        body = AgentLogsService.get_agent_logs_body(3)
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_get_agent_logs_cache_hit(mock_set_json, mock_get_json):
-    """Test get_agent_logs with cache hit."""
-    # Setup cache hit with cached values
-    cached_data = ["Log message 1", "Log message 2", "Log message 3"]
-    mock_get_json.return_value = cached_data
+    assert body == slice_array(dataset, 3)
 
-    # Call the method
-    logs = AgentLogsService.get_agent_logs(3)
 
-    # Verify results match cached data
-    assert logs == cached_data
-    assert len(logs) == 3
+def test_render_log_entry_is_pure():
+    """Test that an entry depends only on its number and stamps its due time."""
+    entries = [AgentLogsService.render_log_entry(number) for number in range(1000)]
+    number, heartbeat = next(
+        (number, entry) for number, entry in enumerate(entries) if b"heartbeat" in entry
+    )
+    due = datetime.datetime.fromtimestamp(number * LOG_INTERVAL_SECONDS, UTC)
 
-    # Verify cache interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:3")
-    mock_set_json.assert_not_called()  # Should not set cache on hit
+    assert AgentLogsService.render_log_entry(number) == heartbeat
+    assert f"{due:%Y-%m-%dT%H:%M:%S}".encode() in heartbeat
 
 
 def test_generate_logs_max_limit():
@@ -202,3 +198,31 @@ def test_generate_logs_max_limit():
 
     # Should be capped at the maximum limit
     assert len(logs) == 20
+
+
+def test_generate_logs_is_thread_safe():
+    """Test that parallel generations match a sequential one."""
+    with patch(
+        "app.services.agent_logs_service.AgentLogsService._generate_system_log",
+        return_value="System heartbeat test",
+    ):
+        expected = AgentLogsService.generate_logs(MAX_LIMIT)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda _: AgentLogsService.generate_logs(MAX_LIMIT), range(32)
+                )
+            )
+
+    assert all(logs == expected for logs in results)
+
+
+def test_generate_logs_leaves_global_random_untouched():
+    """Test that generation neither reseeds nor consumes the global generator."""
+    random.seed(99)
+    expected = random.random()
+    random.seed(99)
+
+    AgentLogsService.generate_logs(5)
+
+    assert random.random() == expected
@@ -0,0 +1,145 @@
+"""
+Tests for DataLoader-style batching.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.batch_loader import AsyncBatchLoader
+
+
+def make_loader(**kwargs):
+    """Build a loader that records the batches it receives."""
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(keys)
+        return [key * 2 for key in keys]
+
+    return AsyncBatchLoader(batch_fn, **kwargs), batches
+
+
+def test_loads_in_one_tick_are_batched():
+    """Test that loads made in the same tick share one batch call."""
+    loader, batches = make_loader()
+
+    async def run():
+        return await asyncio.gather(loader.load(1), loader.load(2), loader.load(3))
+
+    assert asyncio.run(run()) == [2, 4, 6]
+    assert batches == [[1, 2, 3]]
+
+
+def test_duplicate_keys_are_loaded_once():
+    """Test that a key requested twice in a batch is only fetched once."""
+    loader, batches = make_loader()
+
+    async def run():
+        return await loader.load_many([1, 1, 2])
+
+    assert asyncio.run(run()) == [2, 2, 4]
+    assert batches == [[1, 2]]
+
+
+def test_window_collects_later_loads():
+    """Test that a micro-window batches loads issued across several ticks."""
+    loader, batches = make_loader(window=0.02)
+
+    async def delayed(key):
+        await asyncio.sleep(0.005)
+        return await loader.load(key)
+
+    async def run():
+        return await asyncio.gather(loader.load(1), delayed(2))
+
+    assert asyncio.run(run()) == [2, 4]
+    assert batches == [[1, 2]]
+
+
+def test_max_batch_size_splits_batches():
+    """Test that full batches are dispatched immediately."""
+    loader, batches = make_loader(max_batch_size=2)
+
+    async def run():
+        return await loader.load_many([1, 2, 3])
+
+    assert asyncio.run(run()) == [2, 4, 6]
+    assert batches == [[1, 2], [3]]
+    assert loader.stats()["batches"] == 2
+
+
+def test_batch_error_reaches_every_caller():
+    """Test that an exception from the batch function is raised to each caller."""
+
+    async def batch_fn(keys):
+        raise ValueError("boom")
+
+    loader = AsyncBatchLoader(batch_fn)
+
+    async def run():
+        return await asyncio.gather(
+            loader.load(1), loader.load(2), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_batch():
+    """Test that cancelling one caller leaves the others' results intact."""
+    loader, batches = make_loader(window=0.01)
+
+    async def run():
+        first = asyncio.ensure_future(loader.load(1))
+        second = asyncio.ensure_future(loader.load(2))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == 4
+    assert batches == [[1, 2]]
+
+
+def test_cancelled_dispatch_resolves_callers():
+    """Test that cancelling an in-flight batch cancels its callers instead of hanging."""
+    started = asyncio.Event()
+
+    async def batch_fn(keys):
+        started.set()
+        await asyncio.sleep(10)
+
+    loader = AsyncBatchLoader(batch_fn)
+
+    async def run():
+        callers = asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+        await started.wait()
+        (task,) = loader._tasks
+        task.cancel()
+        results = await asyncio.wait_for(callers, 1.0)
+        await asyncio.sleep(0)
+        return results, len(loader._tasks)
+
+    results, in_flight = asyncio.run(run())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert in_flight == 0
+
+
+def test_short_batch_result_does_not_hang():
+    """Test that keys missing from the batch result are cancelled, not left pending."""
+
+    async def batch_fn(keys):
+        return [0]
+
+    loader = AsyncBatchLoader(batch_fn)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True), 1.0
+        )
+
+    first, second = asyncio.run(run())
+    assert first == 0
+    assert isinstance(second, asyncio.CancelledError)
@@ -0,0 +1,159 @@
+"""
+Tests for cache-layer instrumentation.
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import RedisError
+
+from app.core.batch_loader import AsyncBatchLoader
+from app.core.cache_metrics import CacheMetrics, Histogram, cache_metrics, key_prefix
+from app.core.sliced_array import pack_array
+from app.main import app
+from app.services.caching_service import RedisCacheService, cache_breaker, local_cache
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with empty metrics, local tier and a closed circuit."""
+    cache_metrics.reset()
+    local_cache.clear()
+    cache_breaker.reset()
+    yield
+    cache_metrics.reset()
+    local_cache.clear()
+    cache_breaker.reset()
+
+
+@pytest.fixture
+def cache_service():
+    """Sync cache service with a mocked Redis client."""
+    service = RedisCacheService()
+    original_client = service._client
+    service._client = Mock()
+    yield service
+    service._client = original_client
+
+
+def test_key_prefix():
+    """Test that limits and generations are stripped from key families."""
+    assert key_prefix("demo:invoices:50") == "demo:invoices"
+    assert key_prefix("demo:invoices:g3:50") == "demo:invoices"
+    assert key_prefix("demo:logs:generation") == "demo:logs"
+    assert key_prefix("demo:invoice-pages:g3:1234:500:50") == "demo:invoice-pages"
+    assert key_prefix("treasury:metrics") == "treasury:metrics"
+    assert key_prefix("producta:status:") == "producta:status:"
+
+
+def test_histogram_quantiles():
+    """Test that quantiles are interpolated within their bucket."""
+    histogram = Histogram([1, 2, 4])
+    for value in (0.5, 1.5, 1.5, 3, 10):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["buckets"] == [[1, 1], [2, 3], [4, 4], ["+Inf", 5]]
+    assert 1 < histogram.quantile(0.5) <= 2
+    assert histogram.quantile(0.99) == 4
+
+
+def test_lookups_record_outcomes_and_sizes(cache_service):
+    """Test that Redis hits, local hits and misses are counted per prefix."""
+    body = json.dumps([1, 2, 3]).encode()
+    pipe = cache_service._client.pipeline.return_value
+    pipe.execute.return_value = [body, 60000]
+
+    cache_service.get_json_with_ttl("demo:invoices:3")
+    cache_service.get_json_with_ttl("demo:invoices:3")
+    pipe.execute.return_value = [None, -2]
+    cache_service.get_json_with_ttl("demo:invoices:g2:7")
+
+    stats = cache_metrics.snapshot()["prefixes"]["demo:invoices"]
+    assert (stats["redis_hits"], stats["local_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["read_bytes"]["sum"] == len(body)
+    assert cache_metrics.snapshot()["commands"]["GET+PTTL"]["count"] == 2
+
+
+def test_errors_are_counted_per_prefix(cache_service):
+    """Test that failed round trips are counted against the key's prefix."""
+    cache_service._client.get.side_effect = RedisError("boom")
+
+    with pytest.raises(Exception):
+        cache_service.get("producta:status:")
+
+    assert cache_metrics.snapshot()["prefixes"]["producta:status:"]["errors"] == 1
+    assert cache_metrics.snapshot()["commands"]["GET"]["count"] == 1
+
+
+def test_request_round_trips():
+    """Test that round trips are attributed to the request that made them."""
+    metrics = CacheMetrics()
+    token = metrics.start_request()
+    metrics.observe_command("GET", 0.001)
+    metrics.observe_command("SETEX", 0.002)
+
+    assert metrics.finish_request(token) == 2
+    metrics.observe_command("GET", 0.001)
+    assert metrics.request_round_trips() == 0
+    assert metrics.round_trips.count == 1
+
+
+def test_batched_round_trip_is_charged_to_every_request():
+    """Test that one batched call counts once for each request it serves."""
+    metrics = CacheMetrics()
+
+    async def batch_fn(keys):
+        metrics.observe_command("MGET", 0.001)
+        return keys
+
+    loader = AsyncBatchLoader(batch_fn, dispatch_context=metrics.charge_requests)
+
+    async def request(*keys):
+        token = metrics.start_request()
+        await loader.load_many(keys)
+        return metrics.finish_request(token)
+
+    async def run():
+        return await asyncio.gather(request(1, 2), request(3), request())
+
+    assert asyncio.run(run()) == [1, 1, 0]
+    assert metrics.round_trips.count == 3
+
+
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.get_generation")
+def test_round_trip_header(mock_get_generation, mock_get_raw):
+    """Test that responses report the Redis round trips they needed."""
+    mock_get_generation.return_value = 0
+
+    async def get_raw(key, min_ttl):
+        cache_metrics.observe_command("GET+PTTL", 0.001)
+        return pack_array([]), 60
+
+    mock_get_raw.side_effect = get_raw
+
+    response = client.get("/invoices?limit=1")
+
+    assert response.headers["x-redis-round-trips"] == "1"
+    assert cache_metrics.round_trips.count == 1
+
+
+def test_metrics_endpoints():
+    """Test that metrics are exported as JSON and Prometheus text."""
+    cache_metrics.observe_command("MGET", 0.003)
+    cache_metrics.record_hit("demo:logs:5", local=True)
+
+    data = client.get("/metrics/cache").json()
+    text = client.get("/metrics/cache/prometheus").text
+
+    assert data["commands"]["MGET"]["count"] == 1
+    assert data["prefixes"]["demo:logs"]["local_hits"] == 1
+    assert 'redis_command_duration_milliseconds_count{command="MGET"} 1' in text
+    assert 'cache_lookups_total{prefix="demo:logs",result="local_hits"} 1' in text
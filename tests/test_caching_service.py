@@ -2,14 +2,27 @@
 Tests for the Redis caching service.
 """
 
+import asyncio
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import redis
 
-from app.errors.cache_errors import CacheOperationError
-from app.services.caching_service import RedisCacheService
+from app.core.circuit_breaker import CircuitState
+from app.errors.cache_errors import CacheOperationError, CacheUnavailableError
+from app.services.caching_service import (
+    CODECS,
+    AsyncRedisCacheService,
+    JsonCodec,
+    LocalCache,
+    RedisCacheService,
+    ValueEncoder,
+    cache_breaker,
+    get_codec,
+    local_cache,
+    versioned_key,
+)
 
 
 @pytest.fixture
@@ -21,12 +34,32 @@ def mock_redis_client():
         yield mock_instance
 
 
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Start every test with an empty local tier and a closed circuit."""
+    local_cache.clear()
+    cache_breaker.reset()
+    yield
+    local_cache.clear()
+    cache_breaker.reset()
+
+
+def mock_pipeline(client, data, pttl=60000):
+    """Configure a mocked client so GET+PTTL pipelines return the given reply."""
+    pipe = Mock()
+    pipe.execute.return_value = [data, pttl]
+    client.pipeline.return_value = pipe
+    return pipe
+
+
 @pytest.fixture
 def cache_service(mock_redis_client):
     """Cache service fixture with mocked Redis client."""
     service = RedisCacheService()
+    original_client = service._client
     service._client = mock_redis_client
-    return service
+    yield service
+    service._client = original_client
 
 
 def test_singleton_pattern():
@@ -71,32 +104,32 @@ def test_set_failure(cache_service, mock_redis_client):
 def test_get_json_success(cache_service, mock_redis_client):
     """Test successful get_json operation."""
     test_data = {"key": "value"}
-    mock_redis_client.get.return_value = json.dumps(test_data)
+    pipe = mock_pipeline(mock_redis_client, json.dumps(test_data))
 
     result = cache_service.get_json("test_key")
 
     assert result == test_data
-    mock_redis_client.get.assert_called_once_with("test_key")
+    pipe.get.assert_called_once_with("test_key")
 
 
 def test_get_json_not_found(cache_service, mock_redis_client):
     """Test get_json when key not found."""
-    mock_redis_client.get.return_value = None
+    pipe = mock_pipeline(mock_redis_client, None, -2)
 
     result = cache_service.get_json("test_key")
 
     assert result is None
-    mock_redis_client.get.assert_called_once_with("test_key")
+    pipe.get.assert_called_once_with("test_key")
 
 
 def test_get_json_invalid_json(cache_service, mock_redis_client):
     """Test get_json with invalid JSON."""
-    mock_redis_client.get.return_value = "invalid json"
+    pipe = mock_pipeline(mock_redis_client, "invalid json")
 
     result = cache_service.get_json("test_key")
 
     assert result is None
-    mock_redis_client.get.assert_called_once_with("test_key")
+    pipe.get.assert_called_once_with("test_key")
 
 
 def test_set_json_success(cache_service, mock_redis_client):
@@ -106,7 +139,7 @@ def test_set_json_success(cache_service, mock_redis_client):
     cache_service.set_json("test_key", test_data, 60)
 
     mock_redis_client.setex.assert_called_once_with(
-        "test_key", 60, json.dumps(test_data)
+        "test_key", 60, json.dumps(test_data).encode()
     )
 
 
@@ -127,3 +160,507 @@ def test_set_json_nonserializable(cache_service):
 
     with pytest.raises(CacheOperationError):
         cache_service.set_json("test_key", test_data, 60)
+
+
+@pytest.fixture
+def mock_async_redis_client():
+    """Mock asyncio Redis client fixture."""
+    client = AsyncMock()
+    client.pipeline = Mock()
+    return client
+
+
+def mock_async_pipeline(client, data, pttl=60000):
+    """Configure a mocked asyncio client so batched MGET+PTTL reads return the reply."""
+    pipe = Mock()
+    pipe.execute = AsyncMock(return_value=[[data], pttl])
+    client.pipeline.return_value = pipe
+    return pipe
+
+
+@pytest.fixture
+def async_cache_service(mock_async_redis_client):
+    """Async cache service fixture with mocked Redis client."""
+    service = AsyncRedisCacheService()
+    original_client = service._client
+    service._client = mock_async_redis_client
+    yield service
+    service._client = original_client
+
+
+def test_async_singleton_pattern():
+    """Test that AsyncRedisCacheService is a singleton."""
+    assert AsyncRedisCacheService() is AsyncRedisCacheService()
+
+
+def test_async_connect_retries(async_cache_service, mock_async_redis_client):
+    """Test that the startup connection check retries until Redis answers."""
+    mock_async_redis_client.ping.side_effect = [
+        redis.ConnectionError("refused"),
+        True,
+    ]
+
+    assert asyncio.run(async_cache_service.connect(attempts=3, delay=0)) is True
+    assert mock_async_redis_client.ping.await_count == 2
+
+
+def test_async_connect_gives_up(async_cache_service, mock_async_redis_client):
+    """Test that the startup connection check fails after its attempts."""
+    mock_async_redis_client.ping.side_effect = redis.ConnectionError("refused")
+
+    assert asyncio.run(async_cache_service.connect(attempts=2, delay=0)) is False
+    assert mock_async_redis_client.ping.await_count == 2
+
+
+def test_connect_does_no_io():
+    """Test that creating the sync client does not talk to Redis."""
+    service = RedisCacheService()
+    original_client = service._client
+    client = Mock()
+    try:
+        with patch(
+            "app.services.caching_service.redis_connections.primary",
+            return_value=client,
+        ):
+            service._connect()
+    finally:
+        service._client = original_client
+
+    assert client.method_calls == []
+
+
+def test_async_get_success(async_cache_service, mock_async_redis_client):
+    """Test successful async get operation."""
+    mock_async_redis_client.get.return_value = "test_value"
+
+    result = asyncio.run(async_cache_service.get("test_key"))
+
+    assert result == "test_value"
+    mock_async_redis_client.get.assert_awaited_once_with("test_key")
+
+
+def test_async_get_failure(async_cache_service, mock_async_redis_client):
+    """Test async get operation failure."""
+    mock_async_redis_client.get.side_effect = redis.RedisError("Connection error")
+
+    with pytest.raises(CacheOperationError):
+        asyncio.run(async_cache_service.get("test_key"))
+
+
+def test_async_set_json_success(async_cache_service, mock_async_redis_client):
+    """Test successful async set_json operation."""
+    test_data = {"key": "value"}
+
+    asyncio.run(async_cache_service.set_json("test_key", test_data, 60))
+
+    mock_async_redis_client.setex.assert_awaited_once_with(
+        "test_key", 60, json.dumps(test_data).encode()
+    )
+
+
+def test_async_get_json_success(async_cache_service, mock_async_redis_client):
+    """Test successful async get_json operation."""
+    test_data = {"key": "value"}
+    pipe = mock_async_pipeline(mock_async_redis_client, json.dumps(test_data))
+
+    result = asyncio.run(async_cache_service.get_json("test_key"))
+
+    assert result == test_data
+    pipe.mget.assert_called_once_with(["test_key"])
+
+
+def test_async_get_json_invalid_json(async_cache_service, mock_async_redis_client):
+    """Test async get_json with invalid JSON."""
+    mock_async_pipeline(mock_async_redis_client, "invalid json")
+
+    assert asyncio.run(async_cache_service.get_json("test_key")) is None
+
+
+def test_get_many_uses_single_mget(cache_service, mock_redis_client):
+    """Test that get_many reads every key with one MGET."""
+    mock_redis_client.mget.return_value = ["a", None]
+
+    assert cache_service.get_many(["k1", "k2"]) == ["a", None]
+    mock_redis_client.mget.assert_called_once_with(["k1", "k2"])
+
+
+def test_set_many_pipelines_setex(cache_service, mock_redis_client):
+    """Test that set_many sends every SETEX in one pipeline."""
+    pipe = Mock()
+    mock_redis_client.pipeline.return_value = pipe
+
+    cache_service.set_many({"k1": "a", "k2": "b"}, 60)
+
+    pipe.setex.assert_any_call("k1", 60, "a")
+    pipe.setex.assert_any_call("k2", 60, "b")
+    pipe.execute.assert_called_once()
+
+
+def test_get_json_many_only_fetches_local_misses(cache_service, mock_redis_client):
+    """Test that get_json_many serves local hits and batches the rest."""
+    local_cache.set("k1", ["local"], 60)
+    pipe = Mock()
+    pipe.execute.return_value = [[json.dumps(["remote"]), None], 60000, -2]
+    mock_redis_client.pipeline.return_value = pipe
+
+    values = cache_service.get_json_many(["k1", "k2", "k3"])
+
+    assert values == [["local"], ["remote"], None]
+    pipe.mget.assert_called_once_with(["k2", "k3"])
+    assert local_cache.get("k2") == ["remote"]
+
+
+def test_async_get_json_calls_are_batched(async_cache_service, mock_async_redis_client):
+    """Test that concurrent async reads in one tick share a single MGET."""
+    pipe = Mock()
+    pipe.execute = AsyncMock(
+        return_value=[[json.dumps(1), json.dumps(2), None], 60000, 60000, -2]
+    )
+    mock_async_redis_client.pipeline.return_value = pipe
+
+    async def read_all():
+        return await asyncio.gather(
+            async_cache_service.get_json("k1"),
+            async_cache_service.get_json("k2"),
+            async_cache_service.get_json("k3"),
+        )
+
+    assert asyncio.run(read_all()) == [1, 2, None]
+    pipe.mget.assert_called_once_with(["k1", "k2", "k3"])
+    pipe.execute.assert_awaited_once()
+
+
+def test_async_batched_read_failure(async_cache_service, mock_async_redis_client):
+    """Test that a failed batch raises CacheOperationError for every caller."""
+    pipe = Mock()
+    pipe.execute = AsyncMock(side_effect=redis.RedisError("boom"))
+    mock_async_redis_client.pipeline.return_value = pipe
+
+    async def read_all():
+        return await asyncio.gather(
+            async_cache_service.get_json("k1"),
+            async_cache_service.get_json("k2"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(read_all())
+    assert all(isinstance(result, CacheOperationError) for result in results)
+    pipe.execute.assert_awaited_once()
+
+
+def test_async_set_json_many(async_cache_service, mock_async_redis_client):
+    """Test that async set_json_many pipelines SETEX and fills the local tier."""
+    pipe = Mock()
+    pipe.execute = AsyncMock()
+    mock_async_redis_client.pipeline.return_value = pipe
+
+    asyncio.run(async_cache_service.set_json_many({"k1": [1], "k2": [2]}, 60))
+
+    pipe.setex.assert_any_call("k1", 60, json.dumps([1]).encode())
+    pipe.setex.assert_any_call("k2", 60, json.dumps([2]).encode())
+    assert local_cache.get("k2") == [2]
+
+
+def test_get_raw_with_ttl_returns_bytes_unchanged(cache_service, mock_redis_client):
+    """Test that raw reads return stored bytes and keep them locally."""
+    pipe = mock_pipeline(mock_redis_client, b'{"a":1}', 30000)
+
+    assert cache_service.get_raw_with_ttl("test_key") == (b'{"a":1}', 30)
+    assert cache_service.get_raw_with_ttl("test_key")[0] == b'{"a":1}'
+    pipe.execute.assert_called_once()
+
+
+def test_async_set_raw(async_cache_service, mock_async_redis_client):
+    """Test that raw writes store the bytes as-is in Redis and locally."""
+    asyncio.run(async_cache_service.set_raw("test_key", b"[1,2]", 60))
+
+    mock_async_redis_client.setex.assert_awaited_once_with("test_key", 60, b"[1,2]")
+    assert local_cache.get("test_key") == b"[1,2]"
+
+
+def test_encoder_keeps_small_json_unframed():
+    """Test that small JSON values are stored as plain, headerless JSON."""
+    encoder = ValueEncoder(JsonCodec(), compress_min_bytes=1024)
+
+    data = encoder.encode({"key": "value"})
+
+    assert data == json.dumps({"key": "value"}).encode()
+    assert encoder.decode(data) == {"key": "value"}
+
+
+def test_encoder_compresses_large_values():
+    """Test that values above the threshold are zlib-compressed with a header."""
+    encoder = ValueEncoder(JsonCodec(), compress_min_bytes=64)
+    value = [{"client": "Acme Corporation", "status": "new"}] * 50
+
+    data = encoder.encode(value)
+
+    assert data[0] == 0x10
+    assert len(data) < len(json.dumps(value))
+    assert encoder.decode(data) == value
+
+
+def test_encoder_decodes_mixed_formats():
+    """Test that values written with any codec or framing decode correctly."""
+    plain = ValueEncoder(JsonCodec(), compress_min_bytes=0)
+    compressed = ValueEncoder(JsonCodec(), compress_min_bytes=1)
+    value = {"invoices": list(range(100))}
+
+    assert plain.decode(compressed.encode(value)) == value
+    assert compressed.decode(plain.encode(value)) == value
+    assert plain.decode(b'  {"legacy": true}') == {"legacy": True}
+
+
+@pytest.mark.skipif("msgpack" not in CODECS, reason="msgpack is not installed")
+def test_encoder_msgpack_round_trip():
+    """Test that msgpack values carry a header and decode with any encoder."""
+    value = {"tvl": 1480000.0, "apy": 9.2}
+    data = ValueEncoder(CODECS["msgpack"], compress_min_bytes=0).encode(value)
+
+    assert data[0] == 0x01
+    assert ValueEncoder(JsonCodec()).decode(data) == value
+
+
+def test_encoder_raw_round_trip():
+    """Test that raw bodies are stored verbatim unless compressed."""
+    encoder = ValueEncoder(JsonCodec(), compress_min_bytes=64)
+    small, large = b"[1,2]", json.dumps(["entry"] * 100).encode()
+
+    assert encoder.encode_raw(small) == small
+    assert encoder.decode_raw(encoder.encode_raw(large)) == large
+    assert encoder.decode_raw(encoder.encode_raw(b"\x01bin")) == b"\x01bin"
+
+
+def test_get_codec_falls_back_to_json():
+    """Test that unknown codecs fall back to stdlib JSON."""
+    assert isinstance(get_codec("does-not-exist"), JsonCodec)
+
+
+def test_get_json_corrupt_compressed_value(cache_service, mock_redis_client):
+    """Test that an undecodable compressed value is treated as a miss."""
+    mock_pipeline(mock_redis_client, b"\x10not zlib")
+
+    assert cache_service.get_json("test_key") is None
+
+
+def test_get_json_served_from_local_tier(cache_service, mock_redis_client):
+    """Test that a Redis hit is served from the local tier afterwards."""
+    test_data = {"key": "value"}
+    pipe = mock_pipeline(mock_redis_client, json.dumps(test_data), 30000)
+
+    assert cache_service.get_json("test_key") == test_data
+    assert cache_service.get_json("test_key") == test_data
+
+    pipe.execute.assert_called_once()
+    assert local_cache.stats()["hits"] == 1
+
+
+def test_set_json_populates_local_tier(cache_service, mock_redis_client):
+    """Test that set_json writes through to the local tier."""
+    cache_service.set_json("test_key", [1, 2, 3], 60)
+
+    assert cache_service.get_json("test_key") == [1, 2, 3]
+    mock_redis_client.pipeline.assert_not_called()
+
+
+def test_get_json_skips_local_tier_for_missing_key(cache_service, mock_redis_client):
+    """Test that keys that vanished between GET and PTTL are not cached."""
+    mock_pipeline(mock_redis_client, json.dumps({"key": "value"}), -2)
+
+    cache_service.get_json("test_key")
+
+    assert local_cache.stats()["size"] == 0
+
+
+def test_local_cache_expiry():
+    """Test that local entries expire with their TTL."""
+    cache = LocalCache(max_entries=10)
+
+    with patch("app.services.caching_service.time.monotonic", return_value=100.0):
+        cache.set("key", "value", 5)
+    with patch("app.services.caching_service.time.monotonic", return_value=104.0):
+        assert cache.get("key") == "value"
+    with patch("app.services.caching_service.time.monotonic", return_value=105.0):
+        assert cache.get("key") is None
+
+    assert cache.stats()["expirations"] == 1
+
+
+def test_local_cache_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = LocalCache(max_entries=2)
+    cache.set("demo:invoices:50", "hot", 60)
+    cache.set("demo:invoices:10", "cold", 60)
+
+    # Touch the hot key so the cold one becomes least recently used
+    cache.get("demo:invoices:50")
+    cache.set("demo:invoices:20", "new", 60)
+
+    assert cache.get("demo:invoices:50") == "hot"
+    assert cache.get("demo:invoices:10") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_local_cache_caps_ttl():
+    """Test that entries never outlive the configured maximum TTL."""
+    cache = LocalCache(max_entries=10, max_ttl=1)
+
+    with patch("app.services.caching_service.time.monotonic", return_value=0.0):
+        cache.set("key", "value", 60)
+    with patch("app.services.caching_service.time.monotonic", return_value=1.0):
+        assert cache.get("key") is None
+
+
+def test_local_cache_disabled():
+    """Test that a disabled local tier never stores values."""
+    cache = LocalCache(enabled=False)
+    cache.set("key", "value", 60)
+
+    assert cache.get("key") is None
+
+
+def test_get_json_with_ttl_bypasses_expiring_local_entries(
+    cache_service, mock_redis_client
+):
+    """Test that local entries inside min_ttl fall through to Redis."""
+    local_cache.set("test_key", ["stale"], 5)
+    mock_pipeline(mock_redis_client, json.dumps(["fresh"]), 60000)
+
+    value, ttl = cache_service.get_json_with_ttl("test_key", min_ttl=10)
+
+    assert value == ["fresh"]
+    assert ttl == 60
+
+
+def test_acquire_lease(cache_service, mock_redis_client):
+    """Test that leases are taken with SET NX PX."""
+    mock_redis_client.set.return_value = True
+
+    token = cache_service.acquire_lease("test_key", 5000)
+
+    assert token
+    mock_redis_client.set.assert_called_once_with(
+        "test_key:lease", token, nx=True, px=5000
+    )
+
+
+def test_acquire_lease_held_elsewhere(cache_service, mock_redis_client):
+    """Test that a held lease is not acquired."""
+    mock_redis_client.set.return_value = None
+
+    assert cache_service.acquire_lease("test_key", 5000) is None
+
+
+def test_release_lease(cache_service, mock_redis_client):
+    """Test that leases are released with a compare-and-delete script."""
+    cache_service.release_lease("test_key", "token")
+
+    args = mock_redis_client.eval.call_args[0]
+    assert args[1:] == (1, "test_key:lease", "token")
+
+
+def test_renew_lease(cache_service, mock_redis_client):
+    """Test that leases are extended with a compare-and-expire script."""
+    mock_redis_client.eval.return_value = 0
+
+    assert cache_service.renew_lease("test_key", "token", 5000) is False
+    args = mock_redis_client.eval.call_args[0]
+    assert args[1:] == (1, "test_key:lease", "token", 5000)
+
+
+def test_set_if_absent(cache_service, mock_redis_client):
+    """Test that conditional writes use SET NX EX."""
+    mock_redis_client.set.return_value = True
+
+    assert cache_service.set_if_absent("test_key", "value", 60) is True
+    mock_redis_client.set.assert_called_once_with("test_key", "value", nx=True, ex=60)
+
+
+def test_connection_failures_open_circuit(cache_service, mock_redis_client):
+    """Test that repeated connection errors open the circuit and fail fast."""
+    mock_redis_client.get.side_effect = redis.ConnectionError("Connection refused")
+
+    for _ in range(cache_breaker.failure_threshold):
+        with pytest.raises(CacheOperationError):
+            cache_service.get("test_key")
+
+    assert cache_breaker.state == CircuitState.OPEN
+    with pytest.raises(CacheUnavailableError):
+        cache_service.get("test_key")
+    assert mock_redis_client.get.call_count == cache_breaker.failure_threshold
+
+
+def test_command_errors_do_not_open_circuit(cache_service, mock_redis_client):
+    """Test that errors answered by Redis do not count as outages."""
+    mock_redis_client.get.side_effect = redis.ResponseError("WRONGTYPE")
+
+    for _ in range(cache_breaker.failure_threshold + 1):
+        with pytest.raises(CacheOperationError):
+            cache_service.get("test_key")
+
+    assert cache_breaker.state == CircuitState.CLOSED
+
+
+def test_local_cache_get_stale():
+    """Test that expired entries remain available as last-known-good data."""
+    cache = LocalCache(max_entries=10)
+
+    with patch("app.services.caching_service.time.monotonic", return_value=0.0):
+        cache.set("key", "value", 5)
+    with patch("app.services.caching_service.time.monotonic", return_value=10.0):
+        assert cache.get("key") is None
+        assert cache.get_stale("key") == "value"
+
+
+def test_versioned_key_keeps_generation_zero_unversioned():
+    """Test that generation 0 keys match the pre-versioning format."""
+    assert versioned_key("demo:invoices", 5, 0) == "demo:invoices:5"
+    assert versioned_key("demo:invoices", 5, 3) == "demo:invoices:g3:5"
+
+
+def test_get_generation_is_cached_locally(cache_service, mock_redis_client):
+    """Test that the generation is read from Redis once, then served locally."""
+    mock_redis_client.get.return_value = b"4"
+
+    assert cache_service.namespaced_key("demo:logs", 10) == "demo:logs:g4:10"
+    assert cache_service.get_generation("demo:logs") == 4
+    mock_redis_client.get.assert_called_once_with("demo:logs:generation")
+
+
+def test_get_generation_fails_open(cache_service, mock_redis_client):
+    """Test that an unreachable Redis falls back to generation 0."""
+    mock_redis_client.get.side_effect = redis.RedisError("Connection error")
+
+    assert cache_service.get_generation("demo:logs") == 0
+
+
+def test_bump_generation(cache_service, mock_redis_client):
+    """Test that a bump is one INCR plus an invalidation broadcast."""
+    pipe = Mock()
+    pipe.execute.return_value = [2, 1]
+    mock_redis_client.pipeline.return_value = pipe
+
+    assert cache_service.bump_generation("demo:invoices") == 2
+
+    pipe.incr.assert_called_once_with("demo:invoices:generation")
+    assert "demo:invoices:generation" in pipe.publish.call_args[0][1]
+    assert cache_service.namespaced_key("demo:invoices", 1) == "demo:invoices:g2:1"
+
+
+def test_async_primary_read_bypasses_replicas(
+    async_cache_service, mock_async_redis_client
+):
+    """Test that primary reads skip the replicas and the read batcher."""
+    pipe = Mock()
+    pipe.execute = AsyncMock(return_value=[b"done", 60000])
+    mock_async_redis_client.pipeline.return_value = pipe
+
+    with patch("app.services.caching_service.redis_connections") as mock_connections:
+        mock_connections.has_replicas = True
+        value, ttl = asyncio.run(
+            async_cache_service.get_raw_with_ttl("producta:status:", primary=True)
+        )
+
+    assert (value, ttl) == (b"done", 60)
+    pipe.get.assert_called_once_with("producta:status:")
+    mock_connections.read_async.assert_not_called()
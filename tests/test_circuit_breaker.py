@@ -0,0 +1,86 @@
+"""
+Tests for the circuit breaker.
+"""
+
+from unittest.mock import patch
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def make_breaker():
+    """Breaker that opens after two failures with a 1s base backoff."""
+    return CircuitBreaker(
+        "test", failure_threshold=2, reset_timeout=1.0, max_reset_timeout=4.0
+    )
+
+
+def test_opens_after_threshold():
+    """Test that consecutive failures open the circuit."""
+    breaker = make_breaker()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_failure_count():
+    """Test that a success in between failures keeps the circuit closed."""
+    breaker = make_breaker()
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    """Test that one probe is let through after the reset timeout."""
+    breaker = make_breaker()
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=0.0):
+        breaker.record_failure()
+        breaker.record_failure()
+
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=1.5):
+        assert breaker.allow_request()
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_backs_off():
+    """Test that failed probes double the wait up to the maximum."""
+    breaker = make_breaker()
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=0.0):
+        breaker.record_failure()
+        breaker.record_failure()
+
+    for now, expected_timeout in [(1.0, 2.0), (3.0, 4.0), (7.0, 4.0)]:
+        with patch("app.core.circuit_breaker.time.monotonic", return_value=now):
+            assert breaker.allow_request()
+            breaker.record_failure()
+        assert breaker.stats()["reset_timeout"] == expected_timeout
+
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=10.0):
+        assert not breaker.allow_request()
+
+
+def test_release_frees_probe_slot():
+    """Test that an abandoned probe lets the next caller probe."""
+    breaker = make_breaker()
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=0.0):
+        breaker.record_failure()
+        breaker.record_failure()
+
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=1.0):
+        assert breaker.allow_request()
+        breaker.release()
+        assert breaker.allow_request()
@@ -0,0 +1,41 @@
+"""
+Tests for the precomputed company name corpus.
+"""
+
+import json
+
+from app.services.company_corpus import CompanyCorpus, abbreviate, company_corpus
+
+
+def test_corpus_is_deterministic():
+    """Test that a seed always builds the same corpus."""
+    first = CompanyCorpus.build(seed=1, size=20)
+
+    assert first.names.tolist() == CompanyCorpus.build(seed=1, size=20).names.tolist()
+    assert first.names.tolist() != CompanyCorpus.build(seed=2, size=20).names.tolist()
+
+
+def test_corpus_arrays_are_parallel():
+    """Test that abbreviations and JSON names line up with the names."""
+    corpus = CompanyCorpus.build(seed=3, size=50)
+
+    assert len(corpus) == len(corpus.abbreviations) == len(corpus.json_names) == 50
+    for name, abbreviation, json_name in zip(
+        corpus.names.tolist(),
+        corpus.abbreviations.tolist(),
+        corpus.json_names.tolist(),
+    ):
+        assert abbreviation == abbreviate(name)
+        assert json.loads(json_name) == name
+
+
+def test_corpus_built_once_per_seed():
+    """Test that the shared corpus is only built once per seed and size."""
+    assert company_corpus(seed=4, size=10) is company_corpus(seed=4, size=10)
+    assert company_corpus(seed=5, size=10) is not company_corpus(seed=4, size=10)
+
+
+def test_abbreviate_hyphenated_names():
+    """Test that hyphenated names never put a hyphen in the abbreviation."""
+    assert abbreviate("Lee-Horn") == "LH"
+    assert abbreviate("Smith, Lee-Horn and Cox") == "SLHA"
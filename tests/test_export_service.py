@@ -0,0 +1,274 @@
+"""
+Tests for bulk invoice exports.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.constants.export_constants import EXPORT_STALE_SECONDS
+from app.errors.export_errors import ExportCapacityError
+from app.main import app
+from app.schemas.export_schemas import ExportJob, ExportRequest
+from app.services.caching_service import cache_breaker
+from app.services.export_service import ExportService, _write_shard, export_service
+from app.services.invoice_engine import InvoiceBatch
+from app.services.invoice_snapshot import InvoiceSnapshot
+
+
+def run_export(directory, request, max_workers, shard_rows):
+    """Run one export to completion and return its state and file contents."""
+
+    async def export():
+        service = ExportService(str(directory), max_workers, shard_rows)
+        try:
+            job = await service.submit(request)
+            await asyncio.gather(*service._tasks)
+            path, _, _ = await service.result(job.id)
+            with open(path, "rb") as file:
+                return await service.get(job.id), file.read()
+        finally:
+            await service.shutdown()
+
+    return asyncio.run(export())
+
+
+def test_output_does_not_depend_on_worker_count(tmp_path):
+    """Test that one worker and several workers write the same file."""
+    request = ExportRequest(count=2_500, seed=7, format="ndjson")
+
+    job, single = run_export(tmp_path / "single", request, 1, 600)
+    _, parallel = run_export(tmp_path / "parallel", request, 3, 600)
+
+    assert job.status == "completed"
+    assert job.shards == job.shards_done == 5
+    assert job.size_bytes == len(single)
+    assert single == parallel
+    rows = single.splitlines()
+    assert len(rows) == 2_500
+    assert rows == InvoiceBatch.generate(2_500, 7).render_rows()
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "json", "csv", "snapshot"])
+def test_shards_join_into_the_unsharded_file(tmp_path, fmt):
+    """Test that the file is the same whatever the shard size."""
+    request = ExportRequest(count=1_001, seed=3, format=fmt)
+
+    _, whole = run_export(tmp_path / "whole", request, 1, 5_000)
+    _, sharded = run_export(tmp_path / "sharded", request, 2, 100)
+
+    assert whole == sharded
+
+
+def test_json_and_csv_exports_are_valid(tmp_path):
+    """Test that JSON exports parse as an array and CSV exports as a table."""
+    invoices = [
+        invoice.model_dump() for invoice in InvoiceBatch.generate(250, 11).to_invoices()
+    ]
+
+    _, body = run_export(
+        tmp_path / "json", ExportRequest(count=250, seed=11, format="json"), 2, 64
+    )
+    assert json.loads(body) == invoices
+
+    _, body = run_export(
+        tmp_path / "csv", ExportRequest(count=250, seed=11, format="csv"), 2, 64
+    )
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert [row["id"] for row in rows] == [invoice["id"] for invoice in invoices]
+    assert [row["client"] for row in rows] == [
+        invoice["client"] for invoice in invoices
+    ]
+    assert [float(row["risk"]) for row in rows] == [
+        invoice["risk"] for invoice in invoices
+    ]
+
+
+def test_snapshot_exports_read_back(tmp_path):
+    """Test that a sharded snapshot export holds the invoices in order."""
+    _, body = run_export(
+        tmp_path, ExportRequest(count=250, seed=11, format="snapshot"), 2, 64
+    )
+
+    snapshot = InvoiceSnapshot(body)
+
+    assert snapshot.to_invoices() == InvoiceBatch.generate(250, 11).to_invoices()
+
+
+def test_write_shard_starts_at_its_offset(tmp_path):
+    """Test that a shard holds the invoices at its offset of the seed's dataset."""
+    path = tmp_path / "shard"
+
+    size = _write_shard(str(path), "ndjson", 5, 300, 20)
+
+    assert size == path.stat().st_size
+    assert (
+        path.read_bytes().splitlines()
+        == InvoiceBatch.generate(320, 5).render_rows()[300:]
+    )
+
+
+def test_prune_deletes_expired_exports(tmp_path):
+    """Test that finished exports are deleted after the retention period."""
+    job, _ = run_export(tmp_path, ExportRequest(count=10, seed=1), 1, 10)
+    service = ExportService(str(tmp_path), 1, retention=60)
+
+    assert service.prune(now=job.finished_at + 30) == 0
+    assert service.prune(now=job.finished_at + 61) == 1
+    assert not (tmp_path / job.id).exists()
+
+
+@pytest.fixture
+def closed_circuit():
+    """Close the circuit the lifespan's background tasks open without Redis."""
+    yield
+    cache_breaker.reset()
+
+
+def test_submissions_beyond_the_limits_are_refused(tmp_path):
+    """Test that too many running exports or too little storage give a 429."""
+
+    async def scenario():
+        busy = ExportService(str(tmp_path), 1, max_jobs=1)
+        busy._tasks.add(asyncio.ensure_future(asyncio.sleep(0)))
+        full = ExportService(str(tmp_path), 1, max_bytes=1_000)
+        errors = []
+        for service, request in (
+            (busy, ExportRequest(count=10)),
+            (full, ExportRequest(count=100)),
+        ):
+            with pytest.raises(ExportCapacityError) as excinfo:
+                await service.submit(request)
+            errors.append((excinfo.value.status_code, excinfo.value.detail))
+        await asyncio.gather(*busy._tasks)
+        return errors
+
+    assert asyncio.run(scenario()) == [
+        (429, "Too many exports in progress"),
+        (429, "Export storage is full"),
+    ]
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_shard_stops_the_export(tmp_path, monkeypatch):
+    """Test that a failed shard cancels the others and deletes partial shards."""
+    written = []
+
+    def write_shard(path, fmt, seed, start, count):
+        if start == 0:
+            raise OSError("disk full")
+        time.sleep(0.01)
+        written.append(start)
+        with open(path, "wb") as shard:
+            shard.write(b"partial")
+        return 7
+
+    monkeypatch.setattr("app.services.export_service._write_shard", write_shard)
+
+    async def scenario():
+        service = ExportService(str(tmp_path), 2, shard_rows=10)
+        service._pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            job = await service.submit(ExportRequest(count=200, format="ndjson"))
+            await asyncio.gather(*service._tasks)
+            return await service.get(job.id)
+        finally:
+            await service.shutdown()
+
+    job = asyncio.run(scenario())
+
+    assert job.status == "failed"
+    assert job.error == "disk full"
+    assert len(written) < job.shards - 1
+    assert os.listdir(tmp_path / job.id) == ["job.json"]
+
+
+def test_abandoned_exports_fail_and_expire(tmp_path):
+    """Test that an export whose worker died is failed and pruned by age."""
+    service = ExportService(str(tmp_path), 1, retention=60)
+    created = time.time() - EXPORT_STALE_SECONDS - 1
+    job = ExportJob(
+        id="b" * 32,
+        status="running",
+        count=10,
+        seed=1,
+        format="ndjson",
+        shards=1,
+        created_at=created,
+        heartbeat_at=created,
+    )
+    (tmp_path / job.id).mkdir()
+    (tmp_path / job.id / "job.json").write_text(job.model_dump_json())
+    (tmp_path / job.id / "shard-00000.part").write_bytes(b"partial")
+
+    reported = asyncio.run(service.get(job.id))
+
+    assert reported.status == "failed"
+    assert reported.error == "Export worker stopped"
+    assert service.prune(now=created + 30) == 0
+    assert service.prune(now=created + 61) == 1
+    assert not (tmp_path / job.id).exists()
+
+
+def test_export_endpoints(tmp_path, monkeypatch, closed_circuit):
+    """Test submitting, polling and downloading an export."""
+    monkeypatch.setattr(export_service, "directory", str(tmp_path))
+    monkeypatch.setattr(export_service, "max_workers", 2)
+    monkeypatch.setattr(export_service, "shard_rows", 40)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/exports", json={"count": 100, "seed": 9, "format": "csv"}
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["shards"] == 3
+
+        deadline = time.monotonic() + 60
+        while job["status"] in ("queued", "running") and time.monotonic() < deadline:
+            time.sleep(0.05)
+            job = client.get(f"/exports/{job['id']}").json()
+        assert job["status"] == "completed"
+
+        response = client.get(f"/exports/{job['id']}/download")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert f"invoices-{job['id']}.csv" in response.headers["content-disposition"]
+        assert len(response.text.splitlines()) == 101
+
+
+def test_export_endpoint_errors(tmp_path, monkeypatch):
+    """Test unknown exports, unfinished downloads and invalid requests."""
+    monkeypatch.setattr(export_service, "directory", str(tmp_path))
+    client = TestClient(app)
+
+    assert client.get("/exports/" + "0" * 32).status_code == 404
+    assert client.get("/exports/..%2F..%2Fetc").status_code == 404
+    assert client.post("/exports", json={"count": 0}).status_code == 422
+    assert (
+        client.post("/exports", json={"count": 1, "format": "xml"}).status_code == 422
+    )
+
+    job_dir = tmp_path / ("a" * 32)
+    job_dir.mkdir()
+    (job_dir / "job.json").write_text(
+        json.dumps(
+            {
+                "id": "a" * 32,
+                "status": "running",
+                "count": 1,
+                "seed": 1,
+                "format": "ndjson",
+                "shards": 1,
+                "created_at": 0.0,
+            }
+        )
+    )
+    assert client.get(f"/exports/{'a' * 32}/download").status_code == 409
@@ -0,0 +1,149 @@
+"""
+Tests for cross-replica cache invalidation.
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.caching_service import (
+    INSTANCE_ID,
+    RedisCacheService,
+    _invalidation_message,
+    local_cache,
+)
+from app.services.invalidation_service import InvalidationSubscriber
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Start every test with an empty local tier."""
+    local_cache.clear()
+    yield
+    local_cache.clear()
+
+
+def remote_message(keys=(), prefixes=()):
+    """Build an invalidation message as published by another worker."""
+    return json.dumps({"origin": "other", "keys": keys, "prefixes": prefixes})
+
+
+def test_handle_evicts_keys_and_prefixes():
+    """Test that a remote message evicts exact keys and whole prefixes."""
+    local_cache.set("producta:status:", b"processing", 600)
+    local_cache.set("demo:invoices:10", b"[]", 60)
+    local_cache.set("demo:invoices:20", b"[]", 60)
+    local_cache.set("demo:logs:5", b"[]", 60)
+
+    InvalidationSubscriber().handle(
+        remote_message(keys=["producta:status:"], prefixes=["demo:invoices:"])
+    )
+
+    assert local_cache.get("producta:status:") is None
+    assert local_cache.get("demo:invoices:10") is None
+    assert local_cache.get("demo:invoices:20") is None
+    assert local_cache.get("demo:logs:5") == b"[]"
+
+
+def test_handle_ignores_own_messages():
+    """Test that a worker does not evict the value it just wrote."""
+    local_cache.set("producta:status:", b"done", 600)
+
+    InvalidationSubscriber().handle(_invalidation_message(["producta:status:"], []))
+
+    assert local_cache.get("producta:status:") == b"done"
+    assert json.loads(_invalidation_message([], []))["origin"] == INSTANCE_ID
+
+
+def test_handle_ignores_malformed_messages():
+    """Test that garbage on the channel does not break the subscriber."""
+    subscriber = InvalidationSubscriber()
+
+    subscriber.handle(b"not json")
+
+    assert subscriber.received == 0
+
+
+def test_broadcast_set_publishes_in_same_round_trip():
+    """Test that a broadcast write pipelines SETEX and PUBLISH."""
+    service = RedisCacheService()
+    original_client = service._client
+    service._client = client = Mock()
+    pipe = client.pipeline.return_value
+    local_cache.set("producta:status:", b"processing", 600)
+    try:
+        service.set("producta:status:", "done", 600, broadcast=True)
+    finally:
+        service._client = original_client
+
+    pipe.setex.assert_called_once_with("producta:status:", 600, "done")
+    channel, message = pipe.publish.call_args[0]
+    assert channel == "cache:invalidate"
+    assert json.loads(message)["keys"] == ["producta:status:"]
+    pipe.execute.assert_called_once()
+    assert local_cache.get("producta:status:") is None
+
+
+def test_invalidate_publishes_prefixes():
+    """Test that invalidate evicts locally and announces prefixes."""
+    service = RedisCacheService()
+    original_client = service._client
+    service._client = client = Mock()
+    local_cache.set("demo:logs:5", b"[]", 60)
+    try:
+        service.invalidate(prefixes=["demo:logs:"])
+    finally:
+        service._client = original_client
+
+    assert local_cache.get("demo:logs:5") is None
+    message = json.loads(client.publish.call_args[0][1])
+    assert message["prefixes"] == ["demo:logs:"]
+
+
+class FakePubSub:
+    """Pub/sub stand-in that replays messages, then drops the connection."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.subscribed = []
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        if not self.messages:
+            raise RedisConnectionError("connection lost")
+        return {"type": "message", "data": self.messages.pop(0)}
+
+    async def aclose(self):
+        pass
+
+
+def test_subscriber_applies_messages_and_flushes_after_reconnect():
+    """Test that a reconnect evicts everything in case messages were missed."""
+    first = FakePubSub([remote_message(keys=["a"])])
+    second = FakePubSub([])
+    client = Mock()
+    client.pubsub.side_effect = [first, second, FakePubSub([])]
+    subscriber = InvalidationSubscriber(reconnect_delay=0.001)
+    local_cache.set("a", 1, 60)
+    local_cache.set("b", 2, 60)
+
+    async def run():
+        subscriber.start()
+        while subscriber.reconnects == 0:
+            await asyncio.sleep(0.001)
+        await subscriber.stop()
+
+    with patch(
+        "app.services.invalidation_service.redis_connections.async_primary",
+        return_value=client,
+    ):
+        asyncio.run(run())
+
+    assert subscriber.received == 1
+    assert second.subscribed == ["cache:invalidate"]
+    assert local_cache.get("b") is None
@@ -0,0 +1,75 @@
+"""
+Tests for the vectorized invoice batch engine.
+"""
+
+from collections import Counter
+
+from app.constants.invoice_constants import (
+    MAX_AMOUNT,
+    MAX_RISK,
+    MIN_AMOUNT,
+    MIN_RISK,
+    STATUS_WEIGHTS,
+)
+from app.services.company_corpus import company_corpus
+from app.services.invoice_engine import InvoiceBatch
+from app.services.invoice_service import INVOICE_LIST
+
+
+def test_same_seed_same_batch():
+    """Test that a seed always yields the same invoices."""
+    first = InvoiceBatch.generate(50, seed=7).to_invoices()
+
+    assert InvoiceBatch.generate(50, seed=7).to_invoices() == first
+    assert InvoiceBatch.generate(50, seed=8).to_invoices() != first
+
+
+def test_rows_are_random_access():
+    """Test that invoice i depends only on the seed and i."""
+    full = InvoiceBatch.generate(60, seed=9).to_invoices()
+
+    assert InvoiceBatch.generate(20, seed=9, start=40).to_invoices() == full[40:]
+    assert InvoiceBatch.generate(10, seed=9).to_invoices() == full[:10]
+    deep = InvoiceBatch.generate(5, seed=9, start=10**15).to_invoices()
+    assert len(deep) == 5 and deep != full[:5]
+
+
+def test_rendered_rows_match_pydantic():
+    """Test that rows rendered without models are identical to pydantic's JSON."""
+    for seed in range(20):
+        batch = InvoiceBatch.generate(40, seed=seed)
+
+        body = b"[" + b",".join(batch.render_rows()) + b"]"
+
+        assert body == INVOICE_LIST.dump_json(batch.to_invoices())
+
+
+def test_rows_are_materialized_up_to_limit():
+    """Test that only the requested prefix of rows is materialized."""
+    batch = InvoiceBatch.generate(30, seed=1)
+
+    assert len(batch.render_rows(5)) == 5
+    assert batch.to_invoices(5) == batch.to_invoices()[:5]
+    assert len(batch.to_invoices(100)) == len(batch) == 30
+
+
+def test_columns_respect_constants():
+    """Test value ranges and the status distribution of a large batch."""
+    batch = InvoiceBatch.generate(2000, seed=3)
+    invoices = batch.to_invoices()
+
+    assert all(MIN_AMOUNT <= invoice.amount <= MAX_AMOUNT for invoice in invoices)
+    assert all(MIN_RISK <= invoice.risk <= MAX_RISK for invoice in invoices)
+    assert all(round(invoice.risk, 4) == invoice.risk for invoice in invoices)
+    counts = Counter(invoice.status for invoice in invoices)
+    for status, weight in STATUS_WEIGHTS.items():
+        assert abs(counts[status] / len(invoices) - weight) < 0.05
+
+
+def test_clients_come_from_company_corpus():
+    """Test that clients and invoice ids use the corpus names and abbreviations."""
+    corpus = company_corpus()
+    names = dict(zip(corpus.names.tolist(), corpus.abbreviations.tolist()))
+
+    for invoice in InvoiceBatch.generate(200, seed=5).to_invoices():
+        assert invoice.id.endswith(f"-{names[invoice.client]}")
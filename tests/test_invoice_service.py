@@ -2,11 +2,24 @@
 Tests for the invoice service.
 """
 
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
-from app.constants.invoice_constants import CACHE_KEY_PREFIX, CACHE_TTL_SECONDS
+from app.constants.invoice_constants import (
+    CACHE_DATASET_KEY,
+    CACHE_KEY_PREFIX,
+    CACHE_SOFT_TTL_SECONDS,
+    CACHE_TTL_SECONDS,
+    MAX_LIMIT,
+)
+from app.core.sliced_array import pack_array, slice_array
 from app.services.invoice_service import InvoiceService
 
+STALE_WINDOW = CACHE_TTL_SECONDS - CACHE_SOFT_TTL_SECONDS
+DATASET_KEY = f"{CACHE_KEY_PREFIX}:{CACHE_DATASET_KEY}"
+
 
 def test_get_status_weighted():
     """Test the weighted status function."""
@@ -24,12 +37,12 @@ def test_get_status_weighted():
     assert 80 <= funded_count <= 120  # ~10%
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_get_invoices_cache_miss(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.redis_cache.set_raw")
+def test_get_invoices_cache_miss(mock_set_raw, mock_get_raw):
     """Test get_invoices with cache miss."""
     # Setup cache miss
-    mock_get_json.return_value = None
+    mock_get_raw.return_value = (None, None)
 
     # Call the method
     invoices = InvoiceService.get_invoices(5)
@@ -38,29 +51,37 @@ def test_get_invoices_cache_miss(mock_set_json, mock_get_json):
     assert len(invoices) == 5
 
     # Verify cache interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:5")
-    mock_set_json.assert_called_once()
+    mock_get_raw.assert_called_once_with(DATASET_KEY, STALE_WINDOW)
+    mock_set_raw.assert_called_once()
 
     # Verify the right data was cached
-    cache_key = mock_set_json.call_args[0][0]
-    cache_data = mock_set_json.call_args[0][1]
-    cache_ttl = mock_set_json.call_args[0][2]
-
-    assert cache_key == f"{CACHE_KEY_PREFIX}:5"
-    assert len(cache_data) == 5
-    assert all(isinstance(item, dict) for item in cache_data)
+    cache_key = mock_set_raw.call_args[0][0]
+    cache_data = mock_set_raw.call_args[0][1]
+    cache_ttl = mock_set_raw.call_args[0][2]
+
+    assert cache_key == DATASET_KEY
+    assert isinstance(cache_data, bytes)
+    dataset = json.loads(slice_array(cache_data, MAX_LIMIT))
+    assert len(dataset) == MAX_LIMIT
+    assert dataset[:5] == [invoice.model_dump() for invoice in invoices]
     assert cache_ttl == CACHE_TTL_SECONDS
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_get_invoices_cache_hit(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.redis_cache.set_raw")
+def test_get_invoices_cache_hit(mock_set_raw, mock_get_raw):
     """Test get_invoices with cache hit."""
     # Generate some invoices to use as cached data
     generated_invoices = InvoiceService.generate_invoices(5)
-    mock_get_json.return_value = [
-        invoice.model_dump() for invoice in generated_invoices
-    ]
+    mock_get_raw.return_value = (
+        pack_array(
+            [
+                json.dumps(invoice.model_dump()).encode()
+                for invoice in generated_invoices
+            ]
+        ),
+        CACHE_TTL_SECONDS,
+    )
 
     # Call the method
     invoices = InvoiceService.get_invoices(5)
@@ -78,5 +99,101 @@ def test_get_invoices_cache_hit(mock_set_json, mock_get_json):
         assert invoice.status == generated_invoices[i].status
 
     # Verify cache interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:5")
-    mock_set_json.assert_not_called()  # Should not set cache on hit
+    mock_get_raw.assert_called_once_with(DATASET_KEY, STALE_WINDOW)
+    mock_set_raw.assert_not_called()  # Should not set cache on hit
+
+
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_get_invoices_async_cache_miss(mock_set_raw, mock_get_raw):
+    """Test get_invoices_async with cache miss."""
+    mock_get_raw.return_value = (None, None)
+
+    invoices = asyncio.run(InvoiceService.get_invoices_async(5))
+
+    assert len(invoices) == 5
+    mock_get_raw.assert_awaited_once_with(DATASET_KEY, STALE_WINDOW)
+    mock_set_raw.assert_awaited_once()
+    assert mock_set_raw.call_args[0][2] == CACHE_TTL_SECONDS
+
+
+@patch("app.services.caching_service.async_redis_cache.get_generation")
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_get_invoices_async_uses_current_generation(
+    mock_set_raw, mock_get_raw, mock_get_generation
+):
+    """Test that invoice keys carry the namespace generation once bumped."""
+    mock_get_generation.return_value = 3
+    mock_get_raw.return_value = (None, None)
+
+    asyncio.run(InvoiceService.get_invoices_async(5))
+
+    mock_get_raw.assert_awaited_once_with(
+        f"{CACHE_KEY_PREFIX}:g3:{CACHE_DATASET_KEY}", STALE_WINDOW
+    )
+
+
+@patch("app.services.caching_service.async_redis_cache.get_generation")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_warm_cache_async_writes_dataset(mock_set_raw, mock_get_generation):
+    """Test that warming caches and broadcasts the dataset serving every limit."""
+    mock_get_generation.return_value = 0
+
+    asyncio.run(InvoiceService.warm_cache_async())
+
+    key, dataset, ttl = mock_set_raw.call_args[0]
+    assert key == DATASET_KEY
+    assert ttl == CACHE_TTL_SECONDS
+    assert len(json.loads(slice_array(dataset, MAX_LIMIT))) == MAX_LIMIT
+    assert mock_set_raw.call_args[1] == {"broadcast": True}
+
+
+@patch("app.services.caching_service.redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.redis_cache.set_raw")
+def test_limits_are_prefixes_of_one_dataset(mock_set_raw, mock_get_raw):
+    """Test that every limit is served from the same cached dataset."""
+    mock_get_raw.return_value = (None, None)
+    largest = InvoiceService.get_invoices(MAX_LIMIT)
+    mock_get_raw.return_value = (mock_set_raw.call_args[0][1], CACHE_TTL_SECONDS)
+
+    for limit in (1, 7, 50):
+        assert InvoiceService.get_invoices(limit) == largest[:limit]
+    mock_set_raw.assert_called_once()
+
+
+def test_generate_invoices_is_reproducible_per_seed():
+    """Test that a seed always yields the same invoices, even in parallel."""
+    expected = InvoiceService.generate_invoices(20, seed=42)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: InvoiceService.generate_invoices(20, seed=42), range(16)
+            )
+        )
+
+    assert all(invoices == expected for invoices in results)
+    assert InvoiceService.generate_invoices(20, seed=43) != expected
+
+
+def test_generate_invoices_without_seed_differ():
+    """Test that successive unseeded generations produce new invoices."""
+    assert InvoiceService.generate_invoices(10) != InvoiceService.generate_invoices(10)
+
+
+def test_stream_invoices_chunks_and_seed():
+    """Test that the feed is generated in chunks and reproducible per seed."""
+
+    async def collect(**kwargs):
+        return [chunk async for chunk in InvoiceService.stream_invoices_async(**kwargs)]
+
+    chunks = asyncio.run(collect(count=25, seed=7, chunk_size=10))
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [10, 10, 5]
+    assert asyncio.run(collect(count=25, seed=7, chunk_size=10)) == chunks
+    assert asyncio.run(collect(count=25, seed=8, chunk_size=10)) != chunks
+    array = asyncio.run(collect(count=25, seed=7, chunk_size=10, json_array=True))
+    assert json.loads(b"".join(array)) == [
+        json.loads(line) for line in b"".join(chunks).splitlines()
+    ]
@@ -0,0 +1,139 @@
+"""
+Tests for columnar invoice snapshots.
+"""
+
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from app.services.invoice_engine import InvoiceBatch
+from app.services.invoice_snapshot import (
+    InvoiceSnapshot,
+    encode_snapshot,
+    merge_snapshots,
+    write_snapshot,
+)
+
+
+def test_snapshot_round_trips_a_batch(tmp_path):
+    """Test that a snapshot file reads back the invoices it was written from."""
+    batch = InvoiceBatch.generate(5_000, 42)
+    path = str(tmp_path / "invoices.snapshot")
+
+    size = write_snapshot(path, batch)
+    snapshot = InvoiceSnapshot(path)
+
+    assert size == (tmp_path / "invoices.snapshot").stat().st_size
+    assert len(snapshot) == 5_000
+    assert snapshot.to_invoices() == batch.to_invoices()
+    assert snapshot.to_invoices(1_000, 1_010) == batch.to_invoices()[1_000:1_010]
+    assert snapshot[-1] == batch.to_invoices()[-1]
+    with pytest.raises(IndexError):
+        snapshot[5_000]
+
+
+def test_snapshot_round_trips_invoice_models():
+    """Test that invoice models encode to the same rows as their batch."""
+    invoices = InvoiceBatch.generate(300, 7).to_invoices()
+
+    snapshot = InvoiceSnapshot(encode_snapshot(invoices))
+
+    assert snapshot.to_invoices() == invoices
+
+
+def test_large_amounts_widen_the_amount_column():
+    """Test that amounts beyond int32 are stored as int64."""
+    invoices = InvoiceBatch.generate(3, 7).to_invoices()
+    invoices[1] = invoices[1].model_copy(update={"amount": 2**40})
+
+    snapshot = InvoiceSnapshot(encode_snapshot(invoices))
+
+    assert snapshot.column("amount").dtype == np.dtype("<i8")
+    assert snapshot.to_invoices() == invoices
+
+
+def test_columns_are_zero_copy_views(tmp_path):
+    """Test that columns are read-only arrays over the mapped file."""
+    batch = InvoiceBatch.generate(1_000, 3)
+    path = str(tmp_path / "invoices.snapshot")
+    write_snapshot(path, batch)
+
+    snapshot = InvoiceSnapshot(path)
+    amounts = snapshot.column("amount")
+
+    assert isinstance(amounts.base, np.memmap) or isinstance(
+        amounts.base.base, np.memmap
+    )
+    assert not amounts.flags.writeable
+    assert amounts.dtype == np.dtype("<i4")
+    assert amounts.sum() == batch.amounts.sum()
+    np.testing.assert_array_equal(snapshot.column("risk"), batch.risks)
+
+
+def test_string_columns_are_dictionary_encoded():
+    """Test that repeated strings are stored once, with narrow codes."""
+    batch = InvoiceBatch.generate(2_000, 5)
+    invoices = batch.to_invoices()
+
+    snapshot = InvoiceSnapshot(encode_snapshot(batch))
+
+    assert snapshot.column("status").dtype == np.uint8
+    assert snapshot.column("client").dtype == np.uint16
+    for name in ("id", "client", "tokenId", "status"):
+        dictionary = snapshot.dictionary(name)
+        values = [getattr(invoice, name) for invoice in invoices]
+        assert len(dictionary) == len(set(dictionary))
+        assert set(values) <= set(dictionary)
+        assert snapshot.values(name) == values
+
+
+def test_snapshot_is_smaller_than_json():
+    """Test that a snapshot takes a fraction of the bytes of the JSON feed."""
+    batch = InvoiceBatch.generate(100_000, 1)
+
+    assert len(encode_snapshot(batch)) * 3 < len(b",".join(batch.render_rows()))
+
+
+def test_empty_snapshot():
+    """Test that a snapshot of no invoices is valid."""
+    snapshot = InvoiceSnapshot(encode_snapshot([]))
+
+    assert len(snapshot) == 0
+    assert snapshot.to_invoices() == []
+
+
+def test_invalid_snapshots_are_rejected():
+    """Test that foreign, truncated and future-version files are rejected."""
+    snapshot = encode_snapshot(InvoiceBatch.generate(100, 1))
+
+    with pytest.raises(ValueError):
+        InvoiceSnapshot(b"[]")
+    with pytest.raises(ValueError):
+        InvoiceSnapshot(b"x" * len(snapshot))
+    with pytest.raises(ValueError):
+        InvoiceSnapshot(snapshot[: len(snapshot) // 2])
+    with pytest.raises(ValueError):
+        InvoiceSnapshot(snapshot[:8] + struct.pack("<H", 2) + snapshot[10:])
+
+
+def test_merged_snapshots_do_not_depend_on_the_split(tmp_path):
+    """Test that merging parts gives the rows in order, whatever the split."""
+    batch = InvoiceBatch.generate(900, 13)
+    merged = []
+    for sizes in ((900,), (100, 500, 300), (450, 0, 450)):
+        paths, start = [], 0
+        for index, size in enumerate(sizes):
+            paths.append(str(tmp_path / f"{len(sizes)}-{index}.snapshot"))
+            write_snapshot(paths[-1], InvoiceBatch.generate(size, 13, start))
+            start += size
+        output = str(tmp_path / f"merged-{len(sizes)}.snapshot")
+        assert merge_snapshots(paths, output) == os.path.getsize(output)
+        with open(output, "rb") as file:
+            merged.append(file.read())
+
+    assert merged[0] == merged[1] == merged[2]
+    snapshot = InvoiceSnapshot(merged[0])
+    assert snapshot.to_invoices() == batch.to_invoices()
+    assert snapshot.dictionary("status") == sorted(snapshot.dictionary("status"))
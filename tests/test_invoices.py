@@ -2,16 +2,31 @@
 Tests for the invoices endpoint.
 """
 
+import json
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
-from app.constants.invoice_constants import CACHE_KEY_PREFIX
+from app.constants.invoice_constants import (
+    CACHE_DATASET_KEY,
+    CACHE_KEY_PREFIX,
+    CACHE_PAGE_KEY_PREFIX,
+    CACHE_SOFT_TTL_SECONDS,
+    CACHE_TTL_SECONDS,
+    PAGINATION_DATASET_SIZE,
+    PAGINATION_SEED,
+)
+from app.core.pagination import encode_cursor
+from app.core.sliced_array import pack_array
 from app.main import app
+from app.services.caching_service import page_cache, raw_tier
 from app.services.invoice_service import InvoiceService
 
 client = TestClient(app)
 
+STALE_WINDOW = CACHE_TTL_SECONDS - CACHE_SOFT_TTL_SECONDS
+DATASET_KEY = f"{CACHE_KEY_PREFIX}:{CACHE_DATASET_KEY}"
+
 
 def test_get_abbreviated_name():
     """Test the abbreviation function."""
@@ -56,12 +71,12 @@ def test_invoices_fields_format():
         assert invoice.status in ("new", "processing", "funded")
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_invoices_endpoint_default_limit(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_default_limit(mock_set_raw, mock_get_raw):
     """Test invoices endpoint with default limit."""
     # Mock Redis to return cache miss
-    mock_get_json.return_value = None
+    mock_get_raw.return_value = (None, None)
 
     # Call the endpoint
     response = client.get("/invoices")
@@ -72,16 +87,16 @@ def test_invoices_endpoint_default_limit(mock_set_json, mock_get_json):
     assert len(data) == 50
 
     # Verify Redis interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:50")
-    mock_set_json.assert_called_once()
+    mock_get_raw.assert_called_once_with(DATASET_KEY, STALE_WINDOW)
+    mock_set_raw.assert_called_once()
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_invoices_endpoint_custom_limit(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_custom_limit(mock_set_raw, mock_get_raw):
     """Test invoices endpoint with custom limit."""
     # Mock Redis to return cache miss
-    mock_get_json.return_value = None
+    mock_get_raw.return_value = (None, None)
 
     # Call the endpoint with custom limit
     response = client.get("/invoices?limit=10")
@@ -92,16 +107,16 @@ def test_invoices_endpoint_custom_limit(mock_set_json, mock_get_json):
     assert len(data) == 10
 
     # Verify Redis interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:10")
-    mock_set_json.assert_called_once()
+    mock_get_raw.assert_called_once_with(DATASET_KEY, STALE_WINDOW)
+    mock_set_raw.assert_called_once()
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_invoices_endpoint_max_limit(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_max_limit(mock_set_raw, mock_get_raw):
     """Test invoices endpoint with maximum limit."""
     # Mock Redis to return cache miss
-    mock_get_json.return_value = None
+    mock_get_raw.return_value = (None, None)
 
     # Call the endpoint with max limit
     response = client.get("/invoices?limit=100")
@@ -112,13 +127,13 @@ def test_invoices_endpoint_max_limit(mock_set_json, mock_get_json):
     assert len(data) == 100
 
     # Verify Redis interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:100")
-    mock_set_json.assert_called_once()
+    mock_get_raw.assert_called_once_with(DATASET_KEY, STALE_WINDOW)
+    mock_set_raw.assert_called_once()
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_invoices_endpoint_above_max_limit(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_above_max_limit(mock_set_raw, mock_get_raw):
     """Test invoices endpoint with limit above maximum."""
     # Call the endpoint with limit above max
     response = client.get("/invoices?limit=101")
@@ -129,13 +144,13 @@ def test_invoices_endpoint_above_max_limit(mock_set_json, mock_get_json):
     assert "less than or equal to" in data["detail"][0]["msg"].lower()
 
     # Redis should not be accessed
-    mock_get_json.assert_not_called()
-    mock_set_json.assert_not_called()
+    mock_get_raw.assert_not_called()
+    mock_set_raw.assert_not_called()
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_invoices_endpoint_invalid_limit(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_invalid_limit(mock_set_raw, mock_get_raw):
     """Test invoices endpoint with invalid limit."""
     # Call the endpoint with invalid limit
     response = client.get("/invoices?limit=0")
@@ -146,17 +161,22 @@ def test_invoices_endpoint_invalid_limit(mock_set_json, mock_get_json):
     assert "greater than or equal to" in data["detail"][0]["msg"].lower()
 
     # Redis should not be accessed
-    mock_get_json.assert_not_called()
-    mock_set_json.assert_not_called()
+    mock_get_raw.assert_not_called()
+    mock_set_raw.assert_not_called()
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_invoices_endpoint_cache_hit(mock_set_json, mock_get_json):
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_cache_hit(mock_set_raw, mock_get_raw):
     """Test invoices endpoint with cache hit."""
     # Create mock cached data
     cached_invoices = InvoiceService.generate_invoices(5)
-    mock_get_json.return_value = [invoice.model_dump() for invoice in cached_invoices]
+    mock_get_raw.return_value = (
+        pack_array(
+            [json.dumps(invoice.model_dump()).encode() for invoice in cached_invoices]
+        ),
+        CACHE_TTL_SECONDS,
+    )
 
     # Call the endpoint
     response = client.get("/invoices?limit=5")
@@ -167,5 +187,121 @@ def test_invoices_endpoint_cache_hit(mock_set_json, mock_get_json):
     assert len(data) == 5
 
     # Verify Redis interactions
-    mock_get_json.assert_called_once_with(f"{CACHE_KEY_PREFIX}:5")
-    mock_set_json.assert_not_called()  # Should not set cache on hit
+    mock_get_raw.assert_called_once_with(DATASET_KEY, STALE_WINDOW)
+    mock_set_raw.assert_not_called()  # Should not set cache on hit
+
+
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_serves_cached_body_verbatim(mock_set_raw, mock_get_raw):
+    """Test that a cached body is returned as-is without re-serialization."""
+    invoice = json.dumps(InvoiceService.generate_invoices(1)[0].model_dump()).encode()
+    mock_get_raw.return_value = (pack_array([invoice]), CACHE_TTL_SECONDS)
+
+    response = client.get("/invoices?limit=1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == b"[" + invoice + b"]"
+
+
+def test_invoices_openapi_schema_keeps_response_model():
+    """Test that the documented response is still a list of invoices."""
+    schema = app.openapi()["paths"]["/invoices"]["get"]["responses"]["200"]
+
+    assert schema["content"]["application/json"]["schema"] == {
+        "type": "array",
+        "items": {"$ref": "#/components/schemas/Invoice"},
+        "title": "Response Invoices/Get",
+    }
+
+
+def test_stream_invoices_ndjson():
+    """Test the NDJSON feed returns one valid invoice per line."""
+    response = client.get("/invoices/stream?count=2500&seed=3")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.content.splitlines()
+    assert len(lines) == 2500
+    assert all(json.loads(line)["id"].startswith("INV-") for line in lines)
+    assert client.get("/invoices/stream?count=2500&seed=3").content == response.content
+
+
+def test_stream_invoices_json_array():
+    """Test the feed framed as a single JSON array."""
+    response = client.get("/invoices/stream?count=1500&seed=3&format=json")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert len(response.json()) == 1500
+
+
+def test_stream_invoices_invalid_count():
+    """Test that the feed rejects counts out of range."""
+    assert client.get("/invoices/stream?count=0").status_code == 422
+    assert client.get("/invoices/stream?count=10000001").status_code == 422
+    assert client.get("/invoices/stream?format=csv").status_code == 422
+
+
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_pagination(mock_set_raw, mock_get_raw):
+    """Test that cursors walk consecutive pages of the paginated dataset."""
+    mock_get_raw.return_value = (None, None)
+
+    first = client.get("/invoices?limit=20&offset=0")
+    second = client.get(f"/invoices?limit=20&cursor={first.headers['X-Next-Cursor']}")
+    both = client.get("/invoices?limit=40&offset=0")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() + second.json() == both.json()
+    assert first.headers["X-Total-Count"] == str(PAGINATION_DATASET_SIZE)
+    mock_get_raw.assert_any_call(
+        f"{CACHE_PAGE_KEY_PREFIX}:{PAGINATION_SEED}:20:20", STALE_WINDOW
+    )
+
+
+def test_pages_are_kept_out_of_the_dataset_tiers():
+    """Test that page bodies use their own tier, apart from the dataset body."""
+    page_key = f"{CACHE_PAGE_KEY_PREFIX}:g0:{PAGINATION_SEED}:20:20"
+
+    assert raw_tier(page_key) is page_cache
+    assert raw_tier(f"{CACHE_KEY_PREFIX}:g0:dataset") is not page_cache
+
+
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoices_endpoint_last_page(mock_set_raw, mock_get_raw):
+    """Test that the last page is truncated and has no next cursor."""
+    mock_get_raw.return_value = (None, None)
+
+    response = client.get(f"/invoices?limit=50&offset={PAGINATION_DATASET_SIZE - 3}")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_invoices_endpoint_invalid_cursor():
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/invoices?cursor=not-a-cursor")
+
+    assert response.status_code == 400
+
+
+def test_invoices_endpoint_rejects_foreign_cursor_seed():
+    """Test that a cursor cannot open a dataset of a client-chosen seed."""
+    response = client.get(f"/invoices?cursor={encode_cursor(10**40, 0)}")
+
+    assert response.status_code == 400
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_invoices_endpoint_rejects_offset_with_cursor():
+    """Test that sending both offset and cursor is rejected."""
+    cursor = encode_cursor(PAGINATION_SEED, 20)
+
+    response = client.get(f"/invoices?offset=0&cursor={cursor}")
+
+    assert response.status_code == 400
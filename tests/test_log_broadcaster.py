@@ -0,0 +1,158 @@
+"""
+Tests for the agent log push stream.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.api.routes.agent_logs import _server_sent_events
+from app.core.sliced_array import pack_array
+from app.main import app
+from app.services.log_broadcaster import (
+    LogBroadcaster,
+    LogSubscription,
+    log_broadcaster,
+)
+
+client = TestClient(app)
+
+DATASET = pack_array([json.dumps(f"log {i}").encode() for i in range(20)])
+
+
+def test_subscription_coalesces_updates():
+    """Test that a slow subscriber only gets the latest update."""
+
+    async def scenario():
+        subscription = LogSubscription()
+        subscription.offer(b"first")
+        subscription.offer(b"second")
+        return (
+            await subscription.next(0.01),
+            await subscription.next(0.01),
+            subscription.coalesced,
+        )
+
+    assert asyncio.run(scenario()) == (b"second", None, 1)
+
+
+def test_publish_only_changes():
+    """Test that unchanged datasets are not pushed again."""
+
+    async def scenario():
+        broadcaster = LogBroadcaster()
+        subscription = LogSubscription()
+        broadcaster._subscriptions.add(subscription)
+        broadcaster.publish(b"a")
+        first = await subscription.next(0.01)
+        broadcaster.publish(b"a")
+        return first, await subscription.next(0.01), broadcaster.publishes
+
+    assert asyncio.run(scenario()) == (b"a", None, 1)
+
+
+@patch(
+    "app.services.log_broadcaster.AgentLogsService.get_agent_logs_dataset_async",
+    new_callable=AsyncMock,
+    return_value=DATASET,
+)
+def test_one_producer_fans_out(mock_dataset):
+    """Test that one poll feeds every subscriber and stops with the last one."""
+
+    async def scenario():
+        broadcaster = LogBroadcaster(interval=60)
+        subscriptions = [broadcaster.subscribe() for _ in range(50)]
+        received = [await subscription.next(1) for subscription in subscriptions]
+        task = broadcaster._task
+        for subscription in subscriptions:
+            broadcaster.unsubscribe(subscription)
+        await asyncio.sleep(0)
+        return received, task.cancelled(), broadcaster.stats()
+
+    received, cancelled, stats = asyncio.run(scenario())
+
+    assert received == [DATASET] * 50
+    assert mock_dataset.await_count == 1
+    assert cancelled
+    assert stats["subscribers"] == 0 and stats["publishes"] == 1
+
+
+@patch(
+    "app.services.log_broadcaster.AgentLogsService.get_agent_logs_dataset_async",
+    new_callable=AsyncMock,
+    side_effect=RuntimeError("Redis down"),
+)
+def test_poll_failure_is_counted(mock_dataset):
+    """Test that a failed poll keeps the producer alive."""
+    broadcaster = LogBroadcaster()
+
+    asyncio.run(broadcaster.poll())
+
+    assert broadcaster.failures == 1 and broadcaster.publishes == 0
+
+
+@patch(
+    "app.services.log_broadcaster.AgentLogsService.get_agent_logs_dataset_async",
+    new_callable=AsyncMock,
+    return_value=DATASET,
+)
+def test_server_sent_events(mock_dataset):
+    """Test that the SSE stream sends the sliced logs as an event."""
+
+    async def first_event():
+        events = _server_sent_events(3)
+        try:
+            return await anext(events)
+        finally:
+            await events.aclose()
+            await log_broadcaster.stop()
+
+    event = asyncio.run(first_event())
+
+    assert event.startswith(b"event: logs\ndata: ")
+    assert json.loads(event.split(b"data: ")[1]) == ["log 0", "log 1", "log 2"]
+    assert log_broadcaster.stats()["subscribers"] == 0
+
+
+@patch(
+    "app.services.log_broadcaster.AgentLogsService.get_agent_logs_dataset_async",
+    new_callable=AsyncMock,
+    return_value=DATASET,
+)
+def test_websocket_pushes_logs(mock_dataset):
+    """Test that WebSocket subscribers receive the sliced logs."""
+    with client.websocket_connect("/logs/agent/ws?limit=2") as websocket:
+        assert json.loads(websocket.receive_text()) == ["log 0", "log 1"]
+
+
+@patch(
+    "app.services.log_broadcaster.AgentLogsService.get_agent_logs_dataset_async",
+    new_callable=AsyncMock,
+    return_value=DATASET,
+)
+def test_websocket_disconnect_unsubscribes(mock_dataset):
+    """Test that closing the WebSocket releases the subscription."""
+    with client.websocket_connect("/logs/agent/ws") as websocket:
+        websocket.receive_text()
+        websocket.close()
+
+    assert log_broadcaster.stats()["subscribers"] == 0
+
+
+@patch(
+    "app.services.log_broadcaster.AgentLogsService.get_agent_logs_dataset_async",
+    new_callable=AsyncMock,
+    return_value=DATASET,
+)
+@patch("app.api.routes.agent_logs.logger")
+@patch("app.api.routes.agent_logs.slice_array", side_effect=ValueError("boom"))
+def test_websocket_push_failure_is_logged(mock_slice, mock_logger, mock_dataset):
+    """Test that a failed push is awaited and logged when the socket closes."""
+    with client.websocket_connect("/logs/agent/ws") as websocket:
+        websocket.close()
+
+    assert log_broadcaster.stats()["subscribers"] == 0
+    mock_logger.error.assert_called_once()
+    assert "boom" in mock_logger.error.call_args[0][0]
@@ -0,0 +1,118 @@
+"""
+Tests for the rolling log ring.
+"""
+
+import asyncio
+import json
+import threading
+
+from app.core.log_ring import LogRing
+from app.core.sliced_array import slice_array
+
+
+def make_ring(capacity=5):
+    """Ring whose entry n renders as the JSON number n."""
+    rendered = []
+
+    def render(number):
+        rendered.append(number)
+        return json.dumps(number).encode()
+
+    return LogRing(render, capacity=capacity, interval=2.0), rendered
+
+
+def test_window_is_newest_first():
+    """Test that the window holds the newest entries, newest first."""
+    ring, rendered = make_ring()
+
+    ring.advance(now=100.0)
+
+    assert json.loads(slice_array(ring._snapshot, 10)) == [50, 49, 48, 47, 46]
+    assert rendered == [46, 47, 48, 49, 50]
+
+
+def test_advance_renders_only_new_entries():
+    """Test that advancing renders each due entry once, and never old ones."""
+    ring, rendered = make_ring()
+    ring.advance(now=100.0)
+    rendered.clear()
+
+    assert ring.advance(now=101.9) is False
+    assert ring.advance(now=104.0) is True
+    assert rendered == [51, 52]
+    assert ring.advance(now=1000.0) is True
+    assert rendered == [51, 52, 496, 497, 498, 499, 500]
+    assert ring.advance(now=50.0) is False
+
+
+def test_rings_agree():
+    """Test that two workers hold the same window at the same time."""
+    first, _ = make_ring()
+    second, _ = make_ring()
+    first.advance(now=90.0)
+    first.advance(now=100.0)
+    second.advance(now=100.0)
+
+    assert first._snapshot == second._snapshot
+
+
+def test_producer_appends_entries():
+    """Test that the producer appends entries and reads do not advance."""
+
+    async def scenario():
+        ring, rendered = make_ring()
+        ring.interval = 0.01
+        await ring.start()
+        await asyncio.sleep(0.05)
+        before = len(rendered)
+        ring.snapshot()
+        after = len(rendered)
+        await ring.stop()
+        return before, after, ring.stats()
+
+    before, after, stats = asyncio.run(scenario())
+
+    assert before > 5
+    assert after == before
+    assert stats["producer_running"] is False
+
+
+def test_read_right_after_start_is_full():
+    """Test that start renders the first window off the loop before returning."""
+    threads = []
+
+    def render(number):
+        threads.append(threading.current_thread())
+        return json.dumps(number).encode()
+
+    async def scenario():
+        ring = LogRing(render, capacity=5, interval=2.0)
+        await ring.start()
+        window = json.loads(slice_array(ring.snapshot(), 5))
+        await ring.stop()
+        return window
+
+    window = asyncio.run(scenario())
+
+    assert len(window) == 5
+    assert threading.main_thread() not in threads
+
+
+def test_read_renders_if_first_window_failed():
+    """Test that reads render themselves if startup could not render."""
+    failures = [1]
+
+    def render(number):
+        if failures:
+            failures.pop()
+            raise RuntimeError("boom")
+        return json.dumps(number).encode()
+
+    async def scenario():
+        ring = LogRing(render, capacity=5, interval=60.0)
+        await ring.start()
+        window = json.loads(slice_array(ring.snapshot(), 5))
+        await ring.stop()
+        return window
+
+    assert len(asyncio.run(scenario())) == 5
@@ -0,0 +1,47 @@
+"""
+Tests for compiled log templates.
+"""
+
+import random
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.log_templates import LogTemplate, compile_templates
+
+
+def test_only_used_fields_are_generated():
+    """Test that a template draws values only for its own fields."""
+    unused = Mock(return_value="unused")
+    template = LogTemplate(
+        "Batch {batch_id} sent at {at}, batch {batch_id}",
+        {
+            "batch_id": lambda rng, at: rng.randint(1, 9),
+            "at": lambda rng, at: at,
+            "company": unused,
+        },
+    )
+
+    message = template.render(random.Random(1), 12.5)
+
+    batch_id = random.Random(1).randint(1, 9)
+    assert message == f"Batch {batch_id} sent at 12.5, batch {batch_id}"
+    unused.assert_not_called()
+
+
+def test_render_matches_str_format():
+    """Test that compiled rendering agrees with str.format, specs included."""
+    text = "{{literal}} {name!r} owes {amount:,.2f} ({name})"
+    template = LogTemplate(
+        text, {"name": lambda rng, at: "Acme", "amount": lambda rng, at: 1234.5}
+    )
+
+    assert template.render(random.Random(1), 0.0) == text.format(
+        name="Acme", amount=1234.5
+    )
+
+
+def test_missing_generator_fails_at_compile_time():
+    """Test that templates are checked when compiled, not when rendered."""
+    with pytest.raises(KeyError):
+        compile_templates(["Invoice #{invoice_id}"], {})
@@ -0,0 +1,34 @@
+"""
+Tests for pagination cursors.
+"""
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.errors.pagination_errors import InvalidCursorError
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the seed and offset it was built from."""
+    cursor = encode_cursor(1234, 999_999_950)
+
+    assert decode_cursor(cursor, {1234}, 10**9) == (1234, 999_999_950)
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "MTIzNA", "LTE6NQ"])
+def test_invalid_cursor(cursor):
+    """Test that malformed or negative cursors are rejected with a 400."""
+    with pytest.raises(InvalidCursorError) as excinfo:
+        decode_cursor(cursor, {1234}, 10**9)
+
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "seed, offset", [(10**40, 0), (4321, 0), (1234, 10**9), (1234, 10**12)]
+)
+def test_cursor_outside_the_served_datasets(seed, offset):
+    """Test that cursors for unknown seeds or past the end are rejected."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(seed, offset), {1234}, 10**9)
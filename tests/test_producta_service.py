@@ -2,6 +2,7 @@
 Tests for the ProductaService.
 """
 
+import asyncio
 from unittest.mock import patch
 
 import pytest
@@ -90,7 +91,10 @@ def test_update_status(mock_set, producta_service):
 
     # Verify cache interactions
     mock_set.assert_called_once_with(
-        producta_service._cache_key, "done", producta_service._cache_ttl
+        producta_service._cache_key,
+        "done",
+        producta_service._cache_ttl,
+        broadcast=True,
     )
 
 
@@ -103,3 +107,41 @@ def test_status_validation():
     # Invalid status should raise ValidationError
     with pytest.raises(ValueError):
         ProductaStatus(status="invalid")
+
+
+@patch("app.services.caching_service.async_redis_cache.set")
+def test_update_status_async(mock_set, producta_service):
+    """Test update_status_async method."""
+    result = asyncio.run(
+        producta_service.update_status_async(ProductaStatus(status="done"))
+    )
+
+    assert result.status == "done"
+    mock_set.assert_awaited_once_with(
+        producta_service._cache_key,
+        "done",
+        producta_service._cache_ttl,
+        broadcast=True,
+    )
+
+
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set")
+def test_get_status_async_cache_hit(mock_set, mock_get_raw, producta_service):
+    """Test that get_status_async reads through the local tier."""
+    mock_get_raw.return_value = (b"done", 600)
+
+    result = asyncio.run(producta_service.get_status_async())
+
+    assert result.status == "done"
+    mock_get_raw.assert_awaited_once_with(producta_service._cache_key, primary=True)
+    mock_set.assert_not_called()
+
+
+@patch("app.services.caching_service.async_redis_cache.set_if_absent")
+def test_warm_status_async_never_overwrites(mock_set_if_absent, producta_service):
+    """Test that warming only seeds the default status when it is missing."""
+    mock_set_if_absent.return_value = False
+
+    assert asyncio.run(producta_service.warm_status_async()) is False
+    mock_set_if_absent.assert_awaited_once_with("producta:status:", "processing", 600)
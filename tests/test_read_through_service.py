@@ -0,0 +1,219 @@
+"""
+Tests for the read-through cache with stale-while-revalidate refreshes.
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.errors.cache_errors import CacheOperationError, CacheUnavailableError
+from app.services.caching_service import local_cache
+from app.services.read_through_service import ReadThroughBodyCache, ReadThroughCache
+
+KEY = "demo:test"
+TTL = 60
+SOFT_TTL = 45
+STALE_WINDOW = TTL - SOFT_TTL
+
+
+class InlineExecutor:
+    """Executor stand-in that runs submitted work immediately."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture(autouse=True)
+def reset_refresh_state():
+    """Forget refresh throttling and local values between tests."""
+    ReadThroughCache._next_attempt.clear()
+    local_cache.clear()
+    with patch.object(ReadThroughCache, "_executor", InlineExecutor()):
+        yield
+    ReadThroughCache._next_attempt.clear()
+    local_cache.clear()
+
+
+@pytest.fixture
+def mock_cache():
+    """Patch the sync cache service methods used by the read-through cache."""
+    mocks = {
+        "get_json_with_ttl": Mock(),
+        "set_json": Mock(),
+        "acquire_lease": Mock(return_value="token"),
+        "release_lease": Mock(),
+    }
+    with patch.multiple("app.services.caching_service.redis_cache", **mocks):
+        yield mocks
+
+
+def test_fresh_hit_does_not_refresh(mock_cache):
+    """Test that a fresh value is returned without recomputing."""
+    mock_cache["get_json_with_ttl"].return_value = (["cached"], TTL)
+    compute = Mock(return_value=["new"])
+
+    result = ReadThroughCache.get_or_compute(KEY, compute, TTL, SOFT_TTL)
+
+    assert result == ["cached"]
+    mock_cache["get_json_with_ttl"].assert_called_once_with(KEY, STALE_WINDOW)
+    compute.assert_not_called()
+    mock_cache["acquire_lease"].assert_not_called()
+
+
+def test_miss_computes_and_stores(mock_cache):
+    """Test that a cold miss computes inline and stores the hard TTL."""
+    mock_cache["get_json_with_ttl"].return_value = (None, None)
+
+    result = ReadThroughCache.get_or_compute(KEY, lambda: ["new"], TTL, SOFT_TTL)
+
+    assert result == ["new"]
+    mock_cache["set_json"].assert_called_once_with(KEY, ["new"], TTL)
+    mock_cache["acquire_lease"].assert_not_called()
+
+
+def test_stale_hit_serves_stale_and_refreshes(mock_cache):
+    """Test that a stale value is served while the lease holder recomputes."""
+    mock_cache["get_json_with_ttl"].return_value = (["stale"], STALE_WINDOW - 1)
+
+    result = ReadThroughCache.get_or_compute(KEY, lambda: ["new"], TTL, SOFT_TTL)
+
+    assert result == ["stale"]
+    mock_cache["acquire_lease"].assert_called_once()
+    mock_cache["set_json"].assert_called_once_with(KEY, ["new"], TTL)
+    mock_cache["release_lease"].assert_called_once_with(KEY, "token")
+
+
+def test_stale_hit_without_lease_does_not_recompute(mock_cache):
+    """Test that replicas that lose the lease keep serving the stale value."""
+    mock_cache["get_json_with_ttl"].return_value = (["stale"], STALE_WINDOW - 1)
+    mock_cache["acquire_lease"].return_value = None
+    compute = Mock(return_value=["new"])
+
+    result = ReadThroughCache.get_or_compute(KEY, compute, TTL, SOFT_TTL)
+
+    assert result == ["stale"]
+    compute.assert_not_called()
+    mock_cache["set_json"].assert_not_called()
+    mock_cache["release_lease"].assert_not_called()
+
+
+def test_stale_refresh_attempts_are_throttled(mock_cache):
+    """Test that a worker tries the lease at most once per lease period."""
+    mock_cache["get_json_with_ttl"].return_value = (["stale"], STALE_WINDOW - 1)
+    mock_cache["acquire_lease"].return_value = None
+
+    for _ in range(5):
+        ReadThroughCache.get_or_compute(KEY, lambda: ["new"], TTL, SOFT_TTL)
+
+    mock_cache["acquire_lease"].assert_called_once()
+
+
+def test_expired_refresh_claims_are_dropped():
+    """Test that refresh claims do not accumulate once their lease period ends."""
+    with patch("app.services.read_through_service.time.monotonic") as mock_now:
+        mock_now.return_value = 100.0
+        for offset in range(50):
+            assert ReadThroughCache._claim_refresh(f"page:{offset}")
+        assert not ReadThroughCache._claim_refresh("page:0")
+
+        mock_now.return_value = 1000.0
+        assert ReadThroughCache._claim_refresh("page:0")
+
+    assert list(ReadThroughCache._next_attempt) == ["page:0"]
+
+
+def test_refresh_failure_is_contained(mock_cache):
+    """Test that a failing background refresh does not affect the request."""
+    mock_cache["get_json_with_ttl"].return_value = (["stale"], STALE_WINDOW - 1)
+
+    def compute():
+        raise RuntimeError("generation failed")
+
+    result = ReadThroughCache.get_or_compute(KEY, compute, TTL, SOFT_TTL)
+
+    assert result == ["stale"]
+    mock_cache["release_lease"].assert_called_once_with(KEY, "token")
+
+
+def test_outage_serves_last_known_good(mock_cache):
+    """Test that an open circuit serves the last value seen locally."""
+    local_cache.set(KEY, ["last-known-good"], 0.001)
+    mock_cache["get_json_with_ttl"].side_effect = CacheUnavailableError()
+    compute = Mock(return_value=["new"])
+
+    result = ReadThroughCache.get_or_compute(KEY, compute, TTL, SOFT_TTL)
+
+    assert result == ["last-known-good"]
+    compute.assert_not_called()
+
+
+def test_outage_computes_locally(mock_cache):
+    """Test that an outage without local data generates and keeps it locally."""
+    mock_cache["get_json_with_ttl"].side_effect = CacheUnavailableError()
+
+    result = ReadThroughCache.get_or_compute(KEY, lambda: ["new"], TTL, SOFT_TTL)
+
+    assert result == ["new"]
+    assert local_cache.get(KEY) == ["new"]
+    mock_cache["set_json"].assert_not_called()
+
+
+def test_write_failure_still_returns_value(mock_cache):
+    """Test that a failed cache write does not fail the request."""
+    mock_cache["get_json_with_ttl"].return_value = (None, None)
+    mock_cache["set_json"].side_effect = CacheOperationError()
+
+    result = ReadThroughCache.get_or_compute(KEY, lambda: ["new"], TTL, SOFT_TTL)
+
+    assert result == ["new"]
+    assert local_cache.get(KEY) == ["new"]
+
+
+@patch("app.services.caching_service.async_redis_cache.get_json_with_ttl")
+def test_async_outage_computes_locally(mock_get_json):
+    """Test that the async path fails open too."""
+    mock_get_json.side_effect = CacheUnavailableError()
+
+    result = asyncio.run(
+        ReadThroughCache.get_or_compute_async(KEY, lambda: ["new"], TTL, SOFT_TTL)
+    )
+
+    assert result == ["new"]
+
+
+@patch("app.services.caching_service.async_redis_cache.release_lease")
+@patch("app.services.caching_service.async_redis_cache.acquire_lease")
+@patch("app.services.caching_service.async_redis_cache.set_json")
+@patch("app.services.caching_service.async_redis_cache.get_json_with_ttl")
+def test_async_stale_hit_refreshes_in_background(
+    mock_get_json, mock_set_json, mock_acquire, mock_release
+):
+    """Test that the async path serves stale data and refreshes in a task."""
+    mock_get_json.return_value = (["stale"], STALE_WINDOW - 1)
+    mock_acquire.return_value = "token"
+
+    async def run():
+        result = await ReadThroughCache.get_or_compute_async(
+            KEY, lambda: ["new"], TTL, SOFT_TTL
+        )
+        await asyncio.gather(*ReadThroughCache._tasks)
+        return result
+
+    assert asyncio.run(run()) == ["stale"]
+    mock_set_json.assert_awaited_once_with(KEY, ["new"], TTL)
+    mock_release.assert_awaited_once_with(KEY, "token")
+
+
+def test_body_cache_uses_raw_values():
+    """Test that the body cache reads and writes rendered bytes."""
+    mocks = {
+        "get_raw_with_ttl": Mock(return_value=(None, None)),
+        "set_raw": Mock(),
+    }
+    with patch.multiple("app.services.caching_service.redis_cache", **mocks):
+        result = ReadThroughBodyCache.get_or_compute(KEY, lambda: b"[1]", TTL, SOFT_TTL)
+
+    assert result == b"[1]"
+    mocks["get_raw_with_ttl"].assert_called_once_with(KEY, STALE_WINDOW)
+    mocks["set_raw"].assert_called_once_with(KEY, b"[1]", TTL)
@@ -0,0 +1,212 @@
+"""
+Tests for the Redis connection manager.
+"""
+
+import asyncio
+import shutil
+import socket
+import subprocess
+import time
+
+import pytest
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import RedisSettings
+from app.services.redis_connections import RedisConnectionManager
+
+
+class SlowClient:
+    """Client stand-in that answers GET after a delay."""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+
+    def get(self, key):
+        time.sleep(self.delay)
+        return self.name
+
+    async def aget(self, key):
+        await asyncio.sleep(self.delay)
+        return self.name
+
+
+def make_manager(**overrides):
+    """Connection manager with explicit settings, ignoring the environment."""
+    settings = RedisSettings(_env_file=None, **overrides)
+    return RedisConnectionManager(settings)
+
+
+def test_replica_endpoints_parsing():
+    """Test that replica hosts default to the primary port."""
+    settings = RedisSettings(
+        _env_file=None, redis_port=6380, redis_replica_hosts="r1:7000, r2"
+    )
+
+    assert settings.replica_endpoints == [("r1", 7000), ("r2", 6380)]
+
+
+def test_pool_kwargs_include_limits_and_timeouts():
+    """Test that pool size and timeouts are applied to every pool."""
+    manager = make_manager(redis_connection_pool_size=25, redis_connection_timeout=0.5)
+
+    kwargs = manager._pool_kwargs("cache", 6379, use_asyncio=False)
+
+    assert kwargs["max_connections"] == 25
+    assert kwargs["socket_timeout"] == 0.5
+    assert kwargs["socket_connect_timeout"] == 0.5
+    assert "connection_class" not in kwargs
+
+
+def test_pool_kwargs_enable_tls():
+    """Test that ElastiCache TLS settings select SSL connections."""
+    manager = make_manager(
+        elasticache_tls_enabled=True, elasticache_ssl_cert_reqs="required"
+    )
+
+    assert (
+        manager._pool_kwargs("cache", 6379, use_asyncio=False)["connection_class"]
+        is redis.SSLConnection
+    )
+    kwargs = manager._pool_kwargs("cache", 6379, use_asyncio=True)
+    assert kwargs["connection_class"] is aioredis.SSLConnection
+    assert kwargs["ssl_cert_reqs"] == "required"
+
+
+def test_pick_without_replicas_uses_primary():
+    """Test that reads go to the primary when no replicas exist."""
+    manager = make_manager()
+
+    assert manager._pick("primary", []) == ("primary", None)
+
+
+def test_pick_round_robins_replicas():
+    """Test that reads rotate over replicas and hedge to the next one."""
+    manager = make_manager()
+
+    picks = [manager._pick("primary", ["r1", "r2"]) for _ in range(3)]
+
+    assert picks == [("r1", "r2"), ("r2", "r1"), ("r1", "r2")]
+
+
+def test_pick_single_replica_hedges_to_primary():
+    """Test that a single replica is hedged against the primary."""
+    manager = make_manager()
+
+    assert manager._pick("primary", ["r1"]) == ("r1", "primary")
+
+
+def test_hedged_read_uses_faster_endpoint():
+    """Test that a slow first read is raced against a second endpoint."""
+    manager = make_manager(
+        redis_replica_hosts="r1,r2", redis_hedged_reads=True, redis_hedge_delay_ms=10
+    )
+    manager._replicas = [SlowClient("slow", 0.5), SlowClient("fast")]
+
+    start = time.monotonic()
+    result = manager.read(lambda client: client.get("key"))
+
+    assert result == "fast"
+    assert time.monotonic() - start < 0.4
+    assert manager.stats()["hedges_won"] == 1
+
+
+def test_read_without_hedging_waits_for_first_endpoint():
+    """Test that reads are not hedged unless enabled."""
+    manager = make_manager(redis_replica_hosts="r1,r2")
+    manager._replicas = [SlowClient("slow", 0.05), SlowClient("fast")]
+
+    assert manager.read(lambda client: client.get("key")) == "slow"
+    assert manager.stats()["hedges_fired"] == 0
+
+
+def test_async_hedged_read_uses_faster_endpoint():
+    """Test that async hedged reads return the first successful reply."""
+    manager = make_manager(
+        redis_replica_hosts="r1,r2", redis_hedged_reads=True, redis_hedge_delay_ms=10
+    )
+    manager._async_replicas = [SlowClient("slow", 0.5), SlowClient("fast")]
+
+    async def run():
+        start = time.monotonic()
+        result = await manager.read_async(lambda client: client.aget("key"))
+        return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(run())
+
+    assert result == "fast"
+    assert elapsed < 0.4
+    assert manager.stats()["hedges_fired"] == 1
+
+
+def test_async_hedged_read_fast_first_endpoint_skips_hedge():
+    """Test that fast reads never fire a hedge."""
+    manager = make_manager(
+        redis_replica_hosts="r1,r2", redis_hedged_reads=True, redis_hedge_delay_ms=50
+    )
+    manager._async_replicas = [SlowClient("first"), SlowClient("second")]
+
+    result = asyncio.run(manager.read_async(lambda client: client.aget("key")))
+
+    assert result == "first"
+    assert manager.stats()["hedges_fired"] == 0
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def redis_servers():
+    """Start a local primary and replica redis-server pair."""
+    primary_port, replica_port = _free_port(), _free_port()
+    processes = [
+        subprocess.Popen(
+            ["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"]
+            + extra,
+            stdout=subprocess.DEVNULL,
+        )
+        for port, extra in [
+            (primary_port, []),
+            (replica_port, ["--replicaof", "127.0.0.1", str(primary_port)]),
+        ]
+    ]
+    try:
+        for port in (primary_port, replica_port):
+            client = redis.Redis(port=port)
+            for _ in range(50):
+                try:
+                    client.ping()
+                    break
+                except redis.ConnectionError:
+                    time.sleep(0.1)
+        yield primary_port, replica_port
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+@pytest.mark.skipif(shutil.which("redis-server") is None, reason="needs redis-server")
+def test_reads_routed_to_local_replica(redis_servers):
+    """Test primary writes and replica reads against real redis-server processes."""
+    primary_port, replica_port = redis_servers
+    manager = make_manager(
+        redis_host="127.0.0.1",
+        redis_port=primary_port,
+        redis_replica_hosts=f"127.0.0.1:{replica_port}",
+        redis_hedged_reads=True,
+    )
+
+    manager.primary().set("demo:key", "value")
+    for _ in range(50):
+        if manager.read(lambda client: client.get("demo:key")) == b"value":
+            break
+        time.sleep(0.1)
+
+    assert manager.read(lambda client: client.get("demo:key")) == b"value"
+    assert manager.replicas()[0].info("replication")["role"] == "slave"
+    manager.close()
@@ -0,0 +1,131 @@
+"""
+Tests for the leader-elected background refresh scheduler.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.errors.cache_errors import CacheUnavailableError
+from app.services.refresh_scheduler import RefreshScheduler, refresh_scheduler
+
+
+@pytest.fixture
+def scheduler():
+    """Scheduler with two datasets whose refreshes are recorded."""
+    scheduler = RefreshScheduler(lease_key="test-scheduler", lease_ms=1000)
+    scheduler.invoices = AsyncMock()
+    scheduler.logs = AsyncMock()
+    scheduler.register("invoices", scheduler.invoices, interval=40)
+    scheduler.register("logs", scheduler.logs, interval=15)
+    return scheduler
+
+
+def test_default_datasets_are_registered():
+    """Test that every cached dataset is kept warm by default."""
+    assert set(refresh_scheduler.stats()["datasets"]) == {
+        "invoices",
+        "treasury_metrics",
+        "producta_status",
+    }
+
+
+@patch("app.services.caching_service.async_redis_cache.renew_lease")
+@patch("app.services.caching_service.async_redis_cache.acquire_lease")
+def test_leader_warms_everything_then_refreshes_when_due(
+    mock_acquire, mock_renew, scheduler
+):
+    """Test that a new leader warms every dataset and then waits for intervals."""
+    mock_acquire.return_value = "token"
+    mock_renew.return_value = True
+
+    async def run():
+        await scheduler.tick()
+        await scheduler.tick()
+
+    asyncio.run(run())
+
+    scheduler.invoices.assert_awaited_once()
+    scheduler.logs.assert_awaited_once()
+    mock_acquire.assert_awaited_once_with("test-scheduler", 1000)
+    mock_renew.assert_awaited_once_with("test-scheduler", "token", 1000)
+    assert scheduler.is_leader
+
+
+@patch("app.services.caching_service.async_redis_cache.acquire_lease")
+def test_followers_do_nothing(mock_acquire, scheduler):
+    """Test that workers without the lease do not refresh anything."""
+    mock_acquire.return_value = None
+
+    asyncio.run(scheduler.tick())
+
+    scheduler.invoices.assert_not_awaited()
+    assert not scheduler.is_leader
+
+
+@patch("app.services.caching_service.async_redis_cache.renew_lease")
+@patch("app.services.caching_service.async_redis_cache.acquire_lease")
+def test_lost_lease_stops_refreshes(mock_acquire, mock_renew, scheduler):
+    """Test that a leader whose lease was taken over steps down."""
+    mock_acquire.side_effect = ["token", None]
+    mock_renew.return_value = False
+
+    async def run():
+        await scheduler.tick()
+        for dataset in scheduler._datasets.values():
+            dataset.next_run = 0.0
+        await scheduler.tick()
+
+    asyncio.run(run())
+
+    assert scheduler.invoices.await_count == 1
+    assert not scheduler.is_leader
+
+
+@patch("app.services.caching_service.async_redis_cache.acquire_lease")
+def test_redis_errors_are_survived(mock_acquire, scheduler):
+    """Test that an unreachable Redis only keeps the worker from leading."""
+    mock_acquire.side_effect = CacheUnavailableError()
+
+    asyncio.run(scheduler.tick())
+
+    scheduler.invoices.assert_not_awaited()
+
+
+@patch("app.services.caching_service.async_redis_cache.renew_lease")
+@patch("app.services.caching_service.async_redis_cache.acquire_lease")
+def test_failed_refresh_is_retried_next_tick(mock_acquire, mock_renew, scheduler):
+    """Test that a failing refresh does not block the others and is retried."""
+    mock_acquire.return_value = "token"
+    mock_renew.return_value = True
+    scheduler.invoices.side_effect = [RuntimeError("boom"), None]
+
+    async def run():
+        await scheduler.tick()
+        await scheduler.tick()
+
+    asyncio.run(run())
+
+    assert scheduler.invoices.await_count == 2
+    scheduler.logs.assert_awaited_once()
+    stats = scheduler.stats()["datasets"]["invoices"]
+    assert (stats["runs"], stats["failures"]) == (1, 1)
+
+
+@patch("app.services.caching_service.async_redis_cache.release_lease")
+@patch("app.services.caching_service.async_redis_cache.acquire_lease")
+def test_stop_releases_lease(mock_acquire, mock_release, scheduler):
+    """Test that stopping hands the lease over to another worker."""
+    mock_acquire.return_value = "token"
+
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    scheduler.invoices.assert_awaited_once()
+    mock_release.assert_awaited_once_with("test-scheduler", "token")
+    assert not scheduler.is_leader
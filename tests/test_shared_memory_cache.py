@@ -0,0 +1,142 @@
+"""
+Tests for the host-wide shared memory cache tier.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.shared_memory_cache import _SEQUENCE, SharedMemoryCache
+from app.services import caching_service
+from app.services.caching_service import RedisCacheService, local_cache, raw_tier
+
+
+@pytest.fixture
+def shared(tmp_path):
+    """Small shared tier backed by a temporary file."""
+    cache = SharedMemoryCache(str(tmp_path / "segment"), slots=8, slot_bytes=256)
+    yield cache
+    cache.close()
+
+
+def test_set_and_get(shared):
+    """Test that stored values are returned with their remaining TTL."""
+    shared.set("demo:invoices:10", b"[1,2,3]", 60)
+
+    value, remaining = shared.get_with_ttl("demo:invoices:10")
+
+    assert value == b"[1,2,3]"
+    assert 59 < remaining <= 60
+    assert shared.get_with_ttl("demo:invoices:20") == (None, None)
+
+
+def test_expired_entries_are_only_served_stale(shared):
+    """Test that expired values are misses but remain as last-known-good."""
+    shared.set("demo:logs:5", b"[]", 60)
+
+    with patch("app.core.shared_memory_cache.time.time", return_value=time.time() + 61):
+        assert shared.get_with_ttl("demo:logs:5") == (None, None)
+        assert shared.get_stale("demo:logs:5") == b"[]"
+
+
+def test_min_ttl_treats_expiring_entries_as_missing(shared):
+    """Test that entries about to expire are bypassed."""
+    shared.set("demo:logs:5", b"[]", 10)
+
+    assert shared.get_with_ttl("demo:logs:5", min_ttl=15) == (None, None)
+
+
+def test_oversized_values_are_skipped(shared):
+    """Test that values larger than a slot are not cached."""
+    shared.set("demo:invoices:100", b"x" * 512, 60)
+
+    assert shared.get_with_ttl("demo:invoices:100") == (None, None)
+    assert shared.stats()["oversized"] == 1
+
+
+def test_full_probe_window_overwrites_soonest_expiry(tmp_path):
+    """Test that the entry closest to expiry is replaced when slots run out."""
+    cache = SharedMemoryCache(str(tmp_path / "segment"), slots=1, slot_bytes=256)
+    cache.set("a", b"1", 60)
+    cache.set("b", b"2", 60)
+
+    assert cache.get_with_ttl("a") == (None, None)
+    assert cache.get_with_ttl("b")[0] == b"2"
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+
+def test_delete_and_delete_prefix(shared):
+    """Test removing single keys and whole prefixes."""
+    shared.set("demo:invoices:10", b"a", 60)
+    shared.set("demo:invoices:20", b"b", 60)
+    shared.set("demo:logs:5", b"c", 60)
+
+    shared.delete("demo:logs:5")
+    assert shared.delete_prefix("demo:invoices") == 2
+
+    assert shared.get_stale("demo:invoices:10") is None
+    assert shared.get_stale("demo:logs:5") is None
+
+
+def test_slot_being_written_is_not_read(shared):
+    """Test that readers skip a slot whose sequence shows a write in progress."""
+    shared.set("demo:logs:5", b"[]", 60)
+    segment = shared._segment()
+    for index in range(shared.slots):
+        offset = shared._offset(index)
+        sequence = _SEQUENCE.unpack_from(segment, offset)[0]
+        if sequence:
+            _SEQUENCE.pack_into(segment, offset, sequence + 1)
+
+    assert shared.get_with_ttl("demo:logs:5") == (None, None)
+    assert shared.stats()["read_retries"] > 0
+
+
+def test_values_are_visible_to_other_processes(shared):
+    """Test that a value stored by another process is served here."""
+    script = (
+        "from app.core.shared_memory_cache import SharedMemoryCache\n"
+        f"cache = SharedMemoryCache({shared.path!r}, slots=8, slot_bytes=256)\n"
+        "cache.set('demo:invoices:10', b'from-sibling', 60)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert shared.get_with_ttl("demo:invoices:10")[0] == b"from-sibling"
+
+
+def test_mismatched_layout_disables_tier(shared):
+    """Test that a segment created with another layout is left alone."""
+    shared.set("a", b"1", 60)
+    other = SharedMemoryCache(shared.path, slots=16, slot_bytes=256)
+
+    other.set("a", b"2", 60)
+
+    assert other.enabled is False
+    assert shared.get_with_ttl("a")[0] == b"1"
+
+
+def test_raw_reads_use_shared_tier(shared):
+    """Test that body keys are served from and filled into the shared tier."""
+    service = RedisCacheService()
+    local_cache.clear()
+    with patch.object(caching_service, "shared_cache", shared), patch.object(
+        service, "get_with_ttl", return_value=(b"[1]", 60000)
+    ) as mock_get:
+        assert raw_tier("demo:invoices:10") is shared
+        assert raw_tier("producta:status:") is local_cache
+
+        assert service.get_raw_with_ttl("demo:invoices:10")[0] == b"[1]"
+        assert service.get_raw_with_ttl("demo:invoices:10")[0] == b"[1]"
+
+    mock_get.assert_called_once()
+    assert shared.get_with_ttl("demo:invoices:10")[0] == b"[1]"
+    assert local_cache.get("demo:invoices:10") is None
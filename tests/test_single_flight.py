@@ -0,0 +1,245 @@
+"""
+Tests for single-flight call coalescing.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from app.constants.invoice_constants import MAX_LIMIT
+from app.core.single_flight import SingleFlight
+from app.services.invoice_service import InvoiceService
+
+
+def test_do_coalesces_concurrent_threads():
+    """Test that concurrent threads share a single execution."""
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "result"
+
+    results = []
+
+    def worker():
+        results.append(flight.do("key", compute))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["result"] * 6
+    assert flight.in_flight() == 0
+
+
+def test_do_shares_exceptions():
+    """Test that followers receive the leader's exception."""
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def compute():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    def worker():
+        try:
+            flight.do("key", compute)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=worker)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert flight.in_flight() == 0
+
+
+def test_do_runs_again_after_completion():
+    """Test that sequential calls are not coalesced."""
+    flight = SingleFlight()
+    calls = []
+
+    flight.do("key", lambda: calls.append(1))
+    flight.do("key", lambda: calls.append(1))
+
+    assert len(calls) == 2
+
+
+def test_do_async_coalesces_concurrent_tasks():
+    """Test that concurrent tasks share a single execution."""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do_async("key", compute) for _ in range(10))
+        )
+
+    assert asyncio.run(run()) == ["result"] * 10
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+def test_do_async_shares_exceptions():
+    """Test that waiting tasks receive the leader's exception."""
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do_async("key", compute) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_do_async_keys_are_independent():
+    """Test that different keys are computed separately."""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def run():
+        return await asyncio.gather(
+            flight.do_async("a", lambda: compute("a")),
+            flight.do_async("b", lambda: compute("b")),
+        )
+
+    assert asyncio.run(run()) == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_do_async_leader_cancel_does_not_fail_followers():
+    """Test that cancelling the leader leaves the call running for followers."""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.gather(leader, return_exceptions=True)
+        return leader.cancelled(), await follower
+
+    assert asyncio.run(run()) == (True, "result")
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+def test_do_async_cancels_call_once_every_caller_is_gone():
+    """Test that the shared call is cancelled when no caller is left."""
+    flight = SingleFlight()
+    cancelled = []
+
+    async def compute():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        callers = [
+            asyncio.ensure_future(flight.do_async("key", compute)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cancelled == [1]
+    assert flight.in_flight() == 0
+
+
+@patch("app.services.caching_service.async_redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.async_redis_cache.set_raw")
+def test_invoice_misses_generate_once(mock_set_raw, mock_get_raw):
+    """Test that concurrent invoice misses generate and cache once."""
+    mock_get_raw.return_value = (None, None)
+
+    async def slow_set_json(*args):
+        await asyncio.sleep(0.01)
+
+    mock_set_raw.side_effect = slow_set_json
+
+    async def run():
+        return await asyncio.gather(
+            *(InvoiceService.get_invoices_async(5) for _ in range(10))
+        )
+
+    with patch.object(
+        InvoiceService, "generate_batch", wraps=InvoiceService.generate_batch
+    ) as mock_generate:
+        results = asyncio.run(run())
+
+    assert all(len(invoices) == 5 for invoices in results)
+    mock_generate.assert_called_once_with(MAX_LIMIT)
+    mock_set_raw.assert_awaited_once()
+
+
+@patch("app.services.caching_service.redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.redis_cache.set_raw")
+def test_invoice_misses_generate_once_across_threads(mock_set_raw, mock_get_raw):
+    """Test that concurrent invoice misses from threads generate once."""
+    mock_get_raw.return_value = (None, None)
+    threads = 4
+    barrier = threading.Barrier(threads)
+    original = InvoiceService.generate_batch.__func__
+
+    def slow_generate(cls, limit):
+        time.sleep(0.05)
+        return original(cls, limit)
+
+    def worker():
+        barrier.wait()
+        InvoiceService.get_invoices(5)
+
+    with patch.object(InvoiceService, "generate_batch", classmethod(slow_generate)):
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    mock_set_raw.assert_called_once()
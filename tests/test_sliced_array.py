@@ -0,0 +1,25 @@
+"""
+Tests for packed JSON arrays served as prefix slices.
+"""
+
+import json
+
+from app.core.sliced_array import pack_array, slice_array
+
+
+def test_slices_are_json_prefixes():
+    """Test that every slice is the matching prefix of the full array."""
+    items = [{"id": 1}, {"id": 22, "name": "a,b"}, "text", [3, 4]]
+    packed = pack_array([json.dumps(item).encode() for item in items])
+
+    for limit in range(len(items) + 1):
+        assert json.loads(slice_array(packed, limit)) == items[:limit]
+
+
+def test_slice_limits_are_clamped():
+    """Test that out-of-range limits return an empty or the full array."""
+    packed = pack_array([b"1", b"2"])
+
+    assert slice_array(packed, -5) == b"[]"
+    assert slice_array(packed, 10) == b"[1,2]"
+    assert slice_array(pack_array([]), 3) == b"[]"
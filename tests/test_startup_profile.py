@@ -0,0 +1,52 @@
+"""
+Tests for the startup profile.
+"""
+
+import sys
+import time
+
+from app.core.startup_profile import StartupProfile
+
+
+def test_stages_are_recorded():
+    """Test that checkpoints and stages are reported in order."""
+    profile = StartupProfile()
+    profile.checkpoint("import")
+    with profile.stage("connect"):
+        time.sleep(0.01)
+    profile.mark_ready()
+
+    report = profile.report()
+
+    assert list(report["stages"]) == ["import", "connect"]
+    assert report["stages"]["connect"] >= 0.01
+    assert report["ready_seconds"] >= report["stages"]["connect"]
+    assert report["imports"] is None
+
+
+def test_import_timing(tmp_path, monkeypatch):
+    """Test per-module import times, with nested imports excluded from self time."""
+    (tmp_path / "slow_outer_module.py").write_text(
+        "import time\nimport slow_inner_module\ntime.sleep(0.01)\n"
+    )
+    (tmp_path / "slow_inner_module.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profile = StartupProfile()
+
+    profile.enable_import_timing()
+    try:
+        import slow_outer_module  # noqa: F401
+    finally:
+        profile.mark_ready()
+        sys.modules.pop("slow_outer_module", None)
+        sys.modules.pop("slow_inner_module", None)
+
+    modules = {
+        entry["module"]: entry for entry in profile.report()["imports"]["modules"]
+    }
+    outer, inner = modules["slow_outer_module"], modules["slow_inner_module"]
+    assert inner["self"] >= 0.02
+    assert outer["cumulative"] >= outer["self"] + inner["cumulative"] - 0.001
+    assert 0.01 <= outer["self"] < 0.02
+    assert profile.report()["imports"]["packages"]["slow_inner_module"] >= 0.02
+    assert all(not hasattr(finder, "timing") for finder in sys.meta_path)
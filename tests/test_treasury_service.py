@@ -2,6 +2,7 @@
 Tests for the TreasuryService.
 """
 
+import json
 from unittest.mock import patch
 
 import pytest
@@ -9,10 +10,13 @@ import pytest
 from app.schemas.treasury_schemas import TreasuryMetrics
 from app.services.treasury_service import (
     TREASURY_METRICS_CACHE_KEY,
+    TREASURY_METRICS_CACHE_SOFT_TTL,
     TREASURY_METRICS_CACHE_TTL,
     TreasuryService,
 )
 
+STALE_WINDOW = TREASURY_METRICS_CACHE_TTL - TREASURY_METRICS_CACHE_SOFT_TTL
+
 
 @pytest.fixture
 def treasury_service():
@@ -20,14 +24,12 @@ def treasury_service():
     return TreasuryService
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_get_treasury_metrics_cache_miss(
-    mock_set_json, mock_get_json, treasury_service
-):
+@patch("app.services.caching_service.redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.redis_cache.set_raw")
+def test_get_treasury_metrics_cache_miss(mock_set_raw, mock_get_raw, treasury_service):
     """Test get_treasury_metrics with cache miss."""
     # Setup cache miss
-    mock_get_json.return_value = None
+    mock_get_raw.return_value = (None, None)
 
     # Call the method
     result = treasury_service.get_treasury_metrics()
@@ -38,25 +40,28 @@ def test_get_treasury_metrics_cache_miss(
     assert result.apy == 9.2
 
     # Verify cache interactions
-    mock_get_json.assert_called_once_with(TREASURY_METRICS_CACHE_KEY)
-    mock_set_json.assert_called_once()
+    mock_get_raw.assert_called_once_with(TREASURY_METRICS_CACHE_KEY, STALE_WINDOW)
+    mock_set_raw.assert_called_once()
     # Verify the first arg is the cache key
-    assert mock_set_json.call_args[0][0] == TREASURY_METRICS_CACHE_KEY
+    assert mock_set_raw.call_args[0][0] == TREASURY_METRICS_CACHE_KEY
     # Verify the third arg is the cache TTL
-    assert mock_set_json.call_args[0][2] == TREASURY_METRICS_CACHE_TTL
-    # Verify the second arg is the metrics dict
-    metrics_dict = mock_set_json.call_args[0][1]
+    assert mock_set_raw.call_args[0][2] == TREASURY_METRICS_CACHE_TTL
+    # Verify the second arg is the rendered metrics body
+    metrics_dict = json.loads(mock_set_raw.call_args[0][1])
     assert metrics_dict["tvl"] == 1480000
     assert metrics_dict["apy"] == 9.2
 
 
-@patch("app.services.caching_service.redis_cache.get_json")
-@patch("app.services.caching_service.redis_cache.set_json")
-def test_get_treasury_metrics_cache_hit(mock_set_json, mock_get_json, treasury_service):
+@patch("app.services.caching_service.redis_cache.get_raw_with_ttl")
+@patch("app.services.caching_service.redis_cache.set_raw")
+def test_get_treasury_metrics_cache_hit(mock_set_raw, mock_get_raw, treasury_service):
     """Test get_treasury_metrics with cache hit."""
     # Setup cache hit with cached values
     cached_data = {"tvl": 2000000, "apy": 8.5}
-    mock_get_json.return_value = cached_data
+    mock_get_raw.return_value = (
+        json.dumps(cached_data).encode(),
+        TREASURY_METRICS_CACHE_TTL,
+    )
 
     # Call the method
     result = treasury_service.get_treasury_metrics()
@@ -67,5 +72,5 @@ def test_get_treasury_metrics_cache_hit(mock_set_json, mock_get_json, treasury_s
     assert result.apy == 8.5
 
     # Verify cache interactions
-    mock_get_json.assert_called_once_with(TREASURY_METRICS_CACHE_KEY)
-    mock_set_json.assert_not_called()  # Should not set cache on hit
+    mock_get_raw.assert_called_once_with(TREASURY_METRICS_CACHE_KEY, STALE_WINDOW)
+    mock_set_raw.assert_not_called()  # Should not set cache on hit